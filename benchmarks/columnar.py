@@ -0,0 +1,158 @@
+"""
+Compara el tamaño y el tiempo de serialización de los resultados tabulares en formato
+filas (lista de objetos) y columnar.
+
+Sin argumentos usa datos sintéticos con la forma de las respuestas de la API (panel de
+acciones, serie histórica y operaciones). También acepta respuestas reales guardadas:
+    python benchmarks/columnar.py [--repeticiones 200] [--archivo panel.json ...]
+"""
+from typing import Dict, Any, List
+import os
+import sys
+import gzip
+import json
+import time
+import random
+import argparse
+import statistics
+from datetime import datetime, timedelta
+from pydantic_core import to_json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def panel(n: int, rnd: random.Random) -> Dict[str, Any]:
+    titulos = []
+    for i in range(n):
+        precio = round(rnd.uniform(100, 5000), 2)
+        titulos.append({
+            "simbolo": f"SIM{i:03d}",
+            "puntas": {
+                "cantidadCompra": rnd.randint(1, 5000),
+                "precioCompra": round(precio * 0.998, 2),
+                "precioVenta": round(precio * 1.002, 2),
+                "cantidadVenta": rnd.randint(1, 5000)
+            },
+            "ultimoPrecio": precio,
+            "variacionPorcentual": round(rnd.uniform(-5, 5), 2),
+            "apertura": round(precio * 0.99, 2),
+            "maximo": round(precio * 1.02, 2),
+            "minimo": round(precio * 0.98, 2),
+            "ultimoCierre": round(precio * 0.995, 2),
+            "volumen": rnd.randint(0, 10 ** 6),
+            "cantidadOperaciones": rnd.randint(0, 3000),
+            "fecha": "2024-06-28T17:00:00",
+            "tipoOpcion": None,
+            "precioEjercicio": None,
+            "fechaVencimiento": None,
+            "mercado": "BCBA",
+            "moneda": "AR$",
+            "descripcion": f"Sociedad Anonima {i}",
+            "plazo": "T1",
+            "laminaMinima": 1,
+            "lote": 1
+        })
+    return {"titulos": titulos}
+
+def serie(n: int, rnd: random.Random) -> List[Dict[str, Any]]:
+    start = datetime(2015, 1, 2, 17)
+    precio = 100.0
+    rows = []
+    for i in range(n):
+        precio *= 1 + rnd.gauss(0, 0.02)
+        rows.append({
+            "ultimoPrecio": round(precio, 2),
+            "variacion": round(rnd.uniform(-5, 5), 2),
+            "apertura": round(precio * 0.99, 2),
+            "maximo": round(precio * 1.02, 2),
+            "minimo": round(precio * 0.98, 2),
+            "fechaHora": (start + timedelta(days=i)).isoformat(),
+            "tendencia": rnd.choice(["sube", "baja", "mantiene"]),
+            "cierreAnterior": round(precio * 0.995, 2),
+            "montoOperado": round(rnd.uniform(10 ** 5, 10 ** 8), 2),
+            "volumenNominal": rnd.randint(0, 10 ** 6),
+            "precioPromedio": round(precio, 2),
+            "moneda": "peso_Argentino",
+            "precioAjuste": 0.0,
+            "interesesAbiertos": 0.0,
+            "puntas": None,
+            "cantidadOperaciones": rnd.randint(0, 3000),
+            "descripcionTitulo": "Grupo Financiero Galicia",
+            "plazo": "t0",
+            "laminaMinima": 1,
+            "lote": 1
+        })
+    return rows
+
+def operaciones(n: int, rnd: random.Random) -> List[Dict[str, Any]]:
+    rows = []
+    for i in range(n):
+        cantidad = rnd.randint(1, 500)
+        precio = round(rnd.uniform(100, 5000), 2)
+        rows.append({
+            "numero": 50000000 + i,
+            "fechaOrden": f"2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}T11:{rnd.randint(0, 59):02d}:00",
+            "tipo": rnd.choice(["Compra", "Venta"]),
+            "estado": rnd.choice(["terminada", "cancelada", "terminada", "terminada"]),
+            "mercado": "BCBA",
+            "simbolo": rnd.choice(["GGAL", "YPFD", "PAMP", "AL30", "GD30", "AAPL", "KO"]),
+            "cantidad": cantidad,
+            "monto": round(cantidad * precio, 2),
+            "modalidad": "precio_Limite",
+            "precio": precio,
+            "fechaOperada": None,
+            "cantidadOperada": cantidad,
+            "precioOperado": precio,
+            "montoOperado": round(cantidad * precio, 2),
+            "plazo": "t1"
+        })
+    return rows
+
+def measure(func, repetitions: int) -> float:
+    """Mediana en milisegundos"""
+    timings = []
+    for _ in range(repetitions):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=200)
+    parser.add_argument("--archivo", action="append", default=[], help="Respuesta JSON real a incluir")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.join(ROOT, "src"))
+    from iol.columnar import apply_format, from_columnar, _flatten
+
+    rnd = random.Random(42)
+    datasets = {
+        "panel acciones (300)": panel(300, rnd),
+        "serie histórica (2500)": serie(2500, rnd),
+        "operaciones (1000)": operaciones(1000, rnd)
+    }
+    for path in args.archivo:
+        with open(path, encoding="utf-8") as f:
+            datasets[os.path.basename(path)] = json.load(f)
+
+    print(f"{'datos':<26}{'formato':<10}{'bytes':>10}{'gzip':>9}{'ms json':>10}{'ms pydantic':>13}")
+    for name, data in datasets.items():
+        columnar = apply_format(data, "columnar")
+        # Verifica que la codificación conserve los datos antes de medir
+        table = columnar if "columnas" in columnar else next(v for v in columnar.values() if isinstance(v, dict) and "columnas" in v)
+        rows = data if isinstance(data, list) else next(v for v in data.values() if isinstance(v, list))
+        expected = [{k: v for k, v in _flatten(row).items() if v is not None} for row in rows]
+        assert from_columnar(table) == expected
+
+        for formato, encode in (
+            ("filas", lambda: data),
+            ("columnar", lambda: apply_format(data, "columnar"))
+        ):
+            payload = json.dumps(encode(), ensure_ascii=False, separators=(",", ":")).encode()
+            size_gzip = len(gzip.compress(payload))
+            ms_json = measure(lambda: json.dumps(encode(), ensure_ascii=False, separators=(",", ":")), args.repeticiones)
+            ms_pydantic = measure(lambda: to_json(encode()), args.repeticiones)
+            print(f"{name:<26}{formato:<10}{len(payload):>10}{size_gzip:>9}{ms_json:>10.2f}{ms_pydantic:>13.2f}")
+
+if __name__ == "__main__":
+    main()
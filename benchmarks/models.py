@@ -0,0 +1,103 @@
+"""
+Compara la decodificación de respuestas de la API a diccionarios y a los modelos tipados
+de iol.models: tiempo de decodificación desde bytes y memoria retenida por el resultado.
+
+    python benchmarks/models.py [--repeticiones 50]
+
+Usa el panel, la serie histórica y las operaciones sintéticas de benchmarks/columnar.py y
+un portafolio armado con su panel. Las variantes con msgspec se omiten si no está instalado;
+iol.models.decode usa msgspec o, sin él, pydantic.
+"""
+from typing import Dict, Any, List
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure(func, repetitions: int) -> float:
+    """Mediana en milisegundos"""
+    timings = []
+    for _ in range(repetitions):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def retained_kb(func) -> float:
+    """Memoria que ocupa el resultado de func mientras se lo mantiene referenciado"""
+    tracemalloc.start()
+    result = func()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / 1024
+
+def portafolio(n: int, rnd: random.Random) -> List[Dict[str, Any]]:
+    """Activos de un portafolio con los títulos del panel sintético"""
+    from columnar import panel
+    return [
+        {
+            "cantidad": rnd.randint(1, 5000),
+            "comprometido": 0,
+            "ultimoPrecio": item["ultimoPrecio"],
+            "ppc": round(item["ultimoPrecio"] * rnd.uniform(0.7, 1.3), 2),
+            "variacionDiaria": item["variacionPorcentual"],
+            "valorizado": None,
+            "titulo": {
+                "simbolo": item["simbolo"],
+                "descripcion": item["descripcion"],
+                "pais": "argentina",
+                "mercado": item["mercado"],
+                "tipo": "ACCIONES",
+                "plazo": "t1",
+                "moneda": item["moneda"]
+            }
+        }
+        for item in panel(n, rnd)["titulos"]
+    ]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=50)
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.join(ROOT, "src"))
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from pydantic import TypeAdapter
+    from columnar import panel, serie, operaciones
+    from iol.models import Cotizacion, Posicion, TituloPanel, Operacion, decode, parse, msgspec
+
+    rnd = random.Random(42)
+    datasets = [
+        ("panel acciones (300)", json.dumps(panel(300, rnd)["titulos"]).encode(), TituloPanel),
+        ("portafolio (300)", json.dumps(portafolio(300, rnd)).encode(), Posicion),
+        ("serie histórica (2500)", json.dumps(serie(2500, rnd)).encode(), Cotizacion),
+        ("operaciones (1000)", json.dumps(operaciones(1000, rnd)).encode(), Operacion)
+    ]
+
+    print(f"{'datos':<26}{'decodificación':<34}{'ms':>9}{'KB retenidos':>14}")
+    for name, raw, cls in datasets:
+        adapter = TypeAdapter(List[cls])
+        variants = [
+            ("json.loads -> dict", lambda: json.loads(raw)),
+            ("json.loads + parse -> slots", lambda: parse(cls, json.loads(raw))),
+            ("pydantic validate_json -> slots", lambda: adapter.validate_json(raw))
+        ]
+        if msgspec is not None:
+            variants += [
+                ("msgspec -> dict", lambda: msgspec.json.decode(raw)),
+                ("msgspec tipado -> slots", lambda: msgspec.json.decode(raw, type=List[cls]))
+            ]
+        variants.append(("iol.models.decode -> slots", lambda: decode(raw, cls, many=True)))
+        for variant, func in variants:
+            ms = measure(func, args.repeticiones)
+            print(f"{name:<26}{variant:<34}{ms:>9.2f}{retained_kb(func):>14.0f}")
+
+if __name__ == "__main__":
+    main()
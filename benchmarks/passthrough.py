@@ -0,0 +1,85 @@
+"""
+Compara el costo por llamada de una herramienta que reenvía la respuesta de la API:
+decodificando el JSON y volviendo a codificarlo (con contenido estructurado) o insertando
+el cuerpo sin decodificar en la respuesta (passthrough).
+
+    python benchmarks/passthrough.py [--repeticiones 100]
+
+Usa los mismos datos sintéticos que benchmarks/columnar.py. Se mide desde los bytes de
+la API hasta el JSON del resultado MCP que se envía al cliente.
+"""
+from typing import Dict, Any
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure(loop: asyncio.AbstractEventLoop, func, repetitions: int) -> float:
+    """Mediana en milisegundos"""
+    timings = []
+    for _ in range(repetitions):
+        started = time.perf_counter()
+        loop.run_until_complete(func())
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=100)
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.join(ROOT, "src"))
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from fastmcp.tools import Tool
+    from mcp.types import CallToolResult
+    from columnar import panel, serie, operaciones
+    from iol.base_routes import BaseRoutes
+    from iol.models import RawJSON, value_of
+
+    def herramienta() -> Dict[str, Any]:
+        return {}
+
+    routes = BaseRoutes()
+    decoded_tool = Tool.from_function(herramienta)
+    passthrough_tool = Tool.from_function(herramienta, output_schema=None)
+
+    def wire(result) -> bytes:
+        # Mensaje que el servidor serializa hacia el cliente
+        message = CallToolResult(content=result.content, structured_content=result.structured_content)
+        return message.model_dump_json(by_alias=True, exclude_none=True).encode()
+
+    rnd = random.Random(42)
+    datasets = [
+        ("panel acciones (300)", json.dumps(panel(300, rnd)).encode()),
+        ("serie histórica (2500)", json.dumps(serie(2500, rnd)).encode()),
+        ("operaciones (1000)", json.dumps(operaciones(1000, rnd)).encode())
+    ]
+
+    loop = asyncio.new_event_loop()
+    print(f"{'datos':<26}{'respuesta':<24}{'ms':>9}{'bytes':>11}")
+    for name, raw in datasets:
+        body = RawJSON(raw)
+
+        async def fetch() -> RawJSON:
+            return body
+
+        async def decoded() -> bytes:
+            return wire(decoded_tool.convert_result(routes.success_response(value_of(await fetch()))))
+
+        async def passthrough() -> bytes:
+            return wire(passthrough_tool.convert_result(await routes.passthrough_response(fetch())))
+
+        for variant, func in (("decodificar/recodificar", decoded), ("passthrough", passthrough)):
+            ms = measure(loop, func, args.repeticiones)
+            size = len(loop.run_until_complete(func()))
+            print(f"{name:<26}{variant:<24}{ms:>9.2f}{size:>11}")
+    loop.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Ejecuta herramientas del servidor contra un cassette grabado, sin credenciales ni red.
+
+Las respuestas de la API se reproducen con sus tiempos originales multiplicados por
+--escala (0 = sin demora), de modo que los resultados son deterministas y comparables.
+
+Grabación (con credenciales reales):
+    IOL_CASSETTE_MODE=record IOL_CASSETTE_FILE=cassettes/sesion.jsonl python src/main.py
+
+Reproducción:
+    python benchmarks/replay.py cassettes/sesion.jsonl llamadas.json [--repeticiones 20] [--escala 0] [--perfil]
+
+llamadas.json es una lista de herramientas a invocar:
+    [{"herramienta": "obtener_portafolio", "argumentos": {"pais": "argentina"}}, ...]
+"""
+from typing import Dict, Any, List
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import cProfile
+import pstats
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+async def run(calls: List[Dict[str, Any]], repetitions: int) -> Dict[str, List[float]]:
+    from fastmcp import FastMCP, Client
+    from main import register_routers
+
+    mcp = FastMCP("iol-replay")
+    register_routers(mcp, enable_asesores=True)
+    timings: Dict[str, List[float]] = {call["herramienta"]: [] for call in calls}
+    async with Client(mcp) as client:
+        for _ in range(repetitions):
+            for call in calls:
+                started = time.perf_counter()
+                result = await client.call_tool(call["herramienta"], call.get("argumentos", {}), raise_on_error=False)
+                timings[call["herramienta"]].append((time.perf_counter() - started) * 1000)
+                if result.is_error:
+                    print(f"{call['herramienta']}: {result.content[0].text}", file=sys.stderr)
+    return timings
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("cassette")
+    parser.add_argument("llamadas")
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--escala", type=float, default=1.0, help="Factor de los tiempos grabados")
+    parser.add_argument("--con-cache", action="store_true", help="Mantener la caché de lecturas activa")
+    parser.add_argument("--perfil", action="store_true", help="Mostrar las funciones más costosas (cProfile)")
+    args = parser.parse_args()
+
+    # La configuración se lee al importar los módulos del servidor
+    os.environ.update({
+        "IOL_CASSETTE_MODE": "replay",
+        "IOL_CASSETTE_FILE": os.path.abspath(args.cassette),
+        "IOL_CASSETTE_TIMING_SCALE": str(args.escala),
+        "IOL_CACHE_ENABLED": "true" if args.con_cache else "false",
+        "IOL_TOKEN_CACHE_ENABLED": "false"
+    })
+    sys.path.insert(0, os.path.join(ROOT, "src"))
+    with open(args.llamadas, encoding="utf-8") as f:
+        calls = json.load(f)
+
+    profiler = cProfile.Profile() if args.perfil else None
+    if profiler:
+        profiler.enable()
+    timings = asyncio.run(run(calls, args.repeticiones))
+    if profiler:
+        profiler.disable()
+
+    print(f"{'herramienta':<40}{'p50_ms':>10}{'p95_ms':>10}{'max_ms':>10}")
+    for name, values in timings.items():
+        values = sorted(values)
+        p95 = values[max(0, int(len(values) * 0.95) - 1)]
+        print(f"{name:<40}{statistics.median(values):>10.2f}{p95:>10.2f}{values[-1]:>10.2f}")
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+if __name__ == "__main__":
+    main()
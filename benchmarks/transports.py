@@ -0,0 +1,162 @@
+"""
+Compara los transportes MCP del servidor: latencia por llamada y memoria por sesión.
+
+Lanza src/main.py con cada transporte (credenciales ficticias, sin llamadas a la API),
+abre varias sesiones concurrentes y llama a una herramienta local (obtener_estado_mercados).
+
+Uso:
+    python benchmarks/transports.py [--sesiones 10] [--llamadas 50] [--puerto 18101]
+"""
+from typing import Dict, Any, List, Optional
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+import subprocess
+import tempfile
+from fastmcp import Client
+from fastmcp.client.transports import StdioTransport, SSETransport, StreamableHttpTransport
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "src", "main.py")
+TOOL = "obtener_estado_mercados"
+
+def _env(transport: str, port: int, stateless: bool = False) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "IOL_USERNAME": env.get("IOL_USERNAME", "benchmark"),
+        "IOL_PASSWORD": env.get("IOL_PASSWORD", "benchmark"),
+        "IOL_TRANSPORT": transport,
+        "IOL_STATELESS_HTTP": "true" if stateless else "false",
+        "IOL_TOKEN_CACHE_ENABLED": "false",
+        "HOST": "127.0.0.1",
+        "PORT": str(port)
+    })
+    return env
+
+def _rss_kb(pid: int) -> int:
+    """Memoria residente de un proceso (Linux)"""
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+async def _session_calls(client: Client, calls: int) -> List[float]:
+    latencies = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        await client.call_tool(TOOL, {})
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+async def _wait_ready(make_client, timeout: float = 30) -> float:
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            async with make_client():
+                return time.perf_counter() - started
+        except Exception:
+            await asyncio.sleep(0.1)
+    raise TimeoutError("El servidor no respondió a tiempo")
+
+def _summary(name: str, startup: float, latencies: List[float], memory_kb: float) -> Dict[str, Any]:
+    latencies = sorted(latencies)
+    return {
+        "transporte": name,
+        "arranque_s": round(startup, 2),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "memoria_por_sesion_kb": round(memory_kb)
+    }
+
+async def bench_http(name: str, transport: str, url: str, port: int, sessions: int, calls: int,
+                     stateless: bool = False) -> Dict[str, Any]:
+    """Un proceso servidor compartido por todas las sesiones"""
+    workdir = tempfile.mkdtemp(prefix="iol-bench-")
+    server = subprocess.Popen(
+        [sys.executable, MAIN], env=_env(transport, port, stateless), cwd=workdir,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    transport_cls = SSETransport if transport == "sse" else StreamableHttpTransport
+    try:
+        startup = await _wait_ready(lambda: Client(transport_cls(url)))
+        baseline = _rss_kb(server.pid)
+        clients = [Client(transport_cls(url)) for _ in range(sessions)]
+        for client in clients:
+            await client.__aenter__()
+        memory = (_rss_kb(server.pid) - baseline) / sessions
+        results = await asyncio.gather(*(_session_calls(c, calls) for c in clients))
+        for client in clients:
+            await client.__aexit__(None, None, None)
+        return _summary(name, startup, [x for r in results for x in r], memory)
+    finally:
+        server.terminate()
+        server.wait(10)
+
+async def bench_stdio(sessions: int, calls: int) -> Dict[str, Any]:
+    """Un proceso servidor por sesión, como lo lanzan los agentes locales"""
+    workdir = tempfile.mkdtemp(prefix="iol-bench-")
+    env = _env("stdio", 0)
+    log_file = open(os.devnull, "w")
+    started = time.perf_counter()
+    async with Client(StdioTransport(sys.executable, [MAIN], env=env, cwd=workdir, log_file=log_file)):
+        startup = time.perf_counter() - started
+    clients = [
+        Client(StdioTransport(sys.executable, [MAIN], env=env, cwd=workdir, log_file=log_file))
+        for _ in range(sessions)
+    ]
+    for client in clients:
+        await client.__aenter__()
+    pids = _child_pids()
+    memory = sum(_rss_kb(pid) for pid in pids) / max(len(pids), 1)
+    results = await asyncio.gather(*(_session_calls(c, calls) for c in clients))
+    for client in clients:
+        await client.__aexit__(None, None, None)
+    return _summary("stdio", startup, [x for r in results for x in r], memory)
+
+def _child_pids() -> List[int]:
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                cmdline = f.read()
+        except OSError:
+            continue
+        if ppid == os.getpid() and MAIN.encode() in cmdline:
+            pids.append(int(entry))
+    return pids
+
+async def main(sessions: int, calls: int, port: int, only: Optional[str]) -> None:
+    benches = {
+        "sse": lambda: bench_http("sse", "sse", f"http://127.0.0.1:{port}/sse", port, sessions, calls),
+        "streamable-http": lambda: bench_http(
+            "streamable-http", "streamable-http", f"http://127.0.0.1:{port + 1}/mcp", port + 1, sessions, calls
+        ),
+        "streamable-http-stateless": lambda: bench_http(
+            "streamable-http-stateless", "streamable-http", f"http://127.0.0.1:{port + 2}/mcp", port + 2,
+            sessions, calls, stateless=True
+        ),
+        "stdio": lambda: bench_stdio(sessions, calls)
+    }
+    print(f"{'transporte':<28}{'arranque_s':>12}{'p50_ms':>10}{'p95_ms':>10}{'memoria_por_sesion_kb':>24}")
+    for name, bench in benches.items():
+        if only and name != only:
+            continue
+        row = await bench()
+        print(f"{row['transporte']:<28}{row['arranque_s']:>12}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['memoria_por_sesion_kb']:>24}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sesiones", type=int, default=10)
+    parser.add_argument("--llamadas", type=int, default=50)
+    parser.add_argument("--puerto", type=int, default=18101)
+    parser.add_argument("--solo", choices=["sse", "streamable-http", "streamable-http-stateless", "stdio"])
+    args = parser.parse_args()
+    asyncio.run(main(args.sesiones, args.llamadas, args.puerto, args.solo))
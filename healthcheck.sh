@@ -4,7 +4,7 @@
 # Configuración
 HOST="localhost"
 PORT="8001"
-ENDPOINT="/sse/"
+ENDPOINT="/healthz"
 TIMEOUT=10
 MAX_RETRIES=3
 
@@ -13,7 +13,7 @@ check_server() {
     local retry_count=0
     
     while [ $retry_count -lt $MAX_RETRIES ]; do
-        # Intentar conectar al endpoint SSE
+        # Consultar el endpoint de liveness (no abre el stream SSE)
         response=$(curl -s -o /dev/null -w "%{http_code}" --max-time $TIMEOUT "http://$HOST:$PORT$ENDPOINT" 2>/dev/null)
         
         if [ "$response" = "200" ]; then
@@ -1,15 +1,58 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Set
+import os
+import time
+import logging
 from ..http_client import IOLAPIClient
+from ..batch import run_bounded
+
+logger = logging.getLogger(__name__)
+
+def option_ids(cuestionario: Any) -> Set[int]:
+    """Ids de todas las opciones del cuestionario (objetos con "id" en cualquier nivel)"""
+    ids: Set[int] = set()
+    pending = [cuestionario]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, dict):
+            if isinstance(node.get("id"), int):
+                ids.add(node["id"])
+            pending.extend(node.values())
+        elif isinstance(node, list):
+            pending.extend(node)
+    return ids
+
+def unknown_answers(respuestas: Dict[str, Any], ids: Set[int]) -> List[str]:
+    """Respuestas (campo=id) cuyo id no figura entre las opciones del cuestionario"""
+    unknown = []
+    for campo, valor in respuestas.items():
+        valores = valor if isinstance(valor, list) else [valor]
+        unknown.extend(f"{campo}={v}" for v in valores if isinstance(v, int) and not isinstance(v, bool) and v not in ids)
+    return unknown
 
 class AsesoresTestInversorClient(IOLAPIClient):
-    async def obtener_test_inversor(self) -> Dict[str, Any]:
+    def __init__(self):
+        """Inicializa el cliente con caché del cuestionario del test de inversor"""
+        super().__init__()
+        self.test_ttl = float(os.getenv('IOL_TEST_INVERSOR_TTL', '86400'))
+        self._test_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
+    async def obtener_test_inversor(self, usar_cache: bool = True) -> Dict[str, Any]:
         """
         Obtiene las preguntas del test de inversor para asesores
         
+        El cuestionario cambia muy poco, por lo que se cachea durante IOL_TEST_INVERSOR_TTL segundos.
+        
+        Args:
+            usar_cache: Si es False, se consulta la API aunque haya un cuestionario cacheado
+        
         Returns:
             Dict[str, Any]: Objeto PreguntasAsesoresTestInversorResponseModel con las preguntas del test
         """
-        return await self.get("/api/v2/asesores/test-inversor")
+        if usar_cache and self._test_cache and time.monotonic() - self._test_cache[0] < self.test_ttl:
+            return self._test_cache[1]
+        result = await self.get("/api/v2/asesores/test-inversor")
+        self._test_cache = (time.monotonic(), result)
+        return result
     
     async def calcular_perfil_sin_guardar(
         self,
@@ -41,4 +84,50 @@ class AsesoresTestInversorClient(IOLAPIClient):
         Returns:
             Dict[str, Any]: Objeto PerfilCalculadoResponseModel con el perfil calculado
         """
-        return await self.post(f"/api/v2/asesores/test-inversor/{id_cliente_asesorado}", json=respuesta_inversor) 
\ No newline at end of file
+        return await self.post(f"/api/v2/asesores/test-inversor/{id_cliente_asesorado}", json=respuesta_inversor)
+    
+    async def calcular_perfiles_lote(
+        self,
+        solicitudes: List[Dict[str, Any]],
+        guardar: bool = True,
+        max_concurrencia: Optional[int] = None
+    ) -> List[Tuple[int, Any, Optional[str]]]:
+        """
+        Calcula el perfil de varios inversores en paralelo. Antes de enviarlas, las respuestas
+        se validan contra el cuestionario cacheado (obtener_test_inversor): las que eligen una
+        opción inexistente se informan como error sin consultar la API. Si alguna no coincide,
+        el cuestionario se vuelve a pedir una vez por si cambió.
+        
+        Args:
+            solicitudes: Lista de objetos con id_cliente_asesorado (opcional si no se guarda) y respuestas
+            guardar: Si es True se guarda el perfil de cada cliente asesorado; si no, solo se calcula
+            max_concurrencia: Cantidad máxima de cálculos simultáneos
+            
+        Returns:
+            List[Tuple[int, Any, Optional[str]]]: Tuplas (índice de la solicitud, perfil, error)
+        """
+        try:
+            ids = option_ids(await self.obtener_test_inversor())
+            if ids and any(unknown_answers(s["respuestas"], ids) for s in solicitudes):
+                ids = option_ids(await self.obtener_test_inversor(usar_cache=False))
+        except Exception as e:
+            logger.warning(f"No se pudo obtener el cuestionario para validar el lote: {str(e)}")
+            ids = set()
+
+        async def _calcular(indice: int) -> Dict[str, Any]:
+            solicitud = solicitudes[indice]
+            id_cliente = solicitud.get("id_cliente_asesorado")
+            # Sin ids reconocibles en el cuestionario no se valida (se deja la validación a la API)
+            invalidas = unknown_answers(solicitud["respuestas"], ids) if ids else []
+            if invalidas:
+                raise ValueError(f"Respuestas que no figuran en el cuestionario: {', '.join(invalidas)}")
+            if guardar:
+                if id_cliente is None:
+                    raise ValueError("id_cliente_asesorado es requerido para guardar el perfil")
+                return await self.calcular_perfil(
+                    id_cliente_asesorado=id_cliente,
+                    respuesta_inversor=solicitud["respuestas"]
+                )
+            return await self.calcular_perfil_sin_guardar(respuesta_inversor=solicitud["respuestas"])
+
+        return await run_bounded(range(len(solicitudes)), _calcular, max_concurrencia)
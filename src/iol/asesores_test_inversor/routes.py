@@ -2,6 +2,7 @@ from typing import Dict, Any, Optional, List, Union
 from fastmcp import FastMCP
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from ..base_routes import BaseRoutes
+from ..batch import split_results
 from .client import AsesoresTestInversorClient
 
 class RespuestasAsesorTestInversorBindingModel(BaseModel):
@@ -25,6 +26,13 @@ class RespuestasAsesorTestInversorBindingModel(BaseModel):
             return None
         return v
 
+class PerfilAsesoradoLoteModel(BaseModel):
+    """Modelo para una solicitud del cálculo de perfiles en lote"""
+    id_cliente_asesorado: Optional[int] = Field(default=None, description="ID del cliente asesorado (requerido si se guarda el perfil)")
+    respuestas: RespuestasAsesorTestInversorBindingModel = Field(description="Respuestas del test de inversor del cliente")
+    
+    model_config = ConfigDict(extra="ignore", validate_assignment=True)
+
 class AsesoresTestInversorRoutes(BaseRoutes):
     def __init__(self):
         super().__init__()
@@ -36,15 +44,20 @@ class AsesoresTestInversorRoutes(BaseRoutes):
             description="Obtener preguntas del test de inversor para asesores",
             tags=["asesores", "test_inversor"]
         )
-        async def obtener_test_inversor() -> Dict[str, Any]:
+        async def obtener_test_inversor(
+            usar_cache: bool = Field(default=True, description="Usar el cuestionario cacheado si está vigente")
+        ) -> Dict[str, Any]:
             """
             Obtiene las preguntas del test de inversor para asesores
             
+            Args:
+                usar_cache: Usar el cuestionario cacheado si está vigente
+            
             Returns:
                 Dict[str, Any]: Objeto con las preguntas del test
             """
             try:
-                result = await self.client.obtener_test_inversor()
+                result = await self.client.obtener_test_inversor(usar_cache=usar_cache)
                 return {
                     "success": True,
                     "result": result
@@ -135,4 +148,62 @@ class AsesoresTestInversorRoutes(BaseRoutes):
                     "result": result
                 }
             except Exception as e:
-                return {"error": f"Error calculando perfil: {str(e)}"} 
\ No newline at end of file
+                return {"error": f"Error calculando perfil: {str(e)}"}
+                
+        @mcp.tool(
+            name="calcular_perfiles_lote",
+            description="Calcular en paralelo el perfil de varios inversores asesorados",
+            tags=["asesores", "test_inversor", "perfil", "lote"]
+        )
+        async def calcular_perfiles_lote(
+            solicitudes: List[PerfilAsesoradoLoteModel] = Field(description="Clientes y respuestas del test de inversor de cada uno"),
+            guardar: bool = Field(default=True, description="Guardar el perfil de cada cliente asesorado"),
+            max_concurrencia: Optional[int] = Field(default=None, description="Cantidad máxima de cálculos simultáneos")
+        ) -> Dict[str, Any]:
+            """
+            Calcula el perfil de varios inversores en paralelo
+            
+            Args:
+                solicitudes: Clientes y respuestas del test de inversor de cada uno
+                guardar: Guardar el perfil de cada cliente asesorado
+                max_concurrencia: Cantidad máxima de cálculos simultáneos
+                
+            Returns:
+                Dict[str, Any]: Perfiles calculados, errores por cliente y resumen por perfil
+            """
+            try:
+                payload = [
+                    {
+                        "id_cliente_asesorado": solicitud.id_cliente_asesorado,
+                        "respuestas": solicitud.respuestas.model_dump(exclude_none=True)
+                    }
+                    for solicitud in solicitudes
+                ]
+                outcomes = await self.client.calcular_perfiles_lote(
+                    solicitudes=payload,
+                    guardar=guardar,
+                    max_concurrencia=max_concurrencia
+                )
+                outcomes = [
+                    (solicitudes[indice].id_cliente_asesorado, result, error)
+                    for indice, result, error in outcomes
+                ]
+                results, errors = split_results(outcomes, "id_cliente_asesorado")
+                resumen: Dict[str, int] = {}
+                for item in results:
+                    perfil = item["result"].get("perfil") if isinstance(item["result"], dict) else None
+                    key = str(perfil.get("nombre", perfil) if isinstance(perfil, dict) else perfil)
+                    resumen[key] = resumen.get(key, 0) + 1
+                return {
+                    "success": not errors,
+                    "result": results,
+                    "errors": errors,
+                    "resumen": {
+                        "total": len(solicitudes),
+                        "calculados": len(results),
+                        "con_error": len(errors),
+                        "por_perfil": resumen
+                    }
+                }
+            except Exception as e:
+                return {"error": f"Error calculando perfiles en lote: {str(e)}"}
@@ -1,5 +1,14 @@
-from typing import Dict, Any
+from typing import Dict, Any, Awaitable
 from fastmcp import FastMCP
+from mcp.types import TextContent
+from .cache import pop_stale_marker
+from .http_client import passthrough
+from .models import RawJSON, dumps, value_of
+
+try:
+    from fastmcp.tools import ToolResult
+except ImportError:  # pragma: no cover - fastmcp 2.x
+    from fastmcp.tools.tool import ToolResult
 
 class BaseRoutes:
     """Clase base para todas las rutas de la API"""
@@ -26,4 +35,55 @@ class BaseRoutes:
         """
         if not self.client:
             raise ValueError("Cliente no inicializado")
-        return self.client.get_auth_headers() 
\ No newline at end of file
+        return self.client.get_auth_headers()
+
+    def success_response(self, result: Any) -> Dict[str, Any]:
+        """
+        Arma la respuesta exitosa de una herramienta. Si la API no respondió y se
+        sirvió el último valor cacheado, se agrega "stale_since" con su fecha.
+        
+        Args:
+            result: Resultado de la llamada al cliente
+            
+        Returns:
+            Dict[str, Any]: Respuesta de la herramienta
+        """
+        response = {
+            "success": True,
+            "result": result
+        }
+        stale_since = pop_stale_marker()
+        if stale_since:
+            response["stale_since"] = stale_since
+        return response
+
+    async def passthrough_response(self, call: Awaitable[Any]) -> Any:
+        """
+        Arma la respuesta de una herramienta que devuelve sin cambios una única lectura del
+        cliente: el cuerpo de la API se inserta tal cual en {"success": true, "result": ...},
+        sin decodificarlo ni volver a codificarlo. La respuesta no trae contenido estructurado,
+        por lo que la herramienta se registra con output_schema=None.
+        
+        Args:
+            call: Llamada al cliente que hace una sola lectura GET y devuelve su resultado
+            
+        Returns:
+            Any: ToolResult con la respuesta en texto, o la respuesta de success_response si
+                el resultado ya está decodificado (IOL_PASSTHROUGH_ENABLED=false) o el cuerpo
+                no es UTF-8 (en ese caso se decodifica como JSON, que admite UTF-16/32, y se
+                vuelve a codificar; un cuerpo inválido lanza la excepción del decodificador)
+        """
+        with passthrough():
+            result = await call
+        if not isinstance(result, RawJSON):
+            return self.success_response(result)
+        try:
+            body = result.decode("utf-8") if result and not result.isspace() else "null"
+        except UnicodeDecodeError:
+            return self.success_response(value_of(result))
+        parts = ['{"success":true,"result":', body]
+        stale_since = pop_stale_marker()
+        if stale_since:
+            parts.append(',"stale_since":' + dumps(stale_since).decode())
+        parts.append("}")
+        return ToolResult(content=[TextContent(type="text", text="".join(parts))])
@@ -0,0 +1,122 @@
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Tuple, TypeVar
+from datetime import date, timedelta
+import os
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Paralelismo máximo por defecto para las herramientas de lote
+DEFAULT_MAX_CONCURRENCY = int(os.getenv('IOL_BATCH_MAX_CONCURRENCY', '5'))
+
+async def run_bounded(
+    items: Iterable[T],
+    func: Callable[[T], Awaitable[Any]],
+    max_concurrency: Optional[int] = None,
+    progress: Optional[Callable[[int, int], Awaitable[None]]] = None
+) -> List[Tuple[T, Any, Optional[str]]]:
+    """
+    Ejecuta una corrutina por cada elemento con paralelismo acotado
+
+    Args:
+        items: Elementos a procesar
+        func: Corrutina a ejecutar para cada elemento
+        max_concurrency: Cantidad máxima de llamadas simultáneas
+        progress: Corrutina llamada con (completados, total) al terminar cada elemento
+
+    Returns:
+        List[Tuple[T, Any, Optional[str]]]: Tuplas (elemento, resultado, error) en el orden de entrada
+    """
+    items = list(items)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency or DEFAULT_MAX_CONCURRENCY))
+    completed = 0
+
+    async def _run(item: T) -> Tuple[T, Any, Optional[str]]:
+        nonlocal completed
+        async with semaphore:
+            try:
+                outcome = item, await func(item), None
+            except Exception as e:
+                logger.warning(f"Error procesando elemento {item!r} del lote: {str(e)}")
+                outcome = item, None, str(e)
+        completed += 1
+        if progress is not None:
+            await progress(completed, len(items))
+        return outcome
+
+    return await asyncio.gather(*(_run(item) for item in items))
+
+def split_date_range(fecha_desde: str, fecha_hasta: str, days: int) -> List[Tuple[str, str]]:
+    """
+    Divide un rango de fechas en tramos consecutivos de hasta days días
+
+    Args:
+        fecha_desde: Fecha desde en formato ISO (YYYY-MM-DD)
+        fecha_hasta: Fecha hasta en formato ISO (YYYY-MM-DD)
+        days: Días máximos por tramo
+
+    Returns:
+        List[Tuple[str, str]]: Tramos (desde, hasta) en orden cronológico, ambos extremos incluidos
+    """
+    start = date.fromisoformat(fecha_desde[:10])
+    end = date.fromisoformat(fecha_hasta[:10])
+    ranges = []
+    while start <= end:
+        stop = min(end, start + timedelta(days=days - 1))
+        ranges.append((start.isoformat(), stop.isoformat()))
+        start = stop + timedelta(days=1)
+    return ranges
+
+def split_results(
+    outcomes: List[Tuple[Any, Any, Optional[str]]],
+    key: str
+) -> Tuple[List[dict], List[dict]]:
+    """
+    Separa los resultados de un lote en éxitos y errores
+
+    Args:
+        outcomes: Tuplas devueltas por run_bounded
+        key: Nombre del campo con el que se identifica cada elemento
+
+    Returns:
+        Tuple[List[dict], List[dict]]: Resultados exitosos y errores por elemento
+    """
+    results = []
+    errors = []
+    for item, result, error in outcomes:
+        if error is None:
+            results.append({key: item, "result": result})
+        else:
+            errors.append({key: item, "error": error})
+    return results, errors
+
+def merge_chunks(outcomes: List[Tuple[Any, Any, Optional[str]]], key: Optional[str] = None) -> List[Any]:
+    """
+    Une las listas devueltas por consultas hechas por tramos, de la más reciente a la más antigua
+
+    Args:
+        outcomes: Tuplas devueltas por run_bounded con un tramo por elemento, en orden cronológico
+        key: Campo (o atributo de los modelos) para descartar filas repetidas en los bordes de los tramos (opcional)
+
+    Returns:
+        List[Any]: Filas de todos los tramos
+
+    Raises:
+        RuntimeError: Si falló algún tramo (un resultado parcial sería engañoso)
+    """
+    failed = [(item, error) for item, _, error in outcomes if error is not None]
+    if failed:
+        item, error = failed[0]
+        raise RuntimeError(f"Falló el tramo {item[0]} a {item[1]} ({len(failed)} de {len(outcomes)}): {error}")
+    rows, seen = [], set()
+    for _, result, _ in reversed(outcomes):
+        for row in result or []:
+            value = (row.get(key) if isinstance(row, dict) else getattr(row, key, None)) if key else None
+            if value is not None:
+                if value in seen:
+                    continue
+                seen.add(value)
+            rows.append(row)
+    return rows
@@ -0,0 +1,428 @@
+from typing import Dict, Any, Optional, List, Tuple, Iterable
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+import os
+import re
+import time
+import logging
+from .market_calendar import market_calendar
+from .shared_state import SharedCacheBackend, get_shared_backend
+from .models import RawJSON, value_of, as_raw
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENABLED = os.getenv('IOL_CACHE_ENABLED', 'true').lower() == 'true'
+MAX_ENTRIES = int(os.getenv('IOL_CACHE_MAX_ENTRIES', '2000'))
+
+# TTL por grupo de endpoints de lectura, en segundos
+TTL_CUENTA = float(os.getenv('IOL_CACHE_TTL_CUENTA', '10'))
+TTL_COTIZACION = float(os.getenv('IOL_CACHE_TTL_COTIZACION', '5'))
+TTL_PANEL = float(os.getenv('IOL_CACHE_TTL_PANEL', '15'))
+TTL_CATALOGO = float(os.getenv('IOL_CACHE_TTL_CATALOGO', '3600'))
+
+# Vencido el TTL, la entrada se sigue sirviendo mientras se revalida en segundo plano
+# durante ttl * IOL_CACHE_SWR_FACTOR segundos adicionales
+SWR_FACTOR = float(os.getenv('IOL_CACHE_SWR_FACTOR', '2'))
+# Antigüedad máxima de una entrada servida en modo degradado (API caída)
+MAX_STALE = float(os.getenv('IOL_CACHE_MAX_STALE', '86400'))
+
+# Fecha desde la que la respuesta servida en la petición actual está desactualizada
+_stale_since: ContextVar[Optional[str]] = ContextVar("stale_since", default=None)
+
+def mark_stale(entry: "CacheEntry") -> None:
+    """Marca la petición actual como servida en modo degradado"""
+    _stale_since.set(datetime.fromtimestamp(entry.stored_at).isoformat(timespec="seconds"))
+
+def pop_stale_marker() -> Optional[str]:
+    """Devuelve y limpia la marca de modo degradado de la petición actual"""
+    value = _stale_since.get()
+    if value is not None:
+        _stale_since.set(None)
+    return value
+
+# Grupos cuyo contenido solo cambia durante la rueda del mercado
+MARKET_GROUPS = {"cotizacion", "panel", "opciones"}
+
+# Grupos que admiten stale-while-revalidate. Los de la cuenta (saldo, posiciones,
+# operaciones) no: un valor vencido se vuelve a pedir a la API antes de responder
+SWR_GROUPS = MARKET_GROUPS | {"catalogo", "serie_historica"}
+
+# Mercado de una orden -> país de la cuenta afectada
+MERCADO_PAIS = {
+    "bcba": "argentina",
+    "rofx": "argentina",
+    "nyse": "estados_unidos",
+    "nasdaq": "estados_unidos",
+    "amex": "estados_unidos"
+}
+
+@dataclass(frozen=True)
+class ReadPolicy:
+    """Endpoint de lectura cacheable: grupo al que pertenece y TTL"""
+    group: str
+    pattern: re.Pattern
+    ttl: float
+
+@dataclass(frozen=True)
+class MutationPolicy:
+    """Endpoint de escritura y grupos de lectura que invalida al completarse"""
+    method: str
+    pattern: re.Pattern
+    groups: Tuple[str, ...]
+
+def _re(pattern: str) -> re.Pattern:
+    return re.compile(pattern, re.IGNORECASE)
+
+READ_POLICIES: List[ReadPolicy] = [
+    ReadPolicy("estado_cuenta", _re(r"^/api/v2/estadocuenta$"), TTL_CUENTA),
+    ReadPolicy("portafolio", _re(r"^/api/v2/portafolio/(?P<pais>[^/]+)$"), TTL_CUENTA),
+    ReadPolicy("portafolio", _re(r"^/api/v2/portafolio(/(valorizado|rendimiento|composicion))?$"), TTL_CUENTA),
+    ReadPolicy("operaciones", _re(r"^/api/v2/operaciones$"), TTL_CUENTA),
+    ReadPolicy("cotizacion", _re(r"^/api/v2/(?P<mercado>[^/]+)/titulos/[^/]+/cotizacion$"), TTL_COTIZACION),
+    ReadPolicy("cotizacion", _re(r"^/api/v2/(?P<mercado>[^/]+)/titulos/[^/]+/cotizaciondetallemobile/[^/]+$"), TTL_COTIZACION),
+    ReadPolicy("panel", _re(r"^/api/v2/cotizaciones-orleans-panel/[^/]+/(?P<pais>[^/]+)/\w+$"), TTL_PANEL),
+    ReadPolicy("panel", _re(r"^/api/v2/(?P<pais>[^/]+)/titulos/cotizacion/paneles/[^/]+$"), TTL_PANEL),
+    ReadPolicy("opciones", _re(r"^/api/v2/(?P<mercado>[^/]+)/titulos/[^/]+/opciones$"), TTL_PANEL),
+    ReadPolicy("catalogo", _re(r"^/api/v2/(?P<pais>[^/]+)/titulos/cotizacion/instrumentos$"), TTL_CATALOGO),
+    ReadPolicy("catalogo", _re(r"^/api/v2/titulos/fci(/tipofondos)?$"), TTL_CATALOGO),
+    ReadPolicy("serie_historica", _re(r"^/api/v2/(?P<mercado>[^/]+)/titulos/[^/]+/cotizacion/seriehistorica/"), TTL_CATALOGO),
+]
+
+# Grupos afectados por cualquier operación que mueva saldo o posiciones
+# (también los invalida el seguimiento de operaciones al detectar un cambio de estado)
+ACCOUNT_GROUPS = ("estado_cuenta", "portafolio", "operaciones")
+
+MUTATION_POLICIES: List[MutationPolicy] = [
+    MutationPolicy("POST", _re(r"^/api/v2/operar/(comprar|vender|comprarespecied|venderespecied)$"), ACCOUNT_GROUPS),
+    MutationPolicy("POST", _re(r"^/api/v2/operar/(suscripcion|rescate)/fci$"), ACCOUNT_GROUPS),
+    MutationPolicy("POST", _re(r"^/api/v2/operar/cpd$"), ACCOUNT_GROUPS),
+    MutationPolicy("POST", _re(r"^/api/v2/operatoriasimplificada/comprar$"), ACCOUNT_GROUPS),
+    MutationPolicy("DELETE", _re(r"^/api/v2/operaciones/\d+$"), ACCOUNT_GROUPS),
+]
+
+def _normalize_country(value: Optional[str]) -> Optional[str]:
+    return value.lower() if value else None
+
+def _country_from(match: re.Match, params: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Obtiene el país al que corresponde una lectura (None si abarca todos)"""
+    groups = match.groupdict()
+    if groups.get("pais"):
+        return _normalize_country(groups["pais"])
+    if groups.get("mercado"):
+        return MERCADO_PAIS.get(groups["mercado"].lower())
+    params = params or {}
+    return _normalize_country(params.get("pais") or params.get("filtro.pais"))
+
+def _mutation_country(endpoint: str, json: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Obtiene el país afectado por una escritura (None si no se puede determinar)"""
+    json = json or {}
+    if json.get("mercado"):
+        return MERCADO_PAIS.get(str(json["mercado"]).lower())
+    if "/fci" in endpoint.lower():
+        return "argentina"
+    return None
+
+# Valor de una entrada guardada como RawJSON que todavía no se decodificó
+_UNDECODED = object()
+
+class CacheEntry:
+    """
+    Respuesta cacheada con su grupo, país y vigencia (en hora de reloj, comparable entre workers),
+    y los validadores HTTP (ETag, Last-Modified) para revalidarla con una petición condicional.
+    Si se guarda el cuerpo sin decodificar (RawJSON), se decodifica recién al leer value.
+    """
+    __slots__ = (
+        "_value", "raw", "group", "account", "country", "ttl", "swr_window", "stored_at", "expires_at",
+        "etag", "last_modified", "size"
+    )
+
+    def __init__(
+        self,
+        value: Any,
+        group: str,
+        account: Optional[str],
+        country: Optional[str],
+        ttl: float,
+        swr_window: float,
+        stored_at: Optional[float] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        size: int = 0
+    ):
+        self.raw = value if isinstance(value, RawJSON) else None
+        self._value = _UNDECODED if self.raw is not None else value
+        self.group = group
+        self.account = account
+        self.country = country
+        self.ttl = ttl
+        self.swr_window = swr_window
+        self.stored_at = stored_at if stored_at is not None else time.time()
+        self.expires_at = self.stored_at + ttl
+        self.etag = etag
+        self.last_modified = last_modified
+        # Bytes transferidos por la respuesta completa (los que ahorra una respuesta 304)
+        self.size = size
+
+    @property
+    def value(self) -> Any:
+        """Respuesta decodificada"""
+        if self._value is _UNDECODED:
+            self._value = value_of(self.raw)
+        return self._value
+
+    @property
+    def body(self) -> RawJSON:
+        """Respuesta como JSON sin decodificar, para reenviarla tal cual"""
+        if self.raw is None:
+            self.raw = as_raw(self._value)
+        return self.raw
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def revalidatable(self) -> bool:
+        """Vencida pero todavía dentro de la ventana stale-while-revalidate"""
+        return time.time() < self.expires_at + self.swr_window
+
+    @property
+    def usable_when_degraded(self) -> bool:
+        """Puede servirse como último valor conocido si la API no responde"""
+        return time.time() - self.stored_at < MAX_STALE
+
+class ResponseCache:
+    """
+    Caché de respuestas GET compartida por todos los clientes, con invalidación dirigida por escrituras.
+    Con varios workers, las entradas se publican además en un almacén SQLite común y la copia
+    en memoria solo se usa mientras coincida con la versión compartida.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = MAX_ENTRIES,
+        enabled: bool = CACHE_ENABLED,
+        backend: Optional[SharedCacheBackend] = None
+    ):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.backend = backend
+        self._entries: "OrderedDict[Tuple, CacheEntry]" = OrderedDict()
+        self._refreshing: set = set()
+        self.stats = {
+            "hits": 0, "stale_hits": 0, "degraded_hits": 0, "misses": 0, "invalidations": 0, "not_modified": 0
+        }
+
+    @staticmethod
+    def make_key(account: Optional[str], endpoint: str, params: Optional[Dict[str, Any]]) -> Tuple:
+        """Clave de caché: cuenta, endpoint y parámetros ordenados"""
+        return (account, endpoint, tuple(sorted((params or {}).items())))
+
+    @staticmethod
+    def policy_for(endpoint: str) -> Optional[Tuple[ReadPolicy, re.Match]]:
+        """Devuelve la política de lectura que aplica al endpoint, si es cacheable"""
+        for policy in READ_POLICIES:
+            match = policy.pattern.match(endpoint)
+            if match:
+                return policy, match
+        return None
+
+    async def get(self, key: Tuple) -> Optional[CacheEntry]:
+        """Devuelve la entrada cacheada (vigente o no) sin contabilizar aciertos"""
+        entry = self._entries.get(key)
+        if self.backend is not None:
+            entry = await self._sync_shared(key, entry)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def _sync_shared(self, key: Tuple, entry: Optional[CacheEntry]) -> Optional[CacheEntry]:
+        """Alinea la copia local con el almacén compartido (invalidada o actualizada por otro worker)"""
+        version = await self.backend.run(self.backend.version, key)
+        if version is None:
+            self._entries.pop(key, None)
+            return None
+        if entry is not None and entry.stored_at == version:
+            return entry
+        shared = await self.backend.run(self.backend.load, key)
+        if shared is None:
+            self._entries.pop(key, None)
+            return None
+        entry = CacheEntry(**shared)
+        self._entries[key] = entry
+        return entry
+
+    async def lookup(self, key: Tuple) -> Tuple[Optional[CacheEntry], bool]:
+        """
+        Busca una entrada para servir una lectura
+
+        Returns:
+            Tuple[Optional[CacheEntry], bool]: La entrada (si existe) y si puede servirse
+                sin consultar la API, ya sea vigente o dentro de la ventana stale-while-revalidate
+        """
+        entry = await self.get(key) if self.enabled else None
+        if entry is not None and entry.fresh:
+            self.stats["hits"] += 1
+            return entry, True
+        if entry is not None and entry.revalidatable:
+            self.stats["stale_hits"] += 1
+            return entry, True
+        self.stats["misses"] += 1
+        return entry, False
+
+    async def fresh_entries(self, account: Optional[str], groups: Iterable[str]) -> List[Tuple[Tuple, CacheEntry]]:
+        """
+        Devuelve las entradas vigentes de una cuenta en los grupos indicados, sin contabilizar aciertos.
+        Con varios workers se consultan en el almacén compartido, que incluye las guardadas por los demás
+        """
+        groups = set(groups)
+        if not self.enabled:
+            return []
+        if self.backend is None:
+            return [
+                (key, entry) for key, entry in list(self._entries.items())
+                if entry.account == account and entry.group in groups and entry.fresh
+            ]
+        entries = []
+        for key, shared in await self.backend.run(self.backend.fresh, account, groups, time.time()):
+            entry = self._entries.get(key)
+            if entry is None or entry.stored_at != shared["stored_at"]:
+                # Se reutiliza la copia local solo si es la misma versión (ya decodificada)
+                entry = self._entries[key] = CacheEntry(**shared)
+            entries.append((key, entry))
+        return entries
+
+    def begin_refresh(self, key: Tuple) -> bool:
+        """Registra una revalidación en curso; devuelve False si ya hay una para la misma clave"""
+        if key in self._refreshing:
+            return False
+        self._refreshing.add(key)
+        return True
+
+    def end_refresh(self, key: Tuple) -> None:
+        """Marca como terminada la revalidación de una clave"""
+        self._refreshing.discard(key)
+
+    def store(
+        self,
+        key: Tuple,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        value: Any,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        size: int = 0
+    ) -> Optional[CacheEntry]:
+        """
+        Guarda una respuesta si el endpoint tiene una política de lectura
+
+        Args:
+            key: Clave de caché
+            endpoint: Endpoint de la API
+            params: Parámetros de la petición
+            value: Respuesta decodificada o cuerpo sin decodificar (RawJSON)
+            etag: Header ETag de la respuesta (opcional)
+            last_modified: Header Last-Modified de la respuesta (opcional)
+            size: Bytes transferidos por la respuesta
+
+        Returns:
+            Optional[CacheEntry]: La entrada guardada, o None si el endpoint no se cachea
+        """
+        if not self.enabled:
+            return None
+        found = self.policy_for(endpoint)
+        if found is None:
+            return None
+        policy, match = found
+        ttl = policy.ttl
+        if policy.group in MARKET_GROUPS:
+            # Fuera de la rueda el último dato es definitivo hasta la próxima apertura
+            groups = match.groupdict()
+            mercado = market_calendar.resolve(groups.get("mercado"), groups.get("pais"))
+            ttl = market_calendar.ttl_for(mercado, ttl)
+        swr_window = policy.ttl * SWR_FACTOR if policy.group in SWR_GROUPS else 0.0
+        entry = CacheEntry(
+            value, policy.group, key[0], _country_from(match, params), ttl, swr_window,
+            etag=etag, last_modified=last_modified, size=size
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if self.backend is not None:
+            # Se encola el cuerpo ya codificado: el valor decodificado puede seguir usándose en el event loop
+            self.backend.submit(
+                self.backend.put, key, entry.body, entry.group, entry.account, entry.country, entry.stored_at,
+                entry.ttl, entry.swr_window, entry.etag, entry.last_modified, entry.size
+            )
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def renew(self, key: Tuple, endpoint: str, params: Optional[Dict[str, Any]], entry: CacheEntry) -> CacheEntry:
+        """
+        Renueva la vigencia de una entrada que la API confirmó sin cambios (respuesta 304)
+
+        Returns:
+            CacheEntry: La entrada renovada
+        """
+        self.stats["not_modified"] += 1
+        value = entry.raw if entry.raw is not None else entry.value
+        return self.store(key, endpoint, params, value, entry.etag, entry.last_modified, entry.size) or entry
+
+    def invalidate(self, account: Optional[str], groups: Iterable[str], country: Optional[str] = None) -> int:
+        """
+        Elimina las lecturas de una cuenta afectadas por una escritura
+
+        Args:
+            account: Cuenta cuyas entradas se invalidan
+            groups: Grupos de lectura afectados
+            country: País afectado; None invalida todos los países. Las entradas sin país
+                (que abarcan todos) se invalidan siempre.
+
+        Returns:
+            int: Cantidad de entradas eliminadas
+        """
+        groups = set(groups)
+        stale = [
+            key for key, entry in self._entries.items()
+            if entry.account == account and entry.group in groups
+            and (country is None or entry.country is None or entry.country == country)
+        ]
+        for key in stale:
+            del self._entries[key]
+        removed = len(stale)
+        if self.backend is not None:
+            # Las entradas compartidas se eliminan en el hilo del almacén (solo se cuentan las locales)
+            self.backend.submit(self.backend.delete, account, groups, country)
+        self.stats["invalidations"] += removed
+        return removed
+
+    def invalidate_for_mutation(
+        self,
+        account: Optional[str],
+        method: str,
+        endpoint: str,
+        json: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Aplica el mapa de dependencias a una escritura completada"""
+        if (json or {}).get("soloValidar"):
+            return 0
+        for policy in MUTATION_POLICIES:
+            if policy.method == method.upper() and policy.pattern.match(endpoint):
+                removed = self.invalidate(account, policy.groups, _mutation_country(endpoint, json))
+                logger.debug(f"{method} {endpoint} invalidó {removed} lecturas cacheadas")
+                return removed
+        return 0
+
+    def clear(self) -> None:
+        """Vacía la caché"""
+        self._entries.clear()
+        if self.backend is not None:
+            self.backend.submit(self.backend.clear)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+# Instancia compartida por todos los clientes de la API
+response_cache = ResponseCache(backend=get_shared_backend(MAX_ENTRIES))
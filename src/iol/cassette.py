@@ -0,0 +1,128 @@
+from typing import Dict, Any, Optional, List, Tuple
+from collections import defaultdict
+import os
+import json
+import time
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# off, record o replay
+CASSETTE_MODE = os.getenv('IOL_CASSETTE_MODE', 'off').lower()
+CASSETTE_FILE = os.getenv('IOL_CASSETTE_FILE', os.path.join('cassettes', 'default.jsonl'))
+# Escala de los tiempos grabados al reproducir: 1 = originales, 0 = sin demora, 0.5 = la mitad
+TIMING_SCALE = float(os.getenv('IOL_CASSETTE_TIMING_SCALE', '1'))
+
+# Campos que nunca se escriben en un cassette
+SECRET_KEYS = {"password", "username", "token", "access_token", "refresh_token", "authorization", "clave", "pin"}
+REDACTED = "***"
+
+def redact(value: Any) -> Any:
+    """Reemplaza recursivamente los valores de campos sensibles"""
+    if isinstance(value, dict):
+        return {k: REDACTED if k.lower() in SECRET_KEYS else redact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(v) for v in value]
+    return value
+
+def request_key(method: str, endpoint: str, params: Optional[Dict[str, Any]], body: Optional[Dict[str, Any]]) -> str:
+    """Clave de una petición: método, endpoint, parámetros y cuerpo (ya redactados) en forma canónica"""
+    return json.dumps(
+        [method.upper(), endpoint.lower(), redact(params or {}), redact(body or {})],
+        sort_keys=True, default=str, separators=(",", ":")
+    )
+
+class Cassette:
+    """Graba pares petición/respuesta de la API en un archivo JSON Lines, o los reproduce con sus tiempos"""
+
+    def __init__(self, path: str, mode: str, timing_scale: float = 1.0):
+        """
+        Inicializa el cassette
+
+        Args:
+            path: Archivo JSON Lines
+            mode: record (agrega las peticiones al archivo) o replay (las sirve desde el archivo)
+            timing_scale: Factor aplicado a la duración grabada de cada respuesta al reproducir
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Modo de cassette inválido: {mode}")
+        self.path = path
+        self.mode = mode
+        self.timing_scale = timing_scale
+        self._recordings: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._served: Dict[str, int] = defaultdict(int)
+        if mode == "replay":
+            self.load()
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def load(self) -> None:
+        """Carga las grabaciones del archivo, agrupadas por petición en orden de grabación"""
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    item = json.loads(line)
+                    self._recordings[item["key"]].append(item)
+        logger.info(f"Cassette {self.path} cargado: {sum(len(v) for v in self._recordings.values())} respuestas")
+
+    def record(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        body: Optional[Dict[str, Any]],
+        status: Optional[int],
+        response: Any,
+        elapsed: float
+    ) -> None:
+        """Agrega una respuesta (o el error devuelto) al archivo"""
+        item = {
+            "key": request_key(method, endpoint, params, body),
+            "method": method.upper(),
+            "endpoint": endpoint,
+            "params": redact(params),
+            "body": redact(body),
+            "status": status,
+            "response": redact(response),
+            "elapsed": round(elapsed, 4),
+            "recorded_at": time.time()
+        }
+        line = json.dumps(item, ensure_ascii=False, default=str) + "\n"
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def find(self, method: str, endpoint: str, params: Optional[Dict[str, Any]], body: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Devuelve la siguiente grabación de la petición; al agotarlas se repite la última"""
+        key = request_key(method, endpoint, params, body)
+        recordings = self._recordings.get(key)
+        if not recordings:
+            return None
+        index = min(self._served[key], len(recordings) - 1)
+        self._served[key] += 1
+        return recordings[index]
+
+    async def replay(self, method: str, endpoint: str, params: Optional[Dict[str, Any]], body: Optional[Dict[str, Any]]) -> Tuple[Optional[int], Any]:
+        """
+        Reproduce la respuesta grabada, esperando su duración original escalada
+
+        Returns:
+            Tuple[Optional[int], Any]: Código HTTP grabado (200 si fue exitosa) y respuesta
+        """
+        item = self.find(method, endpoint, params, body)
+        if item is None:
+            raise LookupError(f"Petición sin grabación en el cassette: {method.upper()} {endpoint}")
+        if self.timing_scale > 0:
+            await asyncio.sleep(item["elapsed"] * self.timing_scale)
+        return item["status"], item["response"]
+
+def get_cassette() -> Optional[Cassette]:
+    """Crea el cassette configurado con IOL_CASSETTE_MODE (None si está desactivado)"""
+    if CASSETTE_MODE in ("", "off"):
+        return None
+    cassette = Cassette(CASSETTE_FILE, CASSETTE_MODE, TIMING_SCALE)
+    logger.info(f"Cassette en modo {CASSETTE_MODE}: {CASSETTE_FILE}")
+    return cassette
+
+# Cassette compartido por todos los clientes (None si está desactivado)
+cassette = get_cassette()
@@ -0,0 +1,99 @@
+from typing import Dict, Any, List
+
+# Valores posibles del parámetro formato de las herramientas tabulares
+FORMATS = ["filas", "columnar"]
+
+def _flatten(row: Dict[str, Any]) -> Dict[str, Any]:
+    # Los objetos anidados (p. ej. "puntas") se aplanan un nivel como "puntas.precioCompra"
+    flat = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            for subkey, subvalue in value.items():
+                flat[f"{key}.{subkey}"] = subvalue
+        else:
+            flat[key] = value
+    return flat
+
+def to_columnar(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Codifica una lista de objetos como columnas: los nombres de campo se envían una sola vez
+    y las columnas de texto con valores repetidos se codifican con un diccionario
+
+    Args:
+        rows: Filas a codificar
+
+    Returns:
+        Dict[str, Any]: {"formato", "filas", "columnas", "valores", "diccionarios"}; en las columnas
+            de "diccionarios", cada valor es el índice del texto en su diccionario
+    """
+    flat = [_flatten(row) if isinstance(row, dict) else {"valor": row} for row in rows]
+    columns = list(dict.fromkeys(key for row in flat for key in row))
+    if all(len(row) == len(columns) and list(row) == columns for row in flat):
+        # Caso habitual: todas las filas tienen los mismos campos en el mismo orden y se trasponen con zip
+        transposed = [list(data) for data in zip(*(row.values() for row in flat))] or [[] for _ in columns]
+    else:
+        transposed = [[row.get(column) for row in flat] for column in columns]
+
+    values = []
+    dictionaries = {}
+    for column, data in zip(columns, transposed):
+        present = [value for value in data if value is not None]
+        if present and all(type(value) is str for value in present):
+            unique = list(dict.fromkeys(present))
+            # Solo conviene si los textos se repiten
+            if len(unique) * 2 <= len(present):
+                index = {value: i for i, value in enumerate(unique)}
+                data = [index[value] if value is not None else None for value in data]
+                dictionaries[column] = unique
+        values.append(data)
+
+    return {
+        "formato": "columnar",
+        "filas": len(flat),
+        "columnas": columns,
+        "valores": values,
+        "diccionarios": dictionaries
+    }
+
+def from_columnar(table: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Decodifica una tabla de to_columnar a filas planas (los campos anidados quedan como "padre.campo")
+
+    Args:
+        table: Tabla codificada
+
+    Returns:
+        List[Dict[str, Any]]: Filas sin los campos nulos
+    """
+    columns = []
+    for name, data in zip(table["columnas"], table["valores"]):
+        dictionary = table["diccionarios"].get(name)
+        if dictionary is not None:
+            data = [dictionary[value] if value is not None else None for value in data]
+        columns.append((name, data))
+    return [
+        {name: data[i] for name, data in columns if data[i] is not None}
+        for i in range(table["filas"])
+    ]
+
+def apply_format(result: Any, formato: str) -> Any:
+    """
+    Aplica el formato pedido al resultado de una herramienta tabular
+
+    Args:
+        result: Lista de objetos, o diccionario con una lista de objetos (p. ej. {"titulos": [...]})
+        formato: "filas" (sin cambios) o "columnar"
+
+    Returns:
+        Any: Resultado con la lista de objetos codificada en columnas si corresponde
+    """
+    if formato != "columnar":
+        return result
+    if isinstance(result, list):
+        return to_columnar(result)
+    if isinstance(result, dict):
+        return {
+            key: to_columnar(value) if isinstance(value, list) and value and isinstance(value[0], dict) else value
+            for key, value in result.items()
+        }
+    return result
@@ -0,0 +1,104 @@
+from typing import Dict, Any, Optional
+import os
+import time
+import asyncio
+import logging
+from fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from .http_client import upstream_status, pool_status, transfer_stats
+from .token_cache import get_token_cache, is_valid, EXPIRY_MARGIN
+from .limiter import request_limiter
+from .hedging import hedger
+
+logger = logging.getLogger(__name__)
+
+# Demora máxima del event loop con la que el servidor se considera listo
+MAX_LOOP_LAG = float(os.getenv('IOL_READY_MAX_LOOP_LAG', '1'))
+
+class LoopLagMonitor:
+    """Mide cuánto se demora el event loop en retomar una tarea que duerme un intervalo fijo"""
+
+    def __init__(self, interval: float = 0.5, window: int = 120):
+        """
+        Inicializa el monitor
+
+        Args:
+            interval: Segundos entre mediciones
+            window: Cantidad de mediciones sobre las que se informa el máximo
+        """
+        self.interval = interval
+        self.window = window
+        self.samples: list = []
+        self._task: Optional[asyncio.Task] = None
+
+    def ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - started - self.interval))
+            del self.samples[:-self.window]
+
+    @property
+    def last(self) -> float:
+        return self.samples[-1] if self.samples else 0.0
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ultima_ms": round(self.last * 1000, 2),
+            "maxima_ms": round(max(self.samples, default=0.0) * 1000, 2)
+        }
+
+loop_lag = LoopLagMonitor()
+
+def token_status() -> Dict[str, Any]:
+    """Vigencia del token compartido, sin autenticar ni llamar a la API"""
+    tokens = get_token_cache(os.getenv('IOL_USERNAME'), os.getenv('IOL_PASSWORD'))
+    token = tokens.token if is_valid(tokens.token) else tokens.load()
+    return {
+        "valido": is_valid(token),
+        "vence_en_s": round(token["expires_at"] - EXPIRY_MARGIN - time.time()) if is_valid(token) else None,
+        "refresh_valido": is_valid(token, "refresh_expires_at")
+    }
+
+def readiness() -> Dict[str, Any]:
+    """Estado completo y si el servidor puede atender herramientas que consultan la API"""
+    upstream = upstream_status.status()
+    ready = (
+        upstream_status.auth_error is None
+        and not upstream_status.degraded
+        and loop_lag.last <= MAX_LOOP_LAG
+    )
+    return {
+        "listo": ready,
+        "loop_lag": loop_lag.status(),
+        "token": token_status(),
+        "pool_conexiones": pool_status(),
+        "limitador": request_limiter.status(),
+        "hedging": hedger.status() if hedger else None,
+        "transferencia": transfer_stats.status(),
+        "api": upstream
+    }
+
+def register_health_routes(mcp: FastMCP) -> None:
+    """
+    Registra /healthz y /readyz junto a la app MCP. No abren sesiones MCP ni llaman a la API.
+
+    Args:
+        mcp: Instancia de FastMCP
+    """
+
+    @mcp.custom_route("/healthz", methods=["GET"])
+    async def healthz(request: Request) -> JSONResponse:
+        loop_lag.ensure_running()
+        return JSONResponse({"status": "ok", "loop_lag": loop_lag.status()})
+
+    @mcp.custom_route("/readyz", methods=["GET"])
+    async def readyz(request: Request) -> JSONResponse:
+        loop_lag.ensure_running()
+        state = readiness()
+        return JSONResponse(state, status_code=200 if state["listo"] else 503)
@@ -0,0 +1,112 @@
+from typing import Dict, Any, Optional, Callable, Awaitable
+from collections import deque
+import os
+import time
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+HEDGE_ENABLED = os.getenv('IOL_HEDGE_ENABLED', 'false').lower() == 'true'
+
+# Grupos de lectura (ver READ_POLICIES en cache.py) cuyas peticiones se pueden duplicar
+HEDGED_GROUPS = {"cotizacion"}
+
+class Hedger:
+    """
+    Duplica una lectura idempotente si no respondió dentro del percentil configurado de su
+    latencia reciente y se queda con la primera respuesta. Un presupuesto limita las
+    peticiones duplicadas a una fracción del total.
+    """
+
+    def __init__(
+        self,
+        percentile: Optional[float] = None,
+        budget: Optional[float] = None,
+        min_delay: Optional[float] = None,
+        min_samples: int = 20,
+        history: int = 200
+    ):
+        """
+        Inicializa el hedger
+
+        Args:
+            percentile: Percentil de latencia tras el cual se envía la petición duplicada
+            budget: Fracción máxima de peticiones duplicadas sobre el total
+            min_delay: Espera mínima antes de duplicar, en segundos
+            min_samples: Latencias necesarias antes de empezar a duplicar
+            history: Cantidad de latencias recientes consideradas
+        """
+        self.percentile = percentile or float(os.getenv('IOL_HEDGE_PERCENTILE', '95'))
+        self.budget = budget or float(os.getenv('IOL_HEDGE_BUDGET', '0.05'))
+        self.min_delay = min_delay or float(os.getenv('IOL_HEDGE_MIN_DELAY', '0.05'))
+        self.min_samples = min_samples
+        self._latencies: deque = deque(maxlen=history)
+        self.stats = {"requests": 0, "hedges": 0, "hedge_wins": 0}
+
+    def delay(self) -> Optional[float]:
+        """Espera antes de duplicar; None si todavía no hay suficientes latencias"""
+        if len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(self.min_delay, ordered[index])
+
+    def _within_budget(self) -> bool:
+        return self.stats["hedges"] < self.budget * self.stats["requests"]
+
+    async def run(self, send: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Ejecuta la petición, duplicándola si se demora más que el percentil configurado
+
+        Args:
+            send: Función que crea una nueva petición cada vez que se la llama
+
+        Returns:
+            Any: La primera respuesta exitosa
+        """
+        self.stats["requests"] += 1
+
+        async def _timed() -> Any:
+            started = time.perf_counter()
+            result = await send()
+            self._latencies.append(time.perf_counter() - started)
+            return result
+
+        tasks = [asyncio.ensure_future(_timed())]
+        try:
+            delay = self.delay()
+            if delay is None:
+                return await tasks[0]
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self._within_budget():
+                return await tasks[0]
+
+            self.stats["hedges"] += 1
+            tasks.append(asyncio.ensure_future(_timed()))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None:
+                    if winner is tasks[1]:
+                        self.stats["hedge_wins"] += 1
+                    return winner.result()
+                if not pending:
+                    raise done.pop().exception()
+        finally:
+            # La petición perdedora (o ambas, si se cancela la llamada) se cancela
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def status(self) -> Dict[str, Any]:
+        """Métricas del hedging"""
+        delay = self.delay()
+        return {
+            "espera_ms": round(delay * 1000, 1) if delay is not None else None,
+            **self.stats
+        }
+
+# Hedger compartido por todos los clientes (None si está desactivado)
+hedger = Hedger() if HEDGE_ENABLED else None
@@ -1,11 +1,251 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import os
+import time
+import asyncio
 import logging
 import aiohttp
-from datetime import datetime, timedelta
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from .cache import response_cache, mark_stale, CacheEntry
+from .token_cache import get_token_cache, is_valid, EXPIRY_MARGIN
+from .cassette import cassette
+from .limiter import request_limiter
+from .hedging import hedger, HEDGED_GROUPS
+from .models import RawJSON, value_of, as_raw
+
+try:
+    from aiohttp.compression_utils import HAS_BROTLI
+except ImportError:  # pragma: no cover - versiones de aiohttp sin soporte de brotli
+    HAS_BROTLI = False
 
 logger = logging.getLogger(__name__)
 
+class IOLAPIError(Exception):
+    """Error devuelto por la API de InvertirOnline, con el código HTTP de la respuesta"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+def is_upstream_failure(error: Exception) -> bool:
+    """Indica si un error se debe a la API (caída, lenta o saturada) y no a la petición"""
+    if isinstance(error, IOLAPIError):
+        return error.status is None or error.status == 429 or error.status >= 500
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+class UpstreamStatus:
+    """Resultado reciente de las peticiones a la API, consultado por los health checks sin llamarla"""
+
+    def __init__(self, failure_threshold: int):
+        """
+        Inicializa el estado
+
+        Args:
+            failure_threshold: Fallas consecutivas de la API a partir de las cuales se la considera degradada
+        """
+        self.failure_threshold = failure_threshold
+        self.consecutive_failures = 0
+        self.last_success: Optional[float] = None
+        self.last_failure: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.auth_error: Optional[str] = None
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.last_success = time.time()
+
+    def record_failure(self, error: Exception) -> None:
+        self.consecutive_failures += 1
+        self.last_failure = time.time()
+        self.last_error = str(error)
+
+    @property
+    def degraded(self) -> bool:
+        return self.consecutive_failures >= self.failure_threshold
+
+    def status(self) -> Dict[str, Any]:
+        """Estado de la API según las últimas peticiones"""
+        def _iso(ts: Optional[float]) -> Optional[str]:
+            return datetime.fromtimestamp(ts).isoformat(timespec="seconds") if ts else None
+        return {
+            "degradada": self.degraded,
+            "fallas_consecutivas": self.consecutive_failures,
+            "ultimo_exito": _iso(self.last_success),
+            "ultima_falla": _iso(self.last_failure),
+            "ultimo_error": self.last_error,
+            "error_autenticacion": self.auth_error
+        }
+
+upstream_status = UpstreamStatus(int(os.getenv('IOL_UPSTREAM_FAILURE_THRESHOLD', '3')))
+
+POOL_SIZE = int(os.getenv('IOL_HTTP_POOL_SIZE', '20'))
+KEEPALIVE_TIMEOUT = float(os.getenv('IOL_HTTP_KEEPALIVE', '60'))
+# Codificaciones que se piden a la API; brotli solo si aiohttp puede decodificarla (paquete Brotli)
+ACCEPT_ENCODING = os.getenv('IOL_HTTP_ACCEPT_ENCODING') or ("gzip, deflate, br" if HAS_BROTLI else "gzip, deflate")
+# Revalidar las lecturas cacheadas con If-None-Match / If-Modified-Since
+CONDITIONAL_REQUESTS = os.getenv('IOL_HTTP_CONDITIONAL', 'true').lower() == 'true'
+
+# Resultado de una petición condicional cuya respuesta cacheada sigue vigente (HTTP 304)
+NOT_MODIFIED = object()
+
+# Las herramientas que reenvían la respuesta de la API sin transformarla reciben el cuerpo sin decodificar
+PASSTHROUGH_ENABLED = os.getenv('IOL_PASSTHROUGH_ENABLED', 'true').lower() == 'true'
+_passthrough: ContextVar[bool] = ContextVar("passthrough", default=False)
+
+@contextmanager
+def passthrough():
+    """Dentro del bloque, las lecturas GET devuelven el cuerpo de la API sin decodificar (RawJSON)"""
+    token = _passthrough.set(PASSTHROUGH_ENABLED)
+    try:
+        yield
+    finally:
+        _passthrough.reset(token)
+
+class TransferStats:
+    """Bytes recibidos de la API y ahorrados por compresión y por respuestas 304"""
+
+    def __init__(self):
+        self.responses = 0
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self.encodings: Dict[str, int] = {}
+        # Respuestas comprimidas sin Content-Length (chunked): no se conoce lo transferido
+        self.unknown_size = 0
+        self.not_modified = 0
+        self.not_modified_bytes = 0
+
+    def record(self, wire: Optional[int], decoded: int, encoding: Optional[str]) -> None:
+        """Registra una respuesta; wire es None si no se conocen los bytes transferidos"""
+        self.responses += 1
+        if wire is None:
+            # Se excluye de los totales para no contarla como transferida sin comprimir
+            self.unknown_size += 1
+        else:
+            self.wire_bytes += wire
+            self.decoded_bytes += decoded
+        encoding = encoding or "identity"
+        self.encodings[encoding] = self.encodings.get(encoding, 0) + 1
+
+    def record_not_modified(self, size: int) -> None:
+        self.not_modified += 1
+        self.not_modified_bytes += size
+
+    def status(self) -> Dict[str, Any]:
+        """Bytes transferidos y ahorrados desde el inicio del proceso"""
+        return {
+            "accept_encoding": ACCEPT_ENCODING,
+            "peticiones_condicionales": CONDITIONAL_REQUESTS,
+            "respuestas": self.responses,
+            "codificaciones": dict(self.encodings),
+            "respuestas_tamano_desconocido": self.unknown_size,
+            "bytes_recibidos": self.wire_bytes,
+            "bytes_decodificados": self.decoded_bytes,
+            "ahorro_compresion": self.decoded_bytes - self.wire_bytes,
+            "respuestas_304": self.not_modified,
+            "ahorro_304": self.not_modified_bytes
+        }
+
+transfer_stats = TransferStats()
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Devuelve la sesión HTTP compartida por todos los clientes del event loop actual,
+    para reutilizar las conexiones (y el handshake TLS) entre peticiones
+    
+    Returns:
+        aiohttp.ClientSession: Sesión con pool de conexiones
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=POOL_SIZE, keepalive_timeout=KEEPALIVE_TIMEOUT),
+            headers={"Accept-Encoding": ACCEPT_ENCODING}
+        )
+        _session_loop = loop
+    return _session
+
+async def close_session() -> None:
+    """Cierra la sesión HTTP compartida"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+def pool_status() -> Dict[str, Any]:
+    """Estado del pool de conexiones compartido"""
+    if _session is None or _session.closed:
+        return {"abierto": False, "limite": POOL_SIZE, "en_uso": 0}
+    connector = _session.connector
+    return {
+        "abierto": True,
+        "limite": connector.limit,
+        "en_uso": len(getattr(connector, "_acquired", ()))
+    }
+
+def is_json_content_type(content_type: Optional[str]) -> bool:
+    """Indica si un Content-Type (sin parámetros) corresponde a JSON: application/json o un subtipo +json"""
+    content_type = (content_type or "").lower()
+    return content_type == "application/json" or (content_type.startswith("application/") and content_type.endswith("+json"))
+
+async def read_body(response: aiohttp.ClientResponse, validators: Optional[Dict[str, Any]] = None) -> RawJSON:
+    """
+    Lee el cuerpo JSON de una respuesta sin decodificarlo y registra los bytes transferidos.
+    Un cuerpo que no es JSON (por ejemplo, una página HTML de un proxy) se rechaza, y uno
+    declarado en otro charset se convierte a UTF-8, de modo que el RawJSON siempre es JSON en UTF-8
+
+    Args:
+        response: Respuesta de aiohttp
+        validators: Si se indica, se completa con el ETag, el Last-Modified y los bytes transferidos
+
+    Returns:
+        RawJSON: Cuerpo de la respuesta
+
+    Raises:
+        IOLAPIError: Si la respuesta no es JSON o su charset no se puede decodificar
+    """
+    body = await response.read()
+    encoding = response.headers.get("Content-Encoding")
+    # aiohttp descomprime el cuerpo; lo transferido es el Content-Length de la respuesta comprimida
+    # (desconocido si llegó comprimida y sin Content-Length, con transferencia chunked)
+    wire = response.content_length if encoding else len(body)
+    transfer_stats.record(wire, len(body), encoding)
+    if validators is not None:
+        validators.update(
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            size=wire or 0
+        )
+    if not body.strip():
+        return RawJSON(body)
+    if not is_json_content_type(response.content_type):
+        preview = body[:200].decode("utf-8", errors="replace")
+        logger.error(f"Respuesta no JSON de la API ({response.status}, {response.content_type}): {preview}")
+        raise IOLAPIError(f"Respuesta no JSON de la API ({response.content_type}): {preview}")
+    charset = (response.charset or "utf-8").lower()
+    if charset not in ("utf-8", "utf8"):
+        try:
+            body = body.decode(charset).encode("utf-8")
+        except (LookupError, UnicodeDecodeError) as e:
+            raise IOLAPIError(f"Respuesta de la API con charset inválido ({charset}): {str(e)}")
+    return RawJSON(body)
+
+def conditional_headers(validators: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Headers de una petición condicional a partir de los validadores de la respuesta cacheada"""
+    headers = {}
+    if not CONDITIONAL_REQUESTS or not validators:
+        return headers
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
 class IOLAPIClient:
     """Cliente base para la API de InvertirOnline"""
     
@@ -16,39 +256,94 @@ class IOLAPIClient:
         self.token_expiry = None
         self.username = os.getenv('IOL_USERNAME')
         self.password = os.getenv('IOL_PASSWORD')
+        self.tokens = get_token_cache(self.username, self.password)
 
     async def ensure_token(self) -> None:
-        """Asegura que haya un token válido para las llamadas a la API"""
-        if not self.access_token or not self.token_expiry or datetime.now() >= self.token_expiry:
-            await self.authenticate()
-
-    async def authenticate(self) -> None:
-        """Obtiene un nuevo token de acceso"""
-        auth_data = {
-            "username": self.username,
-            "password": self.password,
-            "grant_type": "password"
-        }
-        
+        """Asegura que haya un token válido, reutilizando el de otros clientes o el guardado en disco"""
+        if self.access_token and self.token_expiry and datetime.now() < self.token_expiry:
+            return
+        token = self.tokens.token if is_valid(self.tokens.token) else self.tokens.load()
+        if is_valid(token):
+            self._apply_token(token)
+            return
+        await self.authenticate()
+
+    def _apply_token(self, token: Dict[str, Any]) -> None:
+        self.access_token = token["access_token"]
+        # Restamos 5 minutos para asegurar renovación antes de expiración
+        self.token_expiry = datetime.fromtimestamp(token["expires_at"] - EXPIRY_MARGIN)
+
+    async def authenticate(self, stale_token: Optional[str] = None) -> None:
+        """
+        Obtiene un nuevo token de acceso. Bajo el bloqueo de la caché de tokens se vuelve a
+        leer el token guardado por si otro cliente o proceso ya lo renovó; si no, se usa el
+        refresh token vigente y, como último recurso, usuario y contraseña.
+
+        Args:
+            stale_token: Token rechazado por la API, que no debe reutilizarse
+        """
+        async with self.tokens.locked():
+            token = self.tokens.load()
+            if is_valid(token) and token["access_token"] not in (stale_token, None):
+                self._apply_token(token)
+                return
+
+            data = None
+            if is_valid(token, "refresh_expires_at") and token.get("refresh_token"):
+                try:
+                    data = await self._request_token({
+                        "refresh_token": token["refresh_token"],
+                        "grant_type": "refresh_token"
+                    })
+                except Exception as e:
+                    logger.warning(f"No se pudo renovar con el refresh token, se usa usuario y contraseña: {str(e)}")
+            if data is None:
+                data = await self._request_token({
+                    "username": self.username,
+                    "password": self.password,
+                    "grant_type": "password"
+                })
+
+            token = {
+                "access_token": data["access_token"],
+                "refresh_token": data.get("refresh_token"),
+                "expires_at": time.time() + int(data["expires_in"]),
+                "refresh_expires_at": self._parse_expiry(data.get(".refreshexpires"))
+            }
+            self.tokens.save(token)
+            self._apply_token(token)
+            logger.info("Token de acceso obtenido exitosamente")
+
+    @staticmethod
+    def _parse_expiry(value: Optional[str]) -> float:
+        """Convierte el vencimiento del refresh token (.refreshexpires, formato HTTP) a epoch"""
+        if not value:
+            return 0.0
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/token",
-                    data=auth_data,
-                    headers={"Content-Type": "application/x-www-form-urlencoded"}
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"Error de autenticación: {response.status} - {error_text}")
-                        raise Exception(f"Error de autenticación: {response.status}")
-                        
-                    data = await response.json()
-                    self.access_token = data["access_token"]
-                    # Restamos 5 minutos para asegurar renovación antes de expiración
-                    self.token_expiry = datetime.now() + timedelta(seconds=int(data["expires_in"])) - timedelta(minutes=5)
-                    logger.info("Token de acceso obtenido exitosamente")
+            return parsedate_to_datetime(value).timestamp()
+        except (TypeError, ValueError):
+            return 0.0
+
+    async def _request_token(self, auth_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Solicita un token al endpoint /token con el grant indicado"""
+        try:
+            session = get_session()
+            async with session.post(
+                f"{self.base_url}/token",
+                data=auth_data,
+                headers={"Content-Type": "application/x-www-form-urlencoded"}
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error(f"Error de autenticación: {response.status} - {error_text}")
+                    raise IOLAPIError(f"Error de autenticación: {response.status}", response.status)
+                    
+                data = await response.json()
+                upstream_status.auth_error = None
+                return data
         except Exception as e:
             logger.error(f"Error durante la autenticación: {str(e)}")
+            upstream_status.auth_error = str(e)
             raise
 
     def get_auth_headers(self) -> Dict[str, str]:
@@ -71,69 +366,268 @@ class IOLAPIClient:
         method: str,
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
-        json: Optional[Dict[str, Any]] = None
+        json: Optional[Dict[str, Any]] = None,
+        raw: bool = False
     ) -> Dict[str, Any]:
         """
-        Realiza una petición a la API
+        Realiza una petición a la API. Las lecturas con política de caché se sirven
+        desde la caché compartida (revalidándolas con peticiones condicionales al vencer)
+        y las escrituras invalidan las lecturas que afectan.
         
         Args:
             method: Método HTTP
             endpoint: Endpoint de la API
             params: Parámetros de la petición
             json: Datos JSON de la petición
+            raw: Devolver el cuerpo de la respuesta sin decodificar (RawJSON)
             
         Returns:
             Dict[str, Any]: Respuesta de la API
         """
-        await self.ensure_token()
-        
         # Asegurarse de que el endpoint comience con /
         if not endpoint.startswith("/"):
             endpoint = f"/{endpoint}"
             
+        if method.upper() != "GET":
+            result = await self._send_request(method, endpoint, params=params, json=json)
+            response_cache.invalidate_for_mutation(self.username, method, endpoint, json)
+            return as_raw(result) if raw else value_of(result)
+            
+        cache_key = response_cache.make_key(self.username, endpoint, params)
+        entry, servable = await response_cache.lookup(cache_key)
+        if servable:
+            if not entry.fresh:
+                self._schedule_revalidation(cache_key, endpoint, params, entry)
+            return entry.body if raw else entry.value
+            
+        validators = self._validators(entry)
+        try:
+            if self._hedgeable(endpoint):
+                result = await hedger.run(lambda: self._send_request(method, endpoint, params=params, validators=validators))
+            else:
+                result = await self._send_request(method, endpoint, params=params, validators=validators)
+        except Exception as e:
+            # Modo degradado: si la API no responde se sirve el último valor conocido
+            if entry is not None and entry.usable_when_degraded and is_upstream_failure(e):
+                logger.warning(f"API no disponible para {endpoint}, sirviendo respuesta cacheada: {str(e)}")
+                response_cache.stats["degraded_hits"] += 1
+                mark_stale(entry)
+                return entry.body if raw else entry.value
+            raise
+            
+        if result is NOT_MODIFIED:
+            entry = response_cache.renew(cache_key, endpoint, params, entry)
+        else:
+            entry = response_cache.store(cache_key, endpoint, params, result, **validators)
+            if entry is None:
+                return as_raw(result) if raw else value_of(result)
+        return entry.body if raw else entry.value
+
+    @staticmethod
+    def _validators(entry: Optional[CacheEntry]) -> Dict[str, Any]:
+        """Validadores de la entrada cacheada, que la respuesta de la API reemplaza"""
+        if entry is None:
+            return {}
+        return {"etag": entry.etag, "last_modified": entry.last_modified, "size": entry.size}
+
+    @staticmethod
+    def _hedgeable(endpoint: str) -> bool:
+        """Indica si una lectura puede duplicarse para recortar la latencia de cola (IOL_HEDGE_ENABLED)"""
+        if hedger is None:
+            return False
+        found = response_cache.policy_for(endpoint)
+        return found is not None and found[0].group in HEDGED_GROUPS
+
+    def _schedule_revalidation(
+        self,
+        cache_key: Tuple,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        entry: CacheEntry
+    ) -> None:
+        """Revalida en segundo plano una entrada vencida que se acaba de servir"""
+        if not response_cache.begin_refresh(cache_key):
+            return
+
+        async def _revalidate() -> None:
+            try:
+                validators = self._validators(entry)
+                result = await self._send_request("GET", endpoint, params=params, validators=validators)
+                if result is NOT_MODIFIED:
+                    response_cache.renew(cache_key, endpoint, params, entry)
+                else:
+                    response_cache.store(cache_key, endpoint, params, result, **validators)
+            except Exception as e:
+                logger.warning(f"No se pudo revalidar {endpoint}: {str(e)}")
+            finally:
+                response_cache.end_refresh(cache_key)
+
+        asyncio.get_running_loop().create_task(_revalidate())
+
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        validators: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Envía la petición a la API dentro del limitador adaptativo de concurrencia, que
+        registra su latencia y si la API respondió saturada
+        
+        Args:
+            method: Método HTTP
+            endpoint: Endpoint de la API (comenzando con /)
+            params: Parámetros de la petición
+            json: Datos JSON de la petición
+            validators: Validadores de la respuesta cacheada (ver _send_live)
+            
+        Returns:
+            Dict[str, Any]: Respuesta de la API, o NOT_MODIFIED
+        """
+        async with request_limiter:
+            started = time.perf_counter()
+            try:
+                result = await self._dispatch(method, endpoint, params=params, json=json, validators=validators)
+            except Exception as e:
+                request_limiter.record(time.perf_counter() - started, overloaded=is_upstream_failure(e))
+                raise
+            request_limiter.record(time.perf_counter() - started)
+            return result
+
+    async def _dispatch(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        validators: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Envía la petición a la API. Con IOL_CASSETTE_MODE=record se graba cada respuesta
+        (sin credenciales) y con IOL_CASSETTE_MODE=replay se sirve desde el cassette sin
+        autenticar ni conectarse; en ambos modos no se hacen peticiones condicionales.
+        
+        Args:
+            method: Método HTTP
+            endpoint: Endpoint de la API (comenzando con /)
+            params: Parámetros de la petición
+            json: Datos JSON de la petición
+            validators: Validadores de la respuesta cacheada (ver _send_live)
+            
+        Returns:
+            Dict[str, Any]: Respuesta de la API, o NOT_MODIFIED
+        """
+        if cassette is None:
+            return await self._send_live(method, endpoint, params=params, json=json, validators=validators)
+            
+        if validators is not None:
+            # El cassette guarda respuestas completas: la entrada se reemplaza sin validadores
+            validators.clear()
+            
+        if cassette.mode == "replay":
+            status, result = await cassette.replay(method, endpoint, params, json)
+            if status not in (None, 200, 201):
+                raise IOLAPIError(str(result), status)
+            return result
+            
+        started = time.perf_counter()
+        try:
+            result = await self._send_live(method, endpoint, params=params, json=json)
+        except IOLAPIError as e:
+            cassette.record(method, endpoint, params, json, e.status, str(e), time.perf_counter() - started)
+            raise
+        cassette.record(method, endpoint, params, json, 200, value_of(result), time.perf_counter() - started)
+        return result
+
+    async def _send_live(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        validators: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Envía la petición a la API, renovando el token si expiró. Con los validadores de
+        una respuesta cacheada la petición es condicional (If-None-Match / If-Modified-Since).
+        
+        Args:
+            method: Método HTTP
+            endpoint: Endpoint de la API (comenzando con /)
+            params: Parámetros de la petición
+            json: Datos JSON de la petición
+            validators: ETag, Last-Modified y bytes de la respuesta cacheada; se actualizan
+                con los de la nueva respuesta
+            
+        Returns:
+            Dict[str, Any]: Cuerpo de la respuesta sin decodificar (RawJSON), o NOT_MODIFIED si no
+                cambió desde la cacheada
+        """
+        await self.ensure_token()
+        
         url = f"{self.base_url}{endpoint}"
         headers = self.get_auth_headers()
+        conditional = conditional_headers(validators)
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.request(
-                    method,
-                    url,
-                    headers=headers,
-                    params=params,
-                    json=json
-                ) as response:
-                    if response.status == 401:
-                        # Token expirado, renovar y reintentar
-                        logger.info("Token expirado, renovando...")
-                        await self.authenticate()
-                        headers = self.get_auth_headers()
-                        async with session.request(
-                            method,
-                            url,
-                            headers=headers,
-                            params=params,
-                            json=json
-                        ) as retry_response:
-                            if retry_response.status not in [200, 201]:
-                                error_text = await retry_response.text()
-                                logger.error(f"Error en la petición: {retry_response.status} - {error_text}")
-                                raise Exception(f"Error en la petición: {retry_response.status} - {error_text}")
-                            return await retry_response.json()
-                            
-                    if response.status not in [200, 201]:
-                        error_text = await response.text()
-                        logger.error(f"Error en la petición: {response.status} - {error_text}")
-                        raise Exception(f"Error en la petición: {response.status} - {error_text}")
+            session = get_session()
+            async with session.request(
+                method,
+                url,
+                headers={**headers, **conditional},
+                params=params,
+                json=json
+            ) as response:
+                if response.status == 401:
+                    # Token expirado, renovar y reintentar
+                    logger.info("Token expirado, renovando...")
+                    await self.authenticate(stale_token=headers["Authorization"][len("Bearer "):])
+                    headers = self.get_auth_headers()
+                    async with session.request(
+                        method,
+                        url,
+                        headers={**headers, **conditional},
+                        params=params,
+                        json=json
+                    ) as retry_response:
+                        result = await self._read_response(retry_response, validators, bool(conditional))
+                        upstream_status.record_success()
+                        return result
                         
-                    return await response.json()
+                result = await self._read_response(response, validators, bool(conditional))
+                upstream_status.record_success()
+                return result
         except Exception as e:
             logger.error(f"Error realizando petición: {str(e)}")
+            if is_upstream_failure(e):
+                upstream_status.record_failure(e)
             raise
 
+    @staticmethod
+    async def _read_response(
+        response: aiohttp.ClientResponse,
+        validators: Optional[Dict[str, Any]],
+        conditional: bool = False
+    ) -> Any:
+        """
+        Decodifica una respuesta exitosa, devuelve NOT_MODIFIED ante un 304 o lanza IOLAPIError.
+        Un 304 solo es válido si la petición fue condicional; si no, no hay respuesta cacheada
+        que renovar y se trata como error
+        """
+        if response.status == 304 and conditional:
+            transfer_stats.record_not_modified(validators.get("size") or 0)
+            return NOT_MODIFIED
+        if response.status not in [200, 201]:
+            error_text = await response.text()
+            logger.error(f"Error en la petición: {response.status} - {error_text}")
+            raise IOLAPIError(f"Error en la petición: {response.status} - {error_text}", response.status)
+        return await read_body(response, validators)
+
     async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Realiza una petición GET"""
-        return await self._make_request("GET", endpoint, params=params)
+        """Realiza una petición GET (sin decodificar la respuesta dentro de un bloque passthrough)"""
+        return await self._make_request("GET", endpoint, params=params, raw=_passthrough.get())
 
     async def post(self, endpoint: str, json: Dict[str, Any]) -> Dict[str, Any]:
         """Realiza una petición POST"""
@@ -0,0 +1,325 @@
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+from datetime import datetime
+import os
+import time
+import uuid
+import asyncio
+import logging
+from fastmcp import FastMCP, Context
+from pydantic import Field
+from .columnar import FORMATS, apply_format
+from .models import to_dict
+
+logger = logging.getLogger(__name__)
+
+# Jobs ejecutándose a la vez; el resto espera su turno en estado "pendiente"
+JOBS_MAX_CONCURRENCY = int(os.getenv('IOL_JOBS_MAX_CONCURRENCY', '2'))
+# Segundos que se conserva el resultado de un job terminado
+JOBS_TTL = float(os.getenv('IOL_JOBS_TTL', '3600'))
+DEFAULT_PAGE_SIZE = 100
+
+FINISHED_STATES = {"completado", "error", "cancelado"}
+
+class Job:
+    """Herramienta ejecutándose en segundo plano, con su progreso y su resultado"""
+
+    def __init__(self, tool: str, session: Any = None, formato: str = "filas"):
+        """
+        Inicializa el job
+
+        Args:
+            tool: Nombre de la herramienta que lo creó
+            session: Sesión MCP a la que se notifica el fin del job (opcional)
+            formato: Formato por defecto de las páginas del resultado (filas o columnar)
+        """
+        self.id = uuid.uuid4().hex[:12]
+        self.tool = tool
+        self.session = session
+        self.format = formato
+        self.state = "pendiente"
+        self.progress = 0.0
+        self.total: Optional[float] = None
+        self.message: Optional[str] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now().isoformat(timespec="seconds")
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    async def report(self, progress: float, total: Optional[float] = None, message: Optional[str] = None) -> None:
+        """
+        Actualiza el progreso del job
+
+        Args:
+            progress: Unidades completadas
+            total: Unidades totales (opcional)
+            message: Descripción del paso actual (opcional)
+        """
+        self.progress = progress
+        if total is not None:
+            self.total = total
+        if message is not None:
+            self.message = message
+        self._notify_change()
+
+    def _notify_change(self) -> None:
+        # Despierta a quienes esperan el job y rearma el evento para el próximo cambio
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self, timeout: float, on_progress: Optional[Callable[["Job"], Awaitable[None]]] = None) -> None:
+        """
+        Espera hasta timeout segundos a que el job termine
+
+        Args:
+            timeout: Segundos máximos de espera
+            on_progress: Corrutina llamada con el job en cada cambio de progreso
+        """
+        deadline = time.monotonic() + timeout
+        while not self.finished:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return
+            if on_progress is not None:
+                await on_progress(self)
+
+    def status(self) -> Dict[str, Any]:
+        """Estado del job sin su resultado"""
+        return {
+            "job_id": self.id,
+            "herramienta": self.tool,
+            "estado": self.state,
+            "progreso": self.progress,
+            "total": self.total,
+            "mensaje": self.message,
+            "creado": self.created_at,
+            "error": self.error
+        }
+
+def paginate(result: Any, pagina: int, tamano_pagina: int) -> Dict[str, Any]:
+    """
+    Devuelve una página del resultado de un job. Se pagina la lista del resultado (o su
+    campo "result" si es un diccionario); el resto del resultado se devuelve completo.
+
+    Args:
+        result: Resultado del job
+        pagina: Número de página, desde 1
+        tamano_pagina: Elementos por página
+
+    Returns:
+        Dict[str, Any]: Página del resultado e información de paginación
+    """
+    container = result if isinstance(result, dict) and isinstance(result.get("result"), list) else None
+    items = container["result"] if container is not None else result
+    if not isinstance(items, list):
+        return {"result": result, "pagina": 1, "paginas": 1, "total_elementos": None}
+
+    paginas = max(1, -(-len(items) // tamano_pagina))
+    start = (pagina - 1) * tamano_pagina
+    page = items[start:start + tamano_pagina]
+    response = {**container, "result": page} if container is not None else {"result": page}
+    response.update({"pagina": pagina, "paginas": paginas, "total_elementos": len(items)})
+    return response
+
+class JobManager:
+    """Ejecuta herramientas largas en segundo plano con paralelismo acotado"""
+
+    def __init__(self, max_concurrency: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Inicializa el administrador de jobs
+
+        Args:
+            max_concurrency: Jobs ejecutándose a la vez
+            ttl: Segundos que se conserva un job terminado
+        """
+        self.max_concurrency = max(1, max_concurrency or JOBS_MAX_CONCURRENCY)
+        self.ttl = ttl or JOBS_TTL
+        self.jobs: Dict[str, Job] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def submit(
+        self,
+        tool: str,
+        func: Callable[[Job], Awaitable[Any]],
+        session: Any = None,
+        formato: str = "filas"
+    ) -> Job:
+        """
+        Crea un job y lo encola en el event loop
+
+        Args:
+            tool: Nombre de la herramienta
+            func: Corrutina que recibe el job (para informar progreso) y devuelve el resultado
+            session: Sesión MCP a la que se notifica el fin del job (opcional)
+            formato: Formato por defecto de las páginas del resultado (filas o columnar)
+
+        Returns:
+            Job: Job creado, todavía pendiente
+        """
+        self._purge()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        job = Job(tool, session, formato)
+        self.jobs[job.id] = job
+        job.task = asyncio.get_running_loop().create_task(self._run(job, func))
+        return job
+
+    async def _run(self, job: Job, func: Callable[[Job], Awaitable[Any]]) -> None:
+        try:
+            async with self._semaphore:
+                job.state = "en_curso"
+                job._notify_change()
+                started = time.perf_counter()
+                job.result = await func(job)
+                job.state = "completado"
+                logger.info(f"Job {job.id} ({job.tool}) completado en {time.perf_counter() - started:.1f}s")
+        except asyncio.CancelledError:
+            job.state = "cancelado"
+        except Exception as e:
+            logger.error(f"Error en el job {job.id} ({job.tool}): {str(e)}")
+            job.state = "error"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.monotonic()
+            job._notify_change()
+        await self._notify(job)
+
+    async def _notify(self, job: Job) -> None:
+        if job.session is None:
+            return
+        try:
+            await job.session.send_log_message(
+                level="info" if job.state == "completado" else "warning",
+                data={"evento": "job_finalizado", **job.status()},
+                logger="iol.jobs"
+            )
+        except Exception as e:
+            logger.debug(f"No se pudo notificar el fin del job {job.id}: {str(e)}")
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._purge()
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancela un job pendiente o en curso; devuelve False si no existe o ya terminó"""
+        job = self.jobs.get(job_id)
+        if job is None or job.finished or job.task is None:
+            return False
+        job.task.cancel()
+        return True
+
+    def list(self) -> List[Dict[str, Any]]:
+        self._purge()
+        return [job.status() for job in self.jobs.values()]
+
+    def _purge(self) -> None:
+        now = time.monotonic()
+        for job_id in [i for i, job in self.jobs.items() if job.finished_at and now - job.finished_at > self.ttl]:
+            del self.jobs[job_id]
+
+# Jobs compartidos por todas las herramientas del proceso
+job_manager = JobManager()
+
+def job_started(job: Job) -> Dict[str, Any]:
+    """Respuesta de una herramienta lanzada en segundo plano"""
+    return {
+        "success": True,
+        "result": job.status(),
+        "mensaje": f"Job en segundo plano; consultar el resultado con obtener_resultado_job(job_id=\"{job.id}\")"
+    }
+
+def register_job_tools(mcp: FastMCP) -> None:
+    """
+    Registra las herramientas para consultar y cancelar jobs en segundo plano
+
+    Args:
+        mcp: Instancia de FastMCP
+    """
+
+    @mcp.tool(
+        name="obtener_resultado_job",
+        description="Obtener el estado y el resultado paginado de un job en segundo plano, esperando opcionalmente a que termine",
+        tags=["jobs"]
+    )
+    async def obtener_resultado_job(
+        ctx: Context,
+        job_id: str = Field(description="Identificador devuelto al lanzar el job"),
+        pagina: int = Field(default=1, description="Página del resultado, desde 1", ge=1),
+        tamano_pagina: int = Field(default=DEFAULT_PAGE_SIZE, description="Elementos por página", ge=1, le=1000),
+        esperar: float = Field(default=0, description="Segundos a esperar que el job termine, informando el progreso", ge=0, le=300),
+        formato: Optional[str] = Field(default=None, description="filas o columnar (por defecto, el pedido al lanzar el job)", enum=FORMATS)
+    ) -> Dict[str, Any]:
+        """
+        Obtiene el estado de un job y, si terminó, una página de su resultado. Mientras
+        espera, el progreso del job se envía como notificaciones de progreso MCP.
+
+        Args:
+            job_id: Identificador del job
+            pagina: Página del resultado
+            tamano_pagina: Elementos por página
+            esperar: Segundos máximos de espera
+            formato: Formato de la página del resultado
+        """
+        try:
+            job = job_manager.get(job_id)
+            if job is None:
+                return {"error": f"No existe el job {job_id} (los resultados se conservan {job_manager.ttl:.0f}s)"}
+
+            async def _progress(current: Job) -> None:
+                await ctx.report_progress(current.progress, current.total, current.message)
+
+            if esperar and not job.finished:
+                await job.wait(esperar, _progress)
+            response = {"success": job.state != "error", **job.status()}
+            if job.state == "completado":
+                page = paginate(job.result, pagina, tamano_pagina)
+                # Los jobs pueden conservar modelos: solo la página pedida se convierte a diccionarios
+                page["result"] = apply_format(to_dict(page["result"]), formato or job.format)
+                response.update(page)
+            return response
+        except Exception as e:
+            return {"error": f"Error obteniendo resultado del job: {str(e)}"}
+
+    @mcp.tool(
+        name="listar_jobs",
+        description="Listar los jobs en segundo plano con su estado y progreso",
+        tags=["jobs"]
+    )
+    async def listar_jobs() -> Dict[str, Any]:
+        """
+        Lista los jobs pendientes, en curso y terminados que todavía se conservan
+        """
+        return {
+            "success": True,
+            "result": job_manager.list()
+        }
+
+    @mcp.tool(
+        name="cancelar_job",
+        description="Cancelar un job en segundo plano pendiente o en curso",
+        tags=["jobs"]
+    )
+    async def cancelar_job(
+        job_id: str = Field(description="Identificador del job")
+    ) -> Dict[str, Any]:
+        """
+        Cancela un job pendiente o en curso
+
+        Args:
+            job_id: Identificador del job
+        """
+        if not job_manager.cancel(job_id):
+            return {"error": f"El job {job_id} no existe o ya terminó"}
+        return {
+            "success": True,
+            "result": {"job_id": job_id, "estado": "cancelado"}
+        }
@@ -0,0 +1,174 @@
+from typing import Dict, Any, Optional
+from collections import deque
+import os
+import math
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+LIMITER_ENABLED = os.getenv('IOL_LIMITER_ENABLED', 'true').lower() == 'true'
+# Con varios workers cada proceso tiene su limitador: la capacidad configurada se reparte entre ellos
+WORKERS = max(1, int(os.getenv('IOL_WORKERS', '1')))
+
+class AdaptiveLimiter:
+    """
+    Limita las peticiones simultáneas a la API con una capacidad que se ajusta sola (AIMD):
+    crece de a uno mientras la latencia p90 se mantiene cerca de su nivel de referencia y la
+    capacidad se usa completa, y se reduce de forma multiplicativa ante 429/5xx/timeouts o
+    cuando la p90 supera la referencia por más de la tolerancia
+    """
+
+    def __init__(
+        self,
+        initial: Optional[int] = None,
+        min_limit: Optional[int] = None,
+        max_limit: Optional[int] = None,
+        window: Optional[int] = None,
+        tolerance: Optional[float] = None,
+        backoff: Optional[float] = None
+    ):
+        """
+        Inicializa el limitador. Los valores tomados de las variables de entorno son
+        totales del servidor: con IOL_WORKERS > 1 la capacidad inicial y la máxima se
+        dividen por la cantidad de workers
+
+        Args:
+            initial: Capacidad inicial
+            min_limit: Capacidad mínima
+            max_limit: Capacidad máxima
+            window: Peticiones completadas entre evaluaciones de la latencia
+            tolerance: Múltiplo de la p90 de referencia a partir del cual se reduce la capacidad
+            backoff: Factor aplicado a la capacidad al reducirla
+        """
+        self.max_limit = max_limit or math.ceil(int(os.getenv('IOL_LIMITER_MAX', '20')) / WORKERS)
+        self.min_limit = min(min_limit or int(os.getenv('IOL_LIMITER_MIN', '2')), self.max_limit)
+        self.limit = float(initial or max(self.min_limit, math.ceil(int(os.getenv('IOL_LIMITER_INITIAL', '10')) / WORKERS)))
+        self.window = window or int(os.getenv('IOL_LIMITER_WINDOW', '20'))
+        self.tolerance = tolerance or float(os.getenv('IOL_LIMITER_LATENCY_TOLERANCE', '2'))
+        self.backoff = backoff or float(os.getenv('IOL_LIMITER_BACKOFF', '0.7'))
+        self.in_flight = 0
+        self.baseline: Optional[float] = None
+        self.p90: Optional[float] = None
+        self.stats = {"increases": 0, "decreases": 0, "overloads": 0}
+        self._samples: deque = deque(maxlen=self.window)
+        self._since_evaluation = 0
+        self._since_decrease = 0
+        self._peak = 0
+        self._waiters: deque = deque()
+
+    @property
+    def capacity(self) -> int:
+        return int(self.limit)
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        if self.in_flight < self.capacity and not self._waiters:
+            self._take()
+            return self
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Se le había asignado un lugar: se libera para el siguiente
+                self.in_flight -= 1
+                self._wake()
+            elif future in self._waiters:
+                self._waiters.remove(future)
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _take(self) -> None:
+        self.in_flight += 1
+        self._peak = max(self._peak, self.in_flight)
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.capacity:
+            future = self._waiters.popleft()
+            if not future.done():
+                self._take()
+                future.set_result(None)
+
+    def record(self, latency: float, overloaded: bool = False) -> None:
+        """
+        Registra una petición completada
+
+        Args:
+            latency: Duración en segundos
+            overloaded: Si la API respondió 429/5xx o no respondió a tiempo
+        """
+        self._since_decrease += 1
+        if overloaded:
+            self.stats["overloads"] += 1
+            # Una sola reducción por ventana: una ráfaga de errores no colapsa la capacidad
+            if self._since_decrease >= self.window:
+                self._decrease("API saturada")
+            return
+
+        self._samples.append(latency)
+        self._since_evaluation += 1
+        if self._since_evaluation >= self.window:
+            self._evaluate()
+
+    def _evaluate(self) -> None:
+        ordered = sorted(self._samples)
+        self.p90 = ordered[int(len(ordered) * 0.9) - 1] if len(ordered) >= 10 else ordered[-1]
+        if self.baseline is None or self.p90 < self.baseline:
+            self.baseline = self.p90
+        else:
+            # La referencia sigue lentamente a la latencia normal (cambia según el horario)
+            self.baseline += (self.p90 - self.baseline) * 0.05
+
+        if self.p90 > self.baseline * self.tolerance and self._since_decrease >= self.window:
+            self._decrease(f"p90 {self.p90 * 1000:.0f} ms sobre referencia {self.baseline * 1000:.0f} ms")
+        elif self._peak >= self.capacity and self.capacity < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + 1)
+            self.stats["increases"] += 1
+            self._wake()
+        self._since_evaluation = 0
+        self._peak = self.in_flight
+
+    def _decrease(self, reason: str) -> None:
+        previous = self.capacity
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+        self._since_decrease = 0
+        # La próxima evaluación usa solo latencias medidas con la capacidad nueva
+        self._samples.clear()
+        self._since_evaluation = 0
+        self.stats["decreases"] += 1
+        if self.capacity != previous:
+            logger.info(f"Concurrencia hacia la API reducida de {previous} a {self.capacity}: {reason}")
+
+    def status(self) -> Dict[str, Any]:
+        """Métricas del limitador"""
+        return {
+            "limite": self.capacity,
+            "en_curso": self.in_flight,
+            "en_espera": len(self._waiters),
+            "p90_ms": round(self.p90 * 1000, 1) if self.p90 is not None else None,
+            "referencia_ms": round(self.baseline * 1000, 1) if self.baseline is not None else None,
+            **self.stats
+        }
+
+class _NoLimit:
+    """Reemplazo sin límite cuando el limitador está desactivado"""
+
+    async def __aenter__(self) -> "_NoLimit":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def record(self, latency: float, overloaded: bool = False) -> None:
+        return None
+
+    def status(self) -> Dict[str, Any]:
+        return {"limite": None}
+
+# Limitador compartido por todos los clientes del proceso
+request_limiter = AdaptiveLimiter() if LIMITER_ENABLED else _NoLimit()
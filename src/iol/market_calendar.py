@@ -0,0 +1,167 @@
+from typing import Dict, Any, Optional, Set, Tuple
+from datetime import datetime, date, time as dtime, timedelta
+from zoneinfo import ZoneInfo
+import os
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOLIDAYS_FILE = os.path.join(os.path.dirname(__file__), "data", "feriados.json")
+
+# Rueda de cada mercado: zona horaria, apertura y cierre
+SESSIONS: Dict[str, Tuple[str, dtime, dtime]] = {
+    "bcba": ("America/Argentina/Buenos_Aires", dtime(11, 0), dtime(17, 0)),
+    "rofx": ("America/Argentina/Buenos_Aires", dtime(10, 0), dtime(17, 0)),
+    "nyse": ("America/New_York", dtime(9, 30), dtime(16, 0)),
+    "nasdaq": ("America/New_York", dtime(9, 30), dtime(16, 0)),
+    "amex": ("America/New_York", dtime(9, 30), dtime(16, 0)),
+    "bcs": ("America/Santiago", dtime(9, 30), dtime(16, 0)),
+}
+
+# Mercados que comparten el calendario de feriados de otro
+HOLIDAY_CALENDAR = {"rofx": "bcba", "nasdaq": "nyse", "amex": "nyse"}
+
+# Mercado de referencia para los endpoints que se identifican por país
+PAIS_MERCADO = {"argentina": "bcba", "estados_unidos": "nyse"}
+
+class MarketCalendar:
+    """Calendario de ruedas por mercado, con feriados cargados desde un archivo local"""
+
+    def __init__(self, holidays_file: Optional[str] = None):
+        """
+        Inicializa el calendario
+
+        Args:
+            holidays_file: Archivo JSON con la lista de feriados por mercado
+        """
+        self.holidays: Dict[str, Set[date]] = {}
+        # Años cubiertos por el archivo para cada calendario de feriados
+        self.years: Dict[str, Set[int]] = {}
+        self._warned: Set[Tuple[str, int]] = set()
+        self.load_holidays(holidays_file or os.getenv('IOL_HOLIDAYS_FILE', DEFAULT_HOLIDAYS_FILE))
+
+    def load_holidays(self, path: str) -> None:
+        """Carga los feriados desde un archivo JSON {mercado: [YYYY-MM-DD, ...]}"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"No se pudo cargar el archivo de feriados {path}: {str(e)}")
+            return
+        self.holidays = {
+            mercado.lower(): {date.fromisoformat(day) for day in days}
+            for mercado, days in data.items()
+            if not mercado.startswith("_")
+        }
+        self.years = {mercado: {day.year for day in days} for mercado, days in self.holidays.items()}
+
+    @staticmethod
+    def resolve(mercado: Optional[str] = None, pais: Optional[str] = None) -> Optional[str]:
+        """Normaliza un mercado, o lo deduce del país; None si no se conoce su rueda"""
+        if mercado and mercado.lower() in SESSIONS:
+            return mercado.lower()
+        if pais:
+            return PAIS_MERCADO.get(pais.lower())
+        return None
+
+    def covers(self, mercado: str, now: Optional[datetime] = None) -> bool:
+        """
+        Indica si se conocen los feriados del mercado para el año en curso. Si no, el calendario
+        se considera desconocido: se avisa una vez por año y se usan los TTL e intervalos de rueda
+
+        Args:
+            mercado: Mercado (bCBA, nYSE, nASDAQ, aMEX, bCS, rOFX)
+            now: Momento a evaluar (por defecto, ahora)
+        """
+        mercado = mercado.lower()
+        if mercado not in SESSIONS:
+            return True
+        calendar = HOLIDAY_CALENDAR.get(mercado, mercado)
+        year = (now or datetime.now(ZoneInfo("UTC"))).astimezone(ZoneInfo(SESSIONS[mercado][0])).year
+        if year in self.years.get(calendar, set()):
+            return True
+        if (calendar, year) not in self._warned:
+            self._warned.add((calendar, year))
+            logger.warning(
+                f"Sin feriados de {calendar} para {year} en el archivo de feriados: "
+                f"se usan los TTL de rueda hasta que se actualice"
+            )
+        return False
+
+    def _is_trading_day(self, mercado: str, day: date) -> bool:
+        calendar = HOLIDAY_CALENDAR.get(mercado, mercado)
+        return day.weekday() < 5 and day not in self.holidays.get(calendar, set())
+
+    def is_open(self, mercado: str, now: Optional[datetime] = None) -> bool:
+        """
+        Indica si el mercado está en rueda
+
+        Args:
+            mercado: Mercado (bCBA, nYSE, nASDAQ, aMEX, bCS, rOFX)
+            now: Momento a evaluar (por defecto, ahora)
+        """
+        mercado = mercado.lower()
+        if mercado not in SESSIONS:
+            return True
+        tz, opens, closes = SESSIONS[mercado]
+        local = (now or datetime.now(ZoneInfo("UTC"))).astimezone(ZoneInfo(tz))
+        return self._is_trading_day(mercado, local.date()) and opens <= local.time() < closes
+
+    def next_open(self, mercado: str, now: Optional[datetime] = None) -> datetime:
+        """Devuelve el próximo momento de apertura del mercado (o ahora, si está abierto)"""
+        mercado = mercado.lower()
+        tz, opens, closes = SESSIONS[mercado]
+        zone = ZoneInfo(tz)
+        local = (now or datetime.now(ZoneInfo("UTC"))).astimezone(zone)
+        if self.is_open(mercado, local):
+            return local
+        day = local.date()
+        if local.time() >= opens:
+            day += timedelta(days=1)
+        while not self._is_trading_day(mercado, day):
+            day += timedelta(days=1)
+        return datetime.combine(day, opens, tzinfo=zone)
+
+    def seconds_until_open(self, mercado: str, now: Optional[datetime] = None) -> float:
+        """Segundos hasta la próxima apertura (0 si el mercado está abierto)"""
+        mercado = mercado.lower()
+        if mercado not in SESSIONS:
+            return 0.0
+        now = now or datetime.now(ZoneInfo("UTC"))
+        return max(0.0, (self.next_open(mercado, now) - now).total_seconds())
+
+    def ttl_for(self, mercado: Optional[str], open_ttl: float, now: Optional[datetime] = None) -> float:
+        """
+        TTL de un dato de mercado: durante la rueda se usa open_ttl; fuera de ella
+        el último precio es definitivo hasta la próxima apertura
+
+        Args:
+            mercado: Mercado del dato (None si no depende de una rueda)
+            open_ttl: TTL a usar con el mercado abierto
+            now: Momento a evaluar (por defecto, ahora)
+        """
+        if not mercado or mercado.lower() not in SESSIONS or not self.covers(mercado, now):
+            return open_ttl
+        return max(open_ttl, self.seconds_until_open(mercado, now))
+
+    def poll_delay(self, mercado: str, interval: float, now: Optional[datetime] = None) -> float:
+        """Espera hasta la próxima consulta de un poller: el intervalo en rueda, o hasta la apertura (si se conoce el calendario)"""
+        if not self.covers(mercado, now):
+            return interval
+        return max(interval, self.seconds_until_open(mercado, now))
+
+    def status(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Estado de cada mercado: abierto y próxima apertura"""
+        now = now or datetime.now(ZoneInfo("UTC"))
+        return {
+            mercado: {
+                "abierto": self.is_open(mercado, now),
+                "calendario_conocido": self.covers(mercado, now),
+                "proxima_apertura": self.next_open(mercado, now).isoformat(timespec="minutes")
+            }
+            for mercado in SESSIONS
+        }
+
+# Instancia compartida por cachés, pollers y prefetchers
+market_calendar = MarketCalendar()
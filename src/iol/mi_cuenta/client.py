@@ -1,5 +1,7 @@
-from typing import Dict, Any, Optional, List
-from ..http_client import IOLAPIClient
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable
+from ..http_client import IOLAPIClient, passthrough
+from ..batch import run_bounded, split_date_range, merge_chunks
+from ..models import Operacion, as_model
 
 class MiCuentaClient(IOLAPIClient):
     async def obtener_estado_cuenta(self) -> Dict[str, Any]:
@@ -89,4 +91,93 @@ class MiCuentaClient(IOLAPIClient):
         if pais:
             params["filtro.pais"] = pais
             
-        return await self.get("/api/v2/operaciones", params=params) 
\ No newline at end of file
+        return await self.get("/api/v2/operaciones", params=params)
+
+    async def obtener_operaciones_por_tramos(
+        self,
+        fecha_desde: str,
+        fecha_hasta: str,
+        estado: Optional[str] = None,
+        pais: Optional[str] = None,
+        dias: int = 31,
+        progress: Optional[Callable[[int, int], Awaitable[None]]] = None
+    ) -> List[Operacion]:
+        """
+        Obtiene las operaciones de un período largo consultando en paralelo tramos de hasta dias días.
+        Cada tramo se decodifica directo a Operacion: el resultado queda en memoria mientras dura el job
+        
+        Args:
+            fecha_desde: Fecha desde en formato ISO
+            fecha_hasta: Fecha hasta en formato ISO
+            estado: Estado de las operaciones (todas, pendientes, terminadas, canceladas)
+            pais: País de las operaciones (argentina, estados_unidos)
+            dias: Días por tramo
+            progress: Corrutina llamada con (tramos completados, total) al terminar cada tramo
+            
+        Returns:
+            List[Operacion]: Operaciones de todos los tramos, de la más reciente a la más antigua
+        """
+        async def _tramo(tramo: Tuple[str, str]) -> List[Operacion]:
+            with passthrough():
+                data = await self.obtener_operaciones(
+                    estado=estado,
+                    fecha_desde=tramo[0],
+                    fecha_hasta=tramo[1],
+                    pais=pais
+                )
+            return as_model(data, Operacion, many=True) or []
+
+        outcomes = await run_bounded(
+            split_date_range(fecha_desde, fecha_hasta, dias),
+            _tramo,
+            progress=progress
+        )
+        return merge_chunks(outcomes, key="numero")
+
+    async def obtener_operaciones_lote(
+        self,
+        numeros: List[int],
+        max_concurrencia: Optional[int] = None,
+        progress: Optional[Callable[[int, int], Awaitable[None]]] = None
+    ) -> List[Tuple[int, Any, Optional[str]]]:
+        """
+        Obtiene el detalle de varias operaciones en paralelo
+        
+        Args:
+            numeros: Números de las operaciones
+            max_concurrencia: Cantidad máxima de consultas simultáneas
+            progress: Corrutina llamada con (completadas, total) al terminar cada consulta
+            
+        Returns:
+            List[Tuple[int, Any, Optional[str]]]: Tuplas (numero, detalle, error) por operación
+        """
+        return await run_bounded(
+            list(dict.fromkeys(numeros)),
+            lambda numero: self.obtener_operacion(numero=numero),
+            max_concurrencia,
+            progress
+        )
+        
+    async def cancelar_operaciones_lote(
+        self,
+        numeros: List[int],
+        max_concurrencia: Optional[int] = None,
+        progress: Optional[Callable[[int, int], Awaitable[None]]] = None
+    ) -> List[Tuple[int, Any, Optional[str]]]:
+        """
+        Cancela varias operaciones en paralelo
+        
+        Args:
+            numeros: Números de las operaciones a cancelar
+            max_concurrencia: Cantidad máxima de cancelaciones simultáneas
+            progress: Corrutina llamada con (completadas, total) al terminar cada cancelación
+            
+        Returns:
+            List[Tuple[int, Any, Optional[str]]]: Tuplas (numero, respuesta, error) por operación
+        """
+        return await run_bounded(
+            list(dict.fromkeys(numeros)),
+            lambda numero: self.cancelar_operacion(numero=numero),
+            max_concurrencia,
+            progress
+        )
@@ -1,76 +1,25 @@
 from typing import Dict, Any, List, Optional
-from fastmcp import FastMCP
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from fastmcp import FastMCP, Context
+from pydantic import Field
 from ..base_routes import BaseRoutes
+from ..batch import split_results
+from ..jobs import job_manager, job_started
+from ..columnar import FORMATS, apply_format
 from .client import MiCuentaClient
-
-class CuentaModel(BaseModel):
-    """Modelo para representar una cuenta según el esquema EstadoCuentaModel"""
-    # Aquí se definirían los campos específicos de CuentaModel
-    # pero no se proporcionan en la especificación del swagger
-    
-    model_config = ConfigDict(extra="ignore", validate_assignment=True)
-
-class EstadisticaModel(BaseModel):
-    """Modelo para representar una estadística según el esquema EstadoCuentaModel"""
-    # Aquí se definirían los campos específicos de EstadisticaModel
-    # pero no se proporcionan en la especificación del swagger
-    
-    model_config = ConfigDict(extra="ignore", validate_assignment=True)
-
-class EstadoCuentaModel(BaseModel):
-    """Modelo para representar el estado de cuenta según el swagger"""
-    cuentas: Optional[List[CuentaModel]] = Field(default=None, description="Lista de cuentas del usuario")
-    estadisticas: Optional[List[EstadisticaModel]] = Field(default=None, description="Lista de estadísticas de la cuenta")
-    totalEnPesos: Optional[float] = Field(default=None, description="Total en pesos")
-    
-    model_config = ConfigDict(extra="ignore", validate_assignment=True)
-    
-    @field_validator('*', mode='before')
-    @classmethod
-    def empty_str_to_none(cls, v):
-        if v == "":
-            return None
-        return v
-
-class PortafolioModel(BaseModel):
-    """Modelo para representar el portafolio según el swagger"""
-    # Aquí se definirían los campos específicos de PortafolioModel
-    # pero no se proporcionan en la especificación del swagger
-    
-    model_config = ConfigDict(extra="ignore", validate_assignment=True)
-
-class OperacionDetalleModel(BaseModel):
-    """Modelo para representar el detalle de una operación según el swagger"""
-    # Aquí se definirían los campos específicos de OperacionDetalleModel
-    # pero no se proporcionan en la especificación del swagger
-    
-    model_config = ConfigDict(extra="ignore", validate_assignment=True)
-
-class ResponseModel(BaseModel):
-    """Modelo para representar la respuesta de cancelación según el swagger"""
-    # Aquí se definirían los campos específicos de ResponseModel
-    # pero no se proporcionan en la especificación del swagger
-    
-    model_config = ConfigDict(extra="ignore", validate_assignment=True)
-
-class OperacionModel(BaseModel):
-    """Modelo para representar una operación según el swagger"""
-    # Aquí se definirían los campos específicos de OperacionModel
-    # pero no se proporcionan en la especificación del swagger
-    
-    model_config = ConfigDict(extra="ignore", validate_assignment=True)
+from .tracker import OrderTracker
 
 class MiCuentaRoutes(BaseRoutes):
     def __init__(self):
         super().__init__()
         self.client = MiCuentaClient()
+        self.tracker = OrderTracker(self.client)
 
     def register_tools(self, mcp: FastMCP):
         @mcp.tool(
             name="obtener_estado_cuenta",
             description="Obtener estado de cuenta del usuario",
-            tags=["mi_cuenta", "estado"]
+            tags=["mi_cuenta", "estado"],
+            output_schema=None
         )
         async def obtener_estado_cuenta() -> Dict[str, Any]:
             """
@@ -80,18 +29,15 @@ class MiCuentaRoutes(BaseRoutes):
                 Dict[str, Any]: Objeto con información de cuentas, estadísticas y total en pesos
             """
             try:
-                result = await self.client.obtener_estado_cuenta()
-                return {
-                    "success": True,
-                    "result": result
-                }
+                return await self.passthrough_response(self.client.obtener_estado_cuenta())
             except Exception as e:
                 return {"error": f"Error obteniendo estado de cuenta: {str(e)}"}
                 
         @mcp.tool(
             name="obtener_portafolio",
             description="Obtener portafolio del usuario para un país específico",
-            tags=["mi_cuenta", "portafolio"]
+            tags=["mi_cuenta", "portafolio"],
+            output_schema=None
         )
         async def obtener_portafolio(
             pais: str = Field(description="País del portafolio", enum=["argentina", "estados_unidos"])
@@ -106,18 +52,15 @@ class MiCuentaRoutes(BaseRoutes):
                 Dict[str, Any]: Objeto con la información del portafolio
             """
             try:
-                result = await self.client.obtener_portafolio(pais=pais)
-                return {
-                    "success": True,
-                    "result": result
-                }
+                return await self.passthrough_response(self.client.obtener_portafolio(pais=pais))
             except Exception as e:
                 return {"error": f"Error obteniendo portafolio: {str(e)}"}
                 
         @mcp.tool(
             name="obtener_operacion",
             description="Obtener detalle de una operación específica",
-            tags=["mi_cuenta", "operaciones"]
+            tags=["mi_cuenta", "operaciones"],
+            output_schema=None
         )
         async def obtener_operacion(
             numero: int = Field(description="Número de la operación")
@@ -132,11 +75,7 @@ class MiCuentaRoutes(BaseRoutes):
                 Dict[str, Any]: Objeto con el detalle de la operación
             """
             try:
-                result = await self.client.obtener_operacion(numero=numero)
-                return {
-                    "success": True,
-                    "result": result
-                }
+                return await self.passthrough_response(self.client.obtener_operacion(numero=numero))
             except Exception as e:
                 return {"error": f"Error obteniendo operación: {str(e)}"}
                 
@@ -159,24 +98,25 @@ class MiCuentaRoutes(BaseRoutes):
             """
             try:
                 result = await self.client.cancelar_operacion(numero=numero)
-                return {
-                    "success": True,
-                    "result": result
-                }
+                return self.success_response(result)
             except Exception as e:
                 return {"error": f"Error cancelando operación: {str(e)}"}
                 
         @mcp.tool(
             name="obtener_operaciones",
             description="Obtener operaciones del usuario según filtros",
-            tags=["mi_cuenta", "operaciones", "filtros"]
+            tags=["mi_cuenta", "operaciones", "filtros"],
+            output_schema=None
         )
         async def obtener_operaciones(
+            ctx: Context,
             numero: Optional[int] = Field(default=None, description="Número de operación para filtrar"),
             estado: Optional[str] = Field(default=None, description="Estado de las operaciones", enum=["todas", "pendientes", "terminadas", "canceladas"]),
             fecha_desde: Optional[str] = Field(default=None, description="Fecha desde en formato ISO (YYYY-MM-DD)"),
             fecha_hasta: Optional[str] = Field(default=None, description="Fecha hasta en formato ISO (YYYY-MM-DD)"),
-            pais: Optional[str] = Field(default=None, description="País de las operaciones", enum=["argentina", "estados_unidos"])
+            pais: Optional[str] = Field(default=None, description="País de las operaciones", enum=["argentina", "estados_unidos"]),
+            en_segundo_plano: bool = Field(default=False, description="Consultar por tramos mensuales en un job y devolver su job_id de inmediato (requiere fecha_desde y fecha_hasta)"),
+            formato: str = Field(default="filas", description="filas (lista de objetos) o columnar (nombres de campo una sola vez y textos repetidos codificados con diccionario)", enum=FORMATS)
         ) -> Dict[str, Any]:
             """
             Obtiene las operaciones del usuario según los filtros especificados
@@ -187,21 +127,202 @@ class MiCuentaRoutes(BaseRoutes):
                 fecha_desde: Fecha desde en formato ISO
                 fecha_hasta: Fecha hasta en formato ISO
                 pais: País de las operaciones (argentina, estados_unidos)
+                en_segundo_plano: Ejecutar como job (resultado con obtener_resultado_job)
+                formato: filas o columnar
                 
             Returns:
                 Dict[str, Any]: Lista de objetos con las operaciones
             """
             try:
-                result = await self.client.obtener_operaciones(
+                if en_segundo_plano:
+                    if numero is not None or not (fecha_desde and fecha_hasta):
+                        return {"error": "en_segundo_plano requiere fecha_desde y fecha_hasta, sin filtrar por número"}
+                    job = job_manager.submit(
+                        "obtener_operaciones",
+                        lambda job: self.client.obtener_operaciones_por_tramos(
+                            fecha_desde=fecha_desde,
+                            fecha_hasta=fecha_hasta,
+                            estado=estado,
+                            pais=pais,
+                            progress=lambda done, total: job.report(done, total, f"{done} de {total} tramos mensuales")
+                        ),
+                        session=ctx.session,
+                        formato=formato
+                    )
+                    return job_started(job)
+                call = self.client.obtener_operaciones(
                     numero=numero,
                     estado=estado,
                     fecha_desde=fecha_desde,
                     fecha_hasta=fecha_hasta,
                     pais=pais
                 )
+                if formato == "columnar":
+                    return self.success_response(apply_format(await call, formato))
+                return await self.passthrough_response(call)
+            except Exception as e:
+                return {"error": f"Error obteniendo operaciones: {str(e)}"}
+
+        @mcp.tool(
+            name="obtener_operaciones_lote",
+            description="Obtener el detalle de varias operaciones en paralelo",
+            tags=["mi_cuenta", "operaciones", "lote"]
+        )
+        async def obtener_operaciones_lote(
+            ctx: Context,
+            numeros: List[int] = Field(description="Números de las operaciones"),
+            max_concurrencia: Optional[int] = Field(default=None, description="Cantidad máxima de consultas simultáneas"),
+            en_segundo_plano: bool = Field(default=False, description="Ejecutar en un job y devolver su job_id de inmediato")
+        ) -> Dict[str, Any]:
+            """
+            Obtiene el detalle de varias operaciones en paralelo
+            
+            Args:
+                numeros: Números de las operaciones
+                max_concurrencia: Cantidad máxima de consultas simultáneas
+                en_segundo_plano: Ejecutar como job (resultado con obtener_resultado_job)
+                
+            Returns:
+                Dict[str, Any]: Detalles obtenidos y errores por operación
+            """
+            try:
+                if en_segundo_plano:
+                    async def _job(job) -> Dict[str, Any]:
+                        outcomes = await self.client.obtener_operaciones_lote(
+                            numeros=numeros,
+                            max_concurrencia=max_concurrencia,
+                            progress=lambda done, total: job.report(done, total, f"{done} de {total} operaciones")
+                        )
+                        results, errors = split_results(outcomes, "numero")
+                        return {"result": results, "errors": errors}
+
+                    return job_started(job_manager.submit("obtener_operaciones_lote", _job, session=ctx.session))
+
+                outcomes = await self.client.obtener_operaciones_lote(
+                    numeros=numeros,
+                    max_concurrencia=max_concurrencia
+                )
+                results, errors = split_results(outcomes, "numero")
+                return {
+                    "success": not errors,
+                    "result": results,
+                    "errors": errors
+                }
+            except Exception as e:
+                return {"error": f"Error obteniendo operaciones en lote: {str(e)}"}
+                
+        @mcp.tool(
+            name="cancelar_operaciones_lote",
+            description="Cancelar varias operaciones en paralelo",
+            tags=["mi_cuenta", "operaciones", "cancelar", "lote"]
+        )
+        async def cancelar_operaciones_lote(
+            ctx: Context,
+            numeros: List[int] = Field(description="Números de las operaciones a cancelar"),
+            max_concurrencia: Optional[int] = Field(default=None, description="Cantidad máxima de cancelaciones simultáneas"),
+            en_segundo_plano: bool = Field(default=False, description="Ejecutar en un job y devolver su job_id de inmediato")
+        ) -> Dict[str, Any]:
+            """
+            Cancela varias operaciones en paralelo
+            
+            Args:
+                numeros: Números de las operaciones a cancelar
+                max_concurrencia: Cantidad máxima de cancelaciones simultáneas
+                en_segundo_plano: Ejecutar como job (resultado con obtener_resultado_job)
+                
+            Returns:
+                Dict[str, Any]: Resultado de cada cancelación y errores por operación
+            """
+            try:
+                if en_segundo_plano:
+                    async def _job(job) -> Dict[str, Any]:
+                        outcomes = await self.client.cancelar_operaciones_lote(
+                            numeros=numeros,
+                            max_concurrencia=max_concurrencia,
+                            progress=lambda done, total: job.report(done, total, f"{done} de {total} operaciones")
+                        )
+                        results, errors = split_results(outcomes, "numero")
+                        return {"result": results, "errors": errors}
+
+                    return job_started(job_manager.submit("cancelar_operaciones_lote", _job, session=ctx.session))
+
+                outcomes = await self.client.cancelar_operaciones_lote(
+                    numeros=numeros,
+                    max_concurrencia=max_concurrencia
+                )
+                results, errors = split_results(outcomes, "numero")
+                return {
+                    "success": not errors,
+                    "result": results,
+                    "errors": errors
+                }
+            except Exception as e:
+                return {"error": f"Error cancelando operaciones en lote: {str(e)}"}
+                
+        @mcp.tool(
+            name="seguir_operaciones",
+            description="Seguir en segundo plano el estado de operaciones y notificar sus cambios a la sesión",
+            tags=["mi_cuenta", "operaciones", "seguimiento"]
+        )
+        async def seguir_operaciones(
+            ctx: Context,
+            numeros: List[int] = Field(description="Números de las operaciones a seguir")
+        ) -> Dict[str, Any]:
+            """
+            Agrega operaciones al seguimiento en segundo plano. Solo se consultan
+            las operaciones no terminadas, con intervalos crecientes mientras no
+            cambian, y cada cambio de estado se envía a la sesión como notificación.
+            
+            Args:
+                numeros: Números de las operaciones a seguir
+                
+            Returns:
+                Dict[str, Any]: Operaciones actualmente en seguimiento
+            """
+            try:
+                self.tracker.track(numeros, session=ctx.session)
                 return {
                     "success": True,
-                    "result": result
+                    "result": self.tracker.snapshot()
                 }
             except Exception as e:
-                return {"error": f"Error obteniendo operaciones: {str(e)}"} 
\ No newline at end of file
+                return {"error": f"Error iniciando seguimiento de operaciones: {str(e)}"}
+                
+        @mcp.tool(
+            name="obtener_seguimiento_operaciones",
+            description="Obtener el último estado conocido de las operaciones en seguimiento",
+            tags=["mi_cuenta", "operaciones", "seguimiento"]
+        )
+        async def obtener_seguimiento_operaciones() -> Dict[str, Any]:
+            """
+            Obtiene el último estado conocido de las operaciones en seguimiento sin consultar la API
+            
+            Returns:
+                Dict[str, Any]: Operaciones en seguimiento con su estado
+            """
+            return {
+                "success": True,
+                "result": self.tracker.snapshot()
+            }
+                
+        @mcp.tool(
+            name="dejar_de_seguir_operaciones",
+            description="Quitar operaciones del seguimiento en segundo plano",
+            tags=["mi_cuenta", "operaciones", "seguimiento"]
+        )
+        async def dejar_de_seguir_operaciones(
+            numeros: List[int] = Field(description="Números de las operaciones")
+        ) -> Dict[str, Any]:
+            """
+            Quita operaciones del seguimiento en segundo plano
+            
+            Args:
+                numeros: Números de las operaciones
+                
+            Returns:
+                Dict[str, Any]: Operaciones que fueron quitadas
+            """
+            return {
+                "success": True,
+                "result": self.tracker.untrack(numeros)
+            }
@@ -0,0 +1,155 @@
+from typing import Dict, Any, Optional, List, Set
+import os
+import time
+import asyncio
+import logging
+import unicodedata
+from ..cache import response_cache, ACCOUNT_GROUPS, MERCADO_PAIS
+from ..market_calendar import market_calendar
+from ..http_client import passthrough
+from ..models import OperacionDetalle, as_model, to_dict
+
+logger = logging.getLogger(__name__)
+
+# Estados a partir de los cuales una operación ya no cambia
+TERMINAL_STATES = {"terminada", "cancelada", "rechazada", "vencida", "anulada"}
+
+class OrderTracker:
+    """Seguimiento en segundo plano del estado de operaciones no terminadas"""
+
+    def __init__(self, client, min_interval: Optional[float] = None, max_interval: Optional[float] = None):
+        """
+        Inicializa el seguimiento de operaciones
+
+        Args:
+            client: Cliente con obtener_operaciones_lote (MiCuentaClient)
+            min_interval: Segundos entre consultas tras un cambio de estado
+            max_interval: Segundos máximos entre consultas de una operación sin cambios
+        """
+        self.client = client
+        self.min_interval = min_interval or float(os.getenv('IOL_TRACKER_MIN_INTERVAL', '2'))
+        self.max_interval = max_interval or float(os.getenv('IOL_TRACKER_MAX_INTERVAL', '60'))
+        self.backoff = 2.0
+        self._orders: Dict[int, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def normalize_state(estado: Optional[str]) -> Optional[str]:
+        """Normaliza un estado de operación: minúsculas, sin tildes ni espacios ("Terminada" -> "terminada")"""
+        if not estado:
+            return None
+        text = unicodedata.normalize("NFKD", str(estado))
+        return "".join(c for c in text if not unicodedata.combining(c) and not c.isspace()).lower()
+
+    @classmethod
+    def is_terminal(cls, estado: Optional[str]) -> bool:
+        """Indica si un estado de operación es final"""
+        return cls.normalize_state(estado) in TERMINAL_STATES
+
+    def track(self, numeros: List[int], session: Any = None) -> None:
+        """
+        Agrega operaciones al seguimiento
+
+        Args:
+            numeros: Números de las operaciones
+            session: Sesión MCP a la que se notifican los cambios (opcional)
+        """
+        now = time.monotonic()
+        for numero in numeros:
+            order = self._orders.setdefault(numero, {
+                "estado": None,
+                "detalle": None,
+                "mercado": None,
+                "interval": self.min_interval,
+                "next_poll": now,
+                "sessions": set()
+            })
+            if session is not None:
+                order["sessions"].add(session)
+        self._ensure_running()
+
+    def untrack(self, numeros: List[int]) -> List[int]:
+        """Quita operaciones del seguimiento y devuelve las que estaban siendo seguidas"""
+        return [numero for numero in numeros if self._orders.pop(numero, None) is not None]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Devuelve el último estado conocido de cada operación seguida"""
+        now = time.monotonic()
+        return [
+            {
+                "numero": numero,
+                "estado": order["estado"],
+                "proxima_consulta_seg": round(max(0.0, order["next_poll"] - now), 1)
+            }
+            for numero, order in self._orders.items()
+        ]
+
+    def _ensure_running(self) -> None:
+        if self._orders and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        logger.info("Seguimiento de operaciones iniciado")
+        while self._orders:
+            now = time.monotonic()
+            due = [numero for numero, order in self._orders.items() if order["next_poll"] <= now]
+            if due:
+                # Los detalles se decodifican directo de los bytes de la respuesta a OperacionDetalle
+                with passthrough():
+                    outcomes = await self.client.obtener_operaciones_lote(due)
+                for numero, detalle, error in outcomes:
+                    await self._update(numero, as_model(detalle, OperacionDetalle) if error is None else None, error)
+            if not self._orders:
+                break
+            next_poll = min(order["next_poll"] for order in self._orders.values())
+            await asyncio.sleep(max(0.1, next_poll - time.monotonic()))
+        logger.info("Seguimiento de operaciones finalizado: no quedan operaciones pendientes")
+
+    async def _update(self, numero: int, detalle: Optional[OperacionDetalle], error: Optional[str]) -> None:
+        order = self._orders.get(numero)
+        if order is None:
+            return
+
+        if error is None and isinstance(detalle, OperacionDetalle):
+            estado = detalle.estadoActual or detalle.estado
+            order["mercado"] = market_calendar.resolve(detalle.mercado) or order["mercado"]
+            if self.normalize_state(estado) != self.normalize_state(order["estado"]):
+                previous = order["estado"]
+                order["estado"] = estado
+                order["detalle"] = detalle
+                order["interval"] = self.min_interval
+                # Un cambio de estado (ejecución, cancelación) mueve saldo, posiciones y operaciones
+                response_cache.invalidate(
+                    getattr(self.client, "username", None), ACCOUNT_GROUPS,
+                    MERCADO_PAIS.get(order["mercado"]) if order["mercado"] else None
+                )
+                await self._notify(order["sessions"], {
+                    "evento": "cambio_estado_operacion",
+                    "numero": numero,
+                    "estado_anterior": previous,
+                    "estado": estado,
+                    "detalle": to_dict(detalle)
+                })
+            else:
+                order["interval"] = min(order["interval"] * self.backoff, self.max_interval)
+
+            if self.is_terminal(estado):
+                self._orders.pop(numero, None)
+                return
+        else:
+            logger.warning(f"Error consultando la operación {numero}: {error}")
+            order["interval"] = min(order["interval"] * self.backoff, self.max_interval)
+
+        # Con el mercado cerrado la operación no cambia de estado: se vuelve a consultar en la apertura
+        delay = order["interval"]
+        if order["mercado"]:
+            delay = market_calendar.poll_delay(order["mercado"], delay)
+        order["next_poll"] = time.monotonic() + delay
+
+    async def _notify(self, sessions: Set[Any], payload: Dict[str, Any]) -> None:
+        for session in list(sessions):
+            try:
+                await session.send_log_message(level="info", data=payload, logger="iol.operaciones")
+            except Exception as e:
+                logger.debug(f"Sesión descartada del seguimiento de operaciones: {str(e)}")
+                sessions.discard(session)
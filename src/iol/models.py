@@ -0,0 +1,349 @@
+from typing import Dict, Any, Optional, List, Tuple, Type, TypeVar, Union, get_type_hints, get_origin, get_args
+from dataclasses import dataclass, fields, is_dataclass
+import json
+import logging
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import to_json
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - msgspec es opcional: sin él se decodifica con json
+    msgspec = None
+
+T = TypeVar("T")
+
+def loads(raw: Union[bytes, str]) -> Any:
+    """Decodifica JSON a objetos de Python (con msgspec si está instalado)"""
+    if msgspec is not None:
+        return msgspec.json.decode(raw)
+    return json.loads(raw)
+
+def dumps(obj: Any) -> bytes:
+    """Codifica objetos de Python a JSON (con msgspec si está instalado)"""
+    if msgspec is not None:
+        return msgspec.json.encode(obj)
+    return to_json(obj)
+
+class RawJSON(bytes):
+    """Cuerpo JSON de una respuesta de la API, todavía sin decodificar"""
+    __slots__ = ()
+
+def value_of(result: Any) -> Any:
+    """Decodifica un RawJSON (None si está vacío); cualquier otro valor se devuelve sin cambios"""
+    if isinstance(result, RawJSON):
+        return loads(result) if result and not result.isspace() else None
+    return result
+
+def as_raw(result: Any) -> RawJSON:
+    """Devuelve el resultado como RawJSON, codificándolo si ya estaba decodificado"""
+    return result if isinstance(result, RawJSON) else RawJSON(dumps(result))
+
+@dataclass(slots=True)
+class Puntas:
+    """Una punta de compra/venta"""
+    cantidadCompra: Optional[float] = None
+    precioCompra: Optional[float] = None
+    precioVenta: Optional[float] = None
+    cantidadVenta: Optional[float] = None
+
+@dataclass(slots=True)
+class Cotizacion:
+    """Cotización de un título (también cada fila de la serie histórica)"""
+    ultimoPrecio: Optional[float] = None
+    variacion: Optional[float] = None
+    apertura: Optional[float] = None
+    maximo: Optional[float] = None
+    minimo: Optional[float] = None
+    fechaHora: Optional[str] = None
+    tendencia: Optional[str] = None
+    cierreAnterior: Optional[float] = None
+    montoOperado: Optional[float] = None
+    volumenNominal: Optional[float] = None
+    precioPromedio: Optional[float] = None
+    moneda: Optional[str] = None
+    precioAjuste: Optional[float] = None
+    interesesAbiertos: Optional[float] = None
+    puntas: Optional[List[Puntas]] = None
+    cantidadOperaciones: Optional[float] = None
+    descripcionTitulo: Optional[str] = None
+    plazo: Optional[str] = None
+    laminaMinima: Optional[float] = None
+    lote: Optional[float] = None
+
+@dataclass(slots=True)
+class TituloPanel:
+    """Fila de un panel de cotizaciones"""
+    simbolo: Optional[str] = None
+    puntas: Optional[Puntas] = None
+    ultimoPrecio: Optional[float] = None
+    variacionPorcentual: Optional[float] = None
+    apertura: Optional[float] = None
+    maximo: Optional[float] = None
+    minimo: Optional[float] = None
+    ultimoCierre: Optional[float] = None
+    volumen: Optional[float] = None
+    cantidadOperaciones: Optional[float] = None
+    fecha: Optional[str] = None
+    tipoOpcion: Optional[str] = None
+    precioEjercicio: Optional[float] = None
+    fechaVencimiento: Optional[str] = None
+    mercado: Optional[str] = None
+    moneda: Optional[str] = None
+    descripcion: Optional[str] = None
+    plazo: Optional[str] = None
+    laminaMinima: Optional[float] = None
+    lote: Optional[float] = None
+
+@dataclass(slots=True)
+class Panel:
+    """Panel de cotizaciones"""
+    titulos: Optional[List[TituloPanel]] = None
+
+@dataclass(slots=True)
+class Titulo:
+    """Título de una posición del portafolio"""
+    simbolo: Optional[str] = None
+    descripcion: Optional[str] = None
+    pais: Optional[str] = None
+    mercado: Optional[str] = None
+    tipo: Optional[str] = None
+    plazo: Optional[str] = None
+    moneda: Optional[str] = None
+
+@dataclass(slots=True)
+class Posicion:
+    """Activo del portafolio"""
+    cantidad: Optional[float] = None
+    comprometido: Optional[float] = None
+    puntosVariacion: Optional[float] = None
+    variacionDiaria: Optional[float] = None
+    ultimoPrecio: Optional[float] = None
+    ppc: Optional[float] = None
+    gananciaPorcentaje: Optional[float] = None
+    gananciaDinero: Optional[float] = None
+    valorizado: Optional[float] = None
+    titulo: Optional[Titulo] = None
+    # Algunas respuestas traen el símbolo en la posición en lugar de en el título
+    simbolo: Optional[str] = None
+
+@dataclass(slots=True)
+class Portafolio:
+    """Portafolio de un país"""
+    pais: Optional[str] = None
+    activos: Optional[List[Posicion]] = None
+
+@dataclass(slots=True)
+class Operacion:
+    """Operación de la lista de operaciones de la cuenta"""
+    numero: Optional[int] = None
+    fechaOrden: Optional[str] = None
+    tipo: Optional[str] = None
+    estado: Optional[str] = None
+    mercado: Optional[str] = None
+    simbolo: Optional[str] = None
+    cantidad: Optional[float] = None
+    monto: Optional[float] = None
+    modalidad: Optional[str] = None
+    precio: Optional[float] = None
+    fechaOperada: Optional[str] = None
+    cantidadOperada: Optional[float] = None
+    precioOperado: Optional[float] = None
+    montoOperado: Optional[float] = None
+    plazo: Optional[str] = None
+
+@dataclass(slots=True)
+class EstadoOperacion:
+    """Cambio de estado en el historial de una operación"""
+    detalle: Optional[str] = None
+    fecha: Optional[str] = None
+
+@dataclass(slots=True)
+class Arancel:
+    """Arancel cobrado por una operación"""
+    tipo: Optional[str] = None
+    neto: Optional[float] = None
+    iva: Optional[float] = None
+    moneda: Optional[str] = None
+
+@dataclass(slots=True)
+class Ejecucion:
+    """Ejecución parcial o total de una operación"""
+    fecha: Optional[str] = None
+    cantidad: Optional[float] = None
+    precio: Optional[float] = None
+
+@dataclass(slots=True)
+class OperacionDetalle:
+    """Detalle de una operación (el estado vigente viene en estadoActual)"""
+    numero: Optional[int] = None
+    mercado: Optional[str] = None
+    simbolo: Optional[str] = None
+    moneda: Optional[str] = None
+    tipo: Optional[str] = None
+    fechaAlta: Optional[str] = None
+    validez: Optional[str] = None
+    fechaOperado: Optional[str] = None
+    estadoActual: Optional[str] = None
+    # Algunas respuestas informan el estado como en la lista de operaciones
+    estado: Optional[str] = None
+    precio: Optional[float] = None
+    cantidad: Optional[float] = None
+    monto: Optional[float] = None
+    modalidad: Optional[str] = None
+    plazo: Optional[str] = None
+    estados: Optional[List[EstadoOperacion]] = None
+    aranceles: Optional[List[Arancel]] = None
+    operaciones: Optional[List[Ejecucion]] = None
+    arancelesARS: Optional[float] = None
+    arancelesUSD: Optional[float] = None
+
+# Por modelo: (campo, tipo de conversión, modelo anidado), calculado una vez por clase
+_SPECS: Dict[type, List[Tuple[str, str, Optional[type]]]] = {}
+
+def _spec(cls: type) -> List[Tuple[str, str, Optional[type]]]:
+    spec = _SPECS.get(cls)
+    if spec is None:
+        hints = get_type_hints(cls)
+        spec = []
+        for field in fields(cls):
+            hint = hints[field.name]
+            if get_origin(hint) is Union:
+                hint = next(arg for arg in get_args(hint) if arg is not type(None))
+            if get_origin(hint) in (list, List):
+                spec.append((field.name, "lista", get_args(hint)[0]))
+            elif is_dataclass(hint):
+                spec.append((field.name, "modelo", hint))
+            elif hint is str:
+                spec.append((field.name, "texto", None))
+            else:
+                spec.append((field.name, "valor", None))
+        _SPECS[cls] = spec
+    return spec
+
+def from_dict(cls: Type[T], data: Dict[str, Any]) -> T:
+    """
+    Construye un modelo a partir de un diccionario de la API, ignorando campos desconocidos.
+    Como los modelos pydantic que reemplaza, los textos vacíos en campos no textuales quedan en None.
+
+    Args:
+        cls: Modelo (dataclass)
+        data: Objeto decodificado
+
+    Returns:
+        T: Instancia del modelo
+    """
+    kwargs = {}
+    for name, kind, nested in _spec(cls):
+        value = data.get(name)
+        if value is None:
+            continue
+        if kind == "valor":
+            if value == "":
+                continue
+        elif kind == "modelo":
+            if not isinstance(value, dict):
+                continue
+            value = from_dict(nested, value)
+        elif kind == "lista":
+            # La API a veces envía un único objeto donde el esquema indica una lista
+            items = value if isinstance(value, list) else [value]
+            value = [from_dict(nested, item) for item in items if isinstance(item, dict)]
+        kwargs[name] = value
+    return cls(**kwargs)
+
+def parse(cls: Type[T], data: Any) -> Any:
+    """
+    Convierte un objeto o una lista de objetos de la API al modelo
+
+    Args:
+        cls: Modelo (dataclass)
+        data: Objeto, lista de objetos o None
+
+    Returns:
+        Any: Instancia, lista de instancias (descartando elementos que no son objetos) o None
+    """
+    if isinstance(data, list):
+        return [from_dict(cls, item) for item in data if isinstance(item, dict)]
+    if isinstance(data, dict):
+        return from_dict(cls, data)
+    return None
+
+# Decodificadores de pydantic por (modelo, lista), compilados la primera vez que se usan
+_ADAPTERS: Dict[Tuple[type, bool], Any] = {}
+
+def decode(raw: Union[bytes, str], cls: Type[T], many: bool = False) -> Any:
+    """
+    Decodifica una respuesta JSON directamente al modelo, sin diccionarios intermedios:
+    con msgspec si está instalado o, si no, con el validador compilado de pydantic. Si la
+    respuesta no respeta los tipos (p. ej. textos vacíos en campos numéricos) se usa la
+    conversión tolerante de from_dict.
+
+    Args:
+        raw: Cuerpo de la respuesta
+        cls: Modelo (dataclass)
+        many: Si la respuesta es una lista de objetos
+
+    Returns:
+        Any: Instancia o lista de instancias
+    """
+    target = List[cls] if many else cls
+    try:
+        if msgspec is not None:
+            return msgspec.json.decode(raw, type=target)
+        adapter = _ADAPTERS.get((cls, many))
+        if adapter is None:
+            adapter = _ADAPTERS[(cls, many)] = TypeAdapter(target)
+        return adapter.validate_json(raw)
+    except (ValidationError, *((msgspec.ValidationError,) if msgspec is not None else ())) as e:
+        logger.debug(f"Respuesta fuera del esquema de {cls.__name__}, se decodifica sin validar: {str(e)}")
+    return parse(cls, loads(raw))
+
+def as_model(data: Any, cls: Type[T], many: bool = False) -> Any:
+    """
+    Convierte una respuesta del cliente al modelo: si llega sin decodificar (RawJSON, dentro
+    de un bloque passthrough) se decodifica directo de los bytes con decode; si no, con parse
+
+    Args:
+        data: RawJSON, objeto o lista de objetos decodificados
+        cls: Modelo (dataclass)
+        many: Si la respuesta es una lista de objetos (solo para RawJSON)
+
+    Returns:
+        Any: Instancia, lista de instancias o None si la respuesta está vacía
+    """
+    if isinstance(data, RawJSON):
+        return decode(data, cls, many) if data.strip() else None
+    return parse(cls, data)
+
+def panel_titles(data: Any) -> List[TituloPanel]:
+    """
+    Convierte la respuesta de un panel de cotizaciones a sus filas
+
+    Args:
+        data: Panel ({"titulos": [...]}) o lista de títulos, decodificado o sin decodificar (RawJSON)
+
+    Returns:
+        List[TituloPanel]: Títulos del panel
+    """
+    if isinstance(data, RawJSON):
+        if data.lstrip().startswith(b"["):
+            return as_model(data, TituloPanel, many=True) or []
+        return (as_model(data, Panel) or Panel()).titulos or []
+    if isinstance(data, dict):
+        data = data.get("titulos", [])
+    return parse(TituloPanel, data if isinstance(data, list) else [])
+
+def to_dict(obj: Any) -> Any:
+    """Convierte modelos (y listas de modelos) a diccionarios, omitiendo los campos nulos"""
+    if isinstance(obj, list):
+        return [to_dict(item) for item in obj]
+    if not is_dataclass(obj):
+        return obj
+    result = {}
+    for name, kind, _ in _spec(type(obj)):
+        value = getattr(obj, name)
+        if value is not None:
+            result[name] = to_dict(value) if kind in ("modelo", "lista") else value
+    return result
@@ -1,13 +1,16 @@
-from typing import Dict, Any, Optional
-from fastmcp import FastMCP
+from typing import Dict, Any, Optional, List
+from fastmcp import FastMCP, Context
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from ..base_routes import BaseRoutes
+from ..batch import split_results
 from .client import NotificacionClient
+from .sync import NotificationSync
 
 class NotificacionRoutes(BaseRoutes):
     def __init__(self):
         super().__init__()
         self.client = NotificacionClient()
+        self.sync = NotificationSync(self.client)
 
     def register_tools(self, mcp: FastMCP):
         @mcp.tool(
@@ -59,4 +62,84 @@ class NotificacionRoutes(BaseRoutes):
                     "result": result
                 }
             except Exception as e:
-                return {"error": f"Error marcando notificación como leída: {str(e)}"} 
\ No newline at end of file
+                return {"error": f"Error marcando notificación como leída: {str(e)}"}
+
+        @mcp.tool(
+            name="obtener_notificaciones_nuevas",
+            description="Obtener solo las notificaciones nuevas desde la última consulta",
+            tags=["notificacion", "consulta", "incremental"]
+        )
+        async def obtener_notificaciones_nuevas(ctx: Context) -> Dict[str, Any]:
+            """
+            Sincroniza las notificaciones desde la última fecha conocida y devuelve
+            solo las que todavía no fueron entregadas a la sesión actual. La primera
+            consulta de una sesión devuelve las que están sin leer
+            """
+            try:
+                result = await self.sync.unseen(ctx.session)
+                return {
+                    "success": True,
+                    "result": result
+                }
+            except Exception as e:
+                return {"error": f"Error obteniendo notificaciones nuevas: {str(e)}"}
+
+        @mcp.tool(
+            name="marcar_notificaciones_leidas",
+            description="Marcar varias notificaciones como leídas en paralelo",
+            tags=["notificacion", "actualizar", "lote"]
+        )
+        async def marcar_notificaciones_leidas(
+            ids_notificacion: List[int] = Field(description="IDs de las notificaciones"),
+            max_concurrencia: Optional[int] = Field(default=None, description="Cantidad máxima de llamadas simultáneas")
+        ) -> Dict[str, Any]:
+            """
+            Marca varias notificaciones como leídas, omitiendo las ya marcadas
+            
+            Args:
+                ids_notificacion: IDs de las notificaciones
+                max_concurrencia: Cantidad máxima de llamadas simultáneas
+            """
+            try:
+                outcomes = await self.sync.mark_read(ids_notificacion, max_concurrency=max_concurrencia)
+                results, errors = split_results(outcomes, "id_notificacion")
+                return {
+                    "success": not errors,
+                    "result": results,
+                    "errors": errors
+                }
+            except Exception as e:
+                return {"error": f"Error marcando notificaciones como leídas: {str(e)}"}
+
+        @mcp.tool(
+            name="suscribir_notificaciones",
+            description="Recibir en la sesión las notificaciones nuevas a medida que llegan",
+            tags=["notificacion", "suscripcion"]
+        )
+        async def suscribir_notificaciones(ctx: Context) -> Dict[str, Any]:
+            """
+            Suscribe la sesión actual: las notificaciones nuevas se sincronizan en
+            segundo plano y se envían a la sesión como mensajes de log
+            """
+            try:
+                await self.sync.subscribe(ctx.session)
+                return {
+                    "success": True,
+                    "result": {"intervalo_seg": self.sync.poll_interval}
+                }
+            except Exception as e:
+                return {"error": f"Error suscribiendo a notificaciones: {str(e)}"}
+
+        @mcp.tool(
+            name="cancelar_suscripcion_notificaciones",
+            description="Dejar de recibir notificaciones nuevas en la sesión",
+            tags=["notificacion", "suscripcion"]
+        )
+        async def cancelar_suscripcion_notificaciones(ctx: Context) -> Dict[str, Any]:
+            """
+            Cancela la suscripción de la sesión actual a las notificaciones nuevas
+            """
+            return {
+                "success": True,
+                "result": self.sync.unsubscribe(ctx.session)
+            }
@@ -0,0 +1,207 @@
+from typing import Dict, Any, Optional, List, Set
+from datetime import datetime, timedelta
+import os
+import asyncio
+import logging
+import weakref
+from ..batch import run_bounded
+
+logger = logging.getLogger(__name__)
+
+ID_KEYS = ("id", "idNotificacion", "numero")
+DATE_KEYS = ("fecha", "fechaAlta", "fechaNotificacion")
+READ_KEYS = ("leida", "leido")
+
+def _notification_id(item: Dict[str, Any]) -> Optional[Any]:
+    for key in ID_KEYS:
+        if item.get(key) is not None:
+            return item[key]
+    return None
+
+def _notification_date(item: Dict[str, Any]) -> Optional[datetime]:
+    for key in DATE_KEYS:
+        if item.get(key):
+            try:
+                return datetime.fromisoformat(str(item[key])[:19])
+            except ValueError:
+                continue
+    return None
+
+def _is_read_flag(item: Dict[str, Any]) -> bool:
+    return any(item.get(key) for key in READ_KEYS)
+
+class NotificationSync:
+    """
+    Sincronización incremental de notificaciones con almacén local deduplicado por id.
+    El almacén solo conserva las notificaciones que la API puede volver a devolver
+    o que alguna sesión todavía no recibió
+    """
+
+    def __init__(self, client, poll_interval: Optional[float] = None):
+        """
+        Inicializa la sincronización de notificaciones
+
+        Args:
+            client: Cliente de notificaciones (NotificacionClient)
+            poll_interval: Segundos entre sincronizaciones mientras haya sesiones suscriptas
+        """
+        self.client = client
+        self.poll_interval = poll_interval or float(os.getenv('IOL_NOTIFICATION_POLL_INTERVAL', '60'))
+        self.store: Dict[Any, Dict[str, Any]] = {}
+        self.high_water_mark: Optional[datetime] = None
+        # Cursor de entrega por sesión MCP: ids ya entregados (o leídos al empezar a seguirla)
+        self._delivered: "weakref.WeakKeyDictionary[Any, Set[Any]]" = weakref.WeakKeyDictionary()
+        self._read: Set[Any] = set()
+        self._sessions: Set[Any] = set()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def sync(self) -> List[Dict[str, Any]]:
+        """
+        Consulta solo desde la última fecha conocida e incorpora las notificaciones nuevas al almacén
+
+        Returns:
+            List[Dict[str, Any]]: Notificaciones que no estaban en el almacén
+        """
+        async with self._lock:
+            # La API filtra por día: se vuelve a pedir el día de la marca y se deduplica por id
+            fecha_desde = self.high_water_mark.date().isoformat() if self.high_water_mark else None
+            fecha_hasta = (datetime.now() + timedelta(days=1)).date().isoformat() if fecha_desde else None
+            data = await self.client.obtener_notificaciones(fecha_desde=fecha_desde, fecha_hasta=fecha_hasta)
+            if isinstance(data, dict):
+                data = data.get("notificaciones", data.get("result", []))
+
+            new = []
+            returned = set()
+            for item in data if isinstance(data, list) else []:
+                if not isinstance(item, dict):
+                    continue
+                notification_id = _notification_id(item)
+                if notification_id is None:
+                    continue
+                returned.add(notification_id)
+                if notification_id in self.store:
+                    continue
+                self.store[notification_id] = item
+                new.append(item)
+                fecha = _notification_date(item)
+                if fecha and (self.high_water_mark is None or fecha > self.high_water_mark):
+                    self.high_water_mark = fecha
+
+            if new:
+                logger.info(f"{len(new)} notificaciones nuevas sincronizadas")
+            self._prune(returned)
+            return new
+
+    def _is_read(self, notification_id: Any) -> bool:
+        """Indica si una notificación fue marcada como leída (por la API o con mark_read)"""
+        item = self.store.get(notification_id)
+        return notification_id in self._read or (item is not None and _is_read_flag(item))
+
+    def _prune(self, returned: Set[Any]) -> None:
+        """
+        Descarta del almacén las notificaciones que la API ya no devuelve desde la marca
+        (no hacen falta para deduplicar) y que todas las sesiones vivas recibieron, o que están leídas
+        """
+        sessions = list(self._delivered.values())
+        stale = [
+            key for key in self.store
+            if key not in returned and (
+                self._is_read(key) or (sessions and all(key in delivered for delivered in sessions))
+            )
+        ]
+        for key in stale:
+            del self.store[key]
+            self._read.discard(key)
+            for delivered in sessions:
+                delivered.discard(key)
+
+    def _seed(self, session: Any) -> Set[Any]:
+        """Inicia el cursor de una sesión: se le entregan las notificaciones sincronizadas que no están leídas"""
+        delivered = self._delivered.get(session)
+        if delivered is None:
+            delivered = self._delivered[session] = {key for key in self.store if self._is_read(key)}
+        return delivered
+
+    def _pending(self, session: Any) -> List[Dict[str, Any]]:
+        """Notificaciones del almacén todavía no entregadas a la sesión, que quedan marcadas como entregadas"""
+        delivered = self._seed(session)
+        pending = [item for key, item in self.store.items() if key not in delivered]
+        delivered.update(_notification_id(item) for item in pending)
+        return pending
+
+    async def unseen(self, session: Any) -> List[Dict[str, Any]]:
+        """
+        Sincroniza y devuelve las notificaciones todavía no entregadas a la sesión
+
+        Args:
+            session: Sesión MCP que consulta. Su primera consulta devuelve las notificaciones
+                sin leer; las siguientes, solo las que llegaron desde la anterior
+
+        Returns:
+            List[Dict[str, Any]]: Notificaciones nuevas para la sesión
+        """
+        await self.sync()
+        return self._pending(session)
+
+    async def mark_read(self, ids: List[Any], max_concurrency: Optional[int] = None) -> List[tuple]:
+        """
+        Marca varias notificaciones como leídas en paralelo, omitiendo las ya marcadas
+
+        Returns:
+            List[tuple]: Tuplas (id, respuesta, error) por notificación enviada a la API
+        """
+        pending = [i for i in dict.fromkeys(ids) if i not in self._read]
+        outcomes = await run_bounded(pending, self.client.marcar_notificacion_leida, max_concurrency)
+        self._read.update(i for i, _, error in outcomes if error is None)
+        return outcomes
+
+    async def subscribe(self, session: Any) -> None:
+        """Suscribe una sesión MCP a las notificaciones nuevas; las sin leer que todavía no recibió se le envían de inmediato"""
+        if self.high_water_mark is None:
+            await self.sync()
+        self._sessions.add(session)
+        for item in self._pending(session):
+            await self._send(session, item)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._poll())
+
+    def unsubscribe(self, session: Any) -> bool:
+        """Quita la suscripción de una sesión"""
+        if session in self._sessions:
+            self._sessions.discard(session)
+            return True
+        return False
+
+    async def _poll(self) -> None:
+        # La primera sincronización solo carga el historial, sin enviarlo a las sesiones
+        if self.high_water_mark is None:
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.error(f"Error en la sincronización inicial de notificaciones: {str(e)}")
+        while self._sessions:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                new = await self.sync()
+            except Exception as e:
+                logger.error(f"Error sincronizando notificaciones: {str(e)}")
+                continue
+            for item in new:
+                await self._push(item)
+
+    async def _push(self, item: Dict[str, Any]) -> None:
+        for session in list(self._sessions):
+            await self._send(session, item)
+
+    async def _send(self, session: Any, item: Dict[str, Any]) -> None:
+        try:
+            await session.send_log_message(
+                level="info",
+                data={"evento": "notificacion_nueva", "notificacion": item},
+                logger="iol.notificaciones"
+            )
+            self._seed(session).add(_notification_id(item))
+        except Exception as e:
+            logger.debug(f"Sesión descartada de las notificaciones: {str(e)}")
+            self._sessions.discard(session)
@@ -0,0 +1,312 @@
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime
+import os
+import time
+import random
+import asyncio
+import logging
+import numpy as np
+from ..batch import run_bounded
+
+logger = logging.getLogger(__name__)
+
+DAYS_PER_YEAR = 365.0
+
+# Campos de ComisionCPDDTO que ya contienen el total de comisiones
+TOTAL_KEYS = ("total", "comisionTotal", "totalComisiones", "montoComisiones")
+# Fragmentos de nombres de campos que corresponden a componentes de la comisión
+COMPONENT_KEYS = ("comision", "arancel", "derecho", "iva", "gasto", "impuesto")
+
+def extract_commission(response: Any) -> float:
+    """
+    Obtiene el total de comisiones de una respuesta de calcular_comisiones_cpd
+
+    Args:
+        response: Objeto ComisionCPDDTO (o un número)
+
+    Returns:
+        float: Total de comisiones en pesos
+    """
+    if isinstance(response, (int, float)):
+        return float(response)
+    if not isinstance(response, dict):
+        raise ValueError(f"Respuesta de comisiones inesperada: {response!r}")
+    for key in TOTAL_KEYS:
+        if isinstance(response.get(key), (int, float)):
+            return float(response[key])
+    components = [
+        float(value) for key, value in response.items()
+        if isinstance(value, (int, float)) and any(part in key.lower() for part in COMPONENT_KEYS)
+    ]
+    if not components:
+        raise ValueError(f"No se encontraron comisiones en la respuesta: {response!r}")
+    return sum(components)
+
+def _features(importe: np.ndarray, plazo: np.ndarray, tasa: np.ndarray) -> np.ndarray:
+    """Variables del modelo: fijo, proporcional al importe, al importe por plazo y al interés"""
+    years = plazo / DAYS_PER_YEAR
+    return np.column_stack([
+        np.ones_like(importe),
+        importe,
+        importe * years,
+        importe * years * tasa / 100.0
+    ])
+
+# Cantidad de coeficientes del modelo (columnas de _features)
+N_FEATURES = 4
+
+def _diversify(combos: List[Tuple[float, int, float]]) -> List[Tuple[float, int, float]]:
+    """
+    Completa las combinaciones de calibración para que el ajuste quede determinado:
+    repite combinaciones hasta tener N_FEATURES y, si importe, plazo o tasa toman un solo
+    valor, lo varía entre muestras (calcular_comisiones_cpd acepta cualquier combinación)
+    """
+    combos = [combos[i % len(combos)] for i in range(max(len(combos), N_FEATURES))]
+    importes, plazos, tasas = (len({c[k] for c in combos}) > 1 for k in range(3))
+    return sorted({
+        (
+            i_ if importes else i_ * (1, 2)[n % 2],
+            p_ if plazos else max(1, int(p_ * (1, 2)[(n // 2) % 2])),
+            t_ if tasas else t_ * (1.0, 1.5, 0.5)[n % 3]
+        )
+        for n, (i_, p_, t_) in enumerate(combos)
+    }, key=lambda c: (c[0], c[1], c[2]))
+
+class CPDCommissionModel:
+    """Modelo local de comisiones CPD calibrado contra respuestas de calcular_comisiones_cpd"""
+
+    def __init__(self, client, samples: Optional[int] = None, verify_interval: Optional[float] = None, tolerance: Optional[float] = None):
+        """
+        Inicializa el modelo de comisiones
+
+        Args:
+            client: Cliente de operaciones (OperarClient)
+            samples: Cantidad de combinaciones consultadas a la API para calibrar
+            verify_interval: Segundos entre verificaciones contra la API
+            tolerance: Error relativo máximo aceptado antes de recalibrar
+        """
+        self.client = client
+        self.samples = samples or int(os.getenv('IOL_CPD_CALIBRATION_SAMPLES', '6'))
+        self.verify_interval = verify_interval or float(os.getenv('IOL_CPD_VERIFY_INTERVAL', '3600'))
+        self.tolerance = tolerance or float(os.getenv('IOL_CPD_TOLERANCE', '0.02'))
+        self.coefficients: Optional[np.ndarray] = None
+        self.calibrated_at: Optional[float] = None
+        self.verified_at: Optional[float] = None
+        self.last_error: Optional[float] = None
+        self.failed_at: Optional[float] = None
+        self.failure: Optional[str] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """Indica si el modelo está calibrado y puede reemplazar las consultas a la API"""
+        return self.coefficients is not None
+
+    def predict(self, importe, plazo, tasa) -> np.ndarray:
+        """Calcula las comisiones estimadas para arrays de importe, plazo (días) y tasa (% anual)"""
+        if self.coefficients is None:
+            raise ValueError("El modelo de comisiones CPD no está calibrado")
+        X = _features(np.asarray(importe, dtype=float), np.asarray(plazo, dtype=float), np.asarray(tasa, dtype=float))
+        return np.maximum(X @ self.coefficients, 0.0)
+
+    async def _sample(self, combos: List[Tuple[float, int, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        responses = await asyncio.gather(
+            *(self.client.calcular_comisiones_cpd(importe=i, plazo=p, tasa=t) for i, p, t in combos),
+            return_exceptions=True
+        )
+        rows, targets = [], []
+        for combo, response in zip(combos, responses):
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                targets.append(extract_commission(response))
+                rows.append(combo)
+            except Exception as e:
+                logger.warning(f"Muestra de comisiones CPD descartada {combo}: {str(e)}")
+        return np.array(rows, dtype=float).reshape(-1, 3), np.array(targets, dtype=float)
+
+    async def calibrate(self, combos: List[Tuple[float, int, float]]) -> bool:
+        """
+        Ajusta el modelo por mínimos cuadrados a partir de comisiones reales. El modelo
+        solo se usa si hay al menos una muestra por coeficiente, el sistema tiene rango
+        completo y el error sobre las propias muestras no supera la tolerancia
+
+        Args:
+            combos: Combinaciones (importe, plazo, tasa) candidatas; se eligen hasta `samples` distribuidas por importe y plazo
+
+        Returns:
+            bool: True si el modelo quedó calibrado
+        """
+        async with self._lock:
+            unique = sorted(set(combos), key=lambda c: (c[0], c[1]))
+            if len(unique) > self.samples:
+                step = (len(unique) - 1) / max(self.samples - 1, 1)
+                unique = [unique[round(i * step)] for i in range(self.samples)]
+            rows, targets = await self._sample(_diversify(unique))
+            self.coefficients = None
+            self.calibrated_at = self.verified_at = time.monotonic()
+            if len(targets) < N_FEATURES:
+                return self._reject(f"{len(targets)} muestras válidas, se necesitan {N_FEATURES}")
+            X = _features(rows[:, 0], rows[:, 1], rows[:, 2])
+            coefficients, _, rank, _ = np.linalg.lstsq(X, targets, rcond=None)
+            if rank < X.shape[1]:
+                return self._reject(f"las muestras no determinan el modelo (rango {rank} de {X.shape[1]})")
+            fitted = X @ coefficients
+            self.last_error = float(np.max(np.abs(fitted - targets) / np.maximum(targets, 1e-9)))
+            if self.last_error > self.tolerance:
+                return self._reject(f"error de ajuste {self.last_error:.4f} mayor a la tolerancia {self.tolerance}")
+            self.coefficients = coefficients
+            self.failed_at = self.failure = None
+            logger.info(f"Modelo de comisiones CPD calibrado con {len(targets)} muestras (error máximo {self.last_error:.4f})")
+            return True
+
+    def _reject(self, reason: str) -> bool:
+        self.failed_at = time.monotonic()
+        self.failure = reason
+        logger.warning(f"Modelo de comisiones CPD descartado, se consulta la API por cheque: {reason}")
+        return False
+
+    async def verify(self, combos: List[Tuple[float, int, float]]) -> bool:
+        """Compara una combinación al azar contra la API y recalibra si el error supera la tolerancia"""
+        rows, targets = await self._sample([random.choice(combos)])
+        self.verified_at = time.monotonic()
+        if len(targets) == 0:
+            return True
+        predicted = self.predict(rows[:, 0], rows[:, 1], rows[:, 2])
+        self.last_error = float(abs(predicted[0] - targets[0]) / max(targets[0], 1e-9))
+        if self.last_error > self.tolerance:
+            logger.warning(f"Modelo de comisiones CPD desviado (error {self.last_error:.4f}), recalibrando")
+            await self.calibrate(combos)
+            return False
+        return True
+
+    async def ensure_calibrated(self, combos: List[Tuple[float, int, float]]) -> None:
+        """Calibra el modelo si es necesario y lo verifica periódicamente; tras una calibración fallida espera verify_interval para reintentar"""
+        if self.coefficients is None:
+            if self.failed_at is None or time.monotonic() - self.failed_at >= self.verify_interval:
+                await self.calibrate(combos)
+        elif time.monotonic() - (self.verified_at or 0) >= self.verify_interval:
+            await self.verify(combos)
+
+    async def estimate(self, importe, plazo, tasa) -> np.ndarray:
+        """
+        Comisiones para arrays de importe, plazo y tasa: con el modelo si está calibrado,
+        o consultando calcular_comisiones_cpd por cada combinación (NaN si la consulta falla)
+        """
+        if self.ready:
+            return self.predict(importe, plazo, tasa)
+        combos = [
+            (float(i), max(1, int(round(p))), float(t))
+            for i, p, t in zip(np.asarray(importe), np.asarray(plazo), np.asarray(tasa))
+        ]
+        outcomes = await run_bounded(
+            combos,
+            lambda c: self.client.calcular_comisiones_cpd(importe=c[0], plazo=c[1], tasa=c[2])
+        )
+        commissions = []
+        for combo, response, error in outcomes:
+            try:
+                if error is not None:
+                    raise ValueError(error)
+                commissions.append(extract_commission(response))
+            except Exception as e:
+                logger.warning(f"Comisión CPD no disponible para {combo}: {str(e)}")
+                commissions.append(np.nan)
+        return np.array(commissions, dtype=float)
+
+    def status(self) -> Dict[str, Any]:
+        """Estado de calibración del modelo"""
+        return {
+            "calibrado": self.ready,
+            "coeficientes": self.coefficients.round(8).tolist() if self.coefficients is not None else None,
+            "error_relativo": self.last_error,
+            "motivo_sin_calibrar": self.failure
+        }
+
+def _first(item: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    for key in keys:
+        if item.get(key) not in (None, ""):
+            return item[key]
+    return None
+
+def _days_to(value: Any, now: datetime) -> Optional[float]:
+    try:
+        return max((datetime.fromisoformat(str(value)[:19]) - now).total_seconds() / 86400.0, 1.0)
+    except ValueError:
+        return None
+
+def parse_cheques(data: Any, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Normaliza la respuesta de obtener_cpd a filas con id, importe, plazo y tasa
+
+    Args:
+        data: Objeto CPDModel o lista de cheques
+        now: Fecha de referencia para calcular el plazo
+
+    Returns:
+        List[Dict[str, Any]]: Cheques con los campos necesarios para evaluarlos
+    """
+    now = now or datetime.now()
+    if isinstance(data, dict):
+        data = _first(data, ("cheques", "subastas", "items", "result")) or []
+    cheques = []
+    for item in data if isinstance(data, list) else []:
+        if not isinstance(item, dict):
+            continue
+        importe = _first(item, ("importe", "monto", "montoCheque", "valorNominal"))
+        plazo = _first(item, ("plazo", "dias", "diasAlVencimiento", "plazoDias"))
+        if plazo is None:
+            plazo = _days_to(_first(item, ("fechaPago", "fechaVencimiento", "fechaCobro")), now)
+        tasa = _first(item, ("tasa", "tasaOfrecida", "tasaSubasta", "tasaMinima"))
+        if importe is None or plazo is None:
+            continue
+        cheques.append({
+            "id_subasta": _first(item, ("idSubasta", "id", "numero")),
+            "importe": float(importe),
+            # Un cheque que vence hoy se evalúa a un día, como los plazos calculados por fecha
+            "plazo": round(max(float(plazo), 1.0), 1),
+            "tasa": float(tasa) if tasa is not None else None,
+            "emisor": _first(item, ("librador", "emisor", "firmante", "descripcion"))
+        })
+    return cheques
+
+async def screen(cheques: List[Dict[str, Any]], model: CPDCommissionModel, tasa: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Calcula en un solo paso el rendimiento neto de comisiones de todos los cheques
+
+    El precio pagado es el importe descontado a la tasa indicada; el rendimiento neto
+    es la TNA que resulta de cobrar el importe al vencimiento habiendo pagado precio más comisiones.
+
+    Args:
+        cheques: Cheques normalizados con parse_cheques
+        model: Modelo de comisiones (si no está calibrado, se consulta la API por cheque)
+        tasa: Tasa de descuento anual (%) a aplicar a todos los cheques; por defecto, la de cada cheque
+
+    Returns:
+        List[Dict[str, Any]]: Cheques ordenados por rendimiento neto descendente
+    """
+    rows = [c for c in cheques if tasa is not None or c["tasa"] is not None]
+    if not rows:
+        return []
+    importe = np.array([c["importe"] for c in rows])
+    plazo = np.array([c["plazo"] for c in rows])
+    tasas = np.full(len(rows), float(tasa)) if tasa is not None else np.array([c["tasa"] for c in rows])
+
+    years = plazo / DAYS_PER_YEAR
+    precio = importe / (1.0 + tasas / 100.0 * years)
+    comision = await model.estimate(importe, plazo, tasas)
+    costo = precio + comision
+    neta = (importe / costo - 1.0) / years * 100.0
+
+    # Los cheques cuya comisión no se pudo obtener (o sin plazo ni importe) quedan fuera del ranking
+    order = [i for i in np.argsort(-neta) if np.isfinite(neta[i])]
+    return [
+        {
+            **rows[i],
+            "tasa_aplicada": round(float(tasas[i]), 4),
+            "precio": round(float(precio[i]), 2),
+            "comision_estimada": round(float(comision[i]), 2),
+            "tna_neta": round(float(neta[i]), 4)
+        }
+        for i in order
+    ]
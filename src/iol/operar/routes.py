@@ -4,6 +4,7 @@ from fastmcp import FastMCP
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from ..base_routes import BaseRoutes
 from .client import OperarClient
+from .cpd import CPDCommissionModel, parse_cheques, screen
 
 class ComprarDetalleModel(BaseModel):
     """Modelo para el detalle de una operación de compra"""
@@ -175,6 +176,7 @@ class OperarRoutes(BaseRoutes):
     def __init__(self):
         super().__init__()
         self.client = OperarClient()
+        self.comisiones_cpd = CPDCommissionModel(self.client)
 
     def register_tools(self, mcp: FastMCP):
         @mcp.tool(
@@ -465,6 +467,52 @@ class OperarRoutes(BaseRoutes):
                 }
             except Exception as e:
                 return {"error": f"Error calculando comisiones CPD: {str(e)}"}
+
+        @mcp.tool(
+            name="evaluar_cpd",
+            description="Rankear los cheques de pago diferido disponibles por rendimiento neto de comisiones",
+            tags=["operar", "cpd", "comisiones", "analisis"]
+        )
+        async def evaluar_cpd(
+            estado: str = Field(description="Estado de los cheques"),
+            segmento: str = Field(description="Segmento de los cheques"),
+            tasa: Optional[float] = Field(default=None, description="Tasa de descuento anual (%) a evaluar; por defecto, la de cada cheque"),
+            limite: int = Field(default=20, description="Cantidad máxima de cheques a devolver")
+        ) -> Dict[str, Any]:
+            """
+            Evalúa todos los cheques de una página de CPD en un solo paso. Las comisiones
+            se estiman con un modelo local calibrado contra calcular_comisiones_cpd y
+            verificado periódicamente, en lugar de consultar la API por cada cheque.
+            
+            Args:
+                estado: Estado de los cheques
+                segmento: Segmento de los cheques
+                tasa: Tasa de descuento anual a evaluar (opcional)
+                limite: Cantidad máxima de cheques a devolver
+                
+            Returns:
+                Dict[str, Any]: Cheques ordenados por TNA neta de comisiones
+            """
+            try:
+                cheques = parse_cheques(await self.client.obtener_cpd(estado=estado, segmento=segmento))
+                combos = [
+                    (c["importe"], max(1, int(round(c["plazo"]))), tasa if tasa is not None else c["tasa"])
+                    for c in cheques if tasa is not None or c["tasa"] is not None
+                ]
+                if not combos:
+                    return {"success": True, "result": {"cheques": [], "total": 0}}
+                await self.comisiones_cpd.ensure_calibrated(combos)
+                ranked = await screen(cheques, self.comisiones_cpd, tasa=tasa)
+                return {
+                    "success": True,
+                    "result": {
+                        "cheques": ranked[:limite],
+                        "total": len(ranked),
+                        "modelo_comisiones": self.comisiones_cpd.status()
+                    }
+                }
+            except Exception as e:
+                return {"error": f"Error evaluando CPD: {str(e)}"}
                 
         @mcp.tool(
             name="operar_cpd",
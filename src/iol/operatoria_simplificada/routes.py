@@ -4,62 +4,6 @@ from pydantic import BaseModel, Field, field_validator, ConfigDict
 from ..base_routes import BaseRoutes
 from .client import OperatoriaSimplificadaClient
 
-class MontosEstimadosDTO(BaseModel):
-    """Modelo para representar montos estimados según el swagger"""
-    # Aquí se definirían los campos específicos de MontosEstimadosDTO
-    # pero no se proporcionan en la especificación del swagger
-    
-    model_config = ConfigDict(extra="ignore", validate_assignment=True)
-    
-    @field_validator('*', mode='before')
-    @classmethod
-    def empty_str_to_none(cls, v):
-        if v == "":
-            return None
-        return v
-
-class ParametrosMepSimpleDTO(BaseModel):
-    """Modelo para representar parámetros de operatoria MEP simple según el swagger"""
-    # Aquí se definirían los campos específicos de ParametrosMepSimpleDTO
-    # pero no se proporcionan en la especificación del swagger
-    
-    model_config = ConfigDict(extra="ignore", validate_assignment=True)
-    
-    @field_validator('*', mode='before')
-    @classmethod
-    def empty_str_to_none(cls, v):
-        if v == "":
-            return None
-        return v
-
-class ResponseModel(BaseModel):
-    """Modelo para representar la respuesta de validación según el swagger"""
-    # Aquí se definirían los campos específicos de ResponseModel
-    # pero no se proporcionan en la especificación del swagger
-    
-    model_config = ConfigDict(extra="ignore", validate_assignment=True)
-    
-    @field_validator('*', mode='before')
-    @classmethod
-    def empty_str_to_none(cls, v):
-        if v == "":
-            return None
-        return v
-
-class MontosEstimadosVentaMepDTO(BaseModel):
-    """Modelo para representar montos estimados de venta MEP según el swagger"""
-    # Aquí se definirían los campos específicos de MontosEstimadosVentaMepDTO
-    # pero no se proporcionan en la especificación del swagger
-    
-    model_config = ConfigDict(extra="ignore", validate_assignment=True)
-    
-    @field_validator('*', mode='before')
-    @classmethod
-    def empty_str_to_none(cls, v):
-        if v == "":
-            return None
-        return v
-
 class CotizacionMepOperatoriaSimplificadaModel(BaseModel):
     """Modelo para representar una cotización MEP para operatoria simplificada según el swagger"""
     simbolo: str = Field(description="Símbolo del título")
@@ -1,23 +1,8 @@
 from typing import Dict, Any, Optional, List
 from fastmcp import FastMCP
-from pydantic import BaseModel, Field, field_validator, ConfigDict
 from ..base_routes import BaseRoutes
 from .client import PerfilClient
 
-class PerfilClienteModel(BaseModel):
-    """Modelo para representar el perfil del cliente según el swagger"""
-    # Aquí se definirían los campos específicos de PerfilClienteModel
-    # pero no se proporcionan en la especificación del swagger
-    
-    model_config = ConfigDict(extra="ignore", validate_assignment=True)
-    
-    @field_validator('*', mode='before')
-    @classmethod
-    def empty_str_to_none(cls, v):
-        if v == "":
-            return None
-        return v
-
 class PerfilRoutes(BaseRoutes):
     def __init__(self):
         super().__init__()
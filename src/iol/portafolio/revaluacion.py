@@ -0,0 +1,222 @@
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime
+import re
+import logging
+import numpy as np
+from ..cache import response_cache
+from ..market_calendar import market_calendar
+from ..batch import run_bounded
+from ..models import Portafolio, Posicion, Titulo, RawJSON, as_model, parse, panel_titles
+
+logger = logging.getLogger(__name__)
+
+# Tipos de instrumento que cotizan cada 100 nominales
+PER_100_TYPES = ("titulospublicos", "obligacionesnegociables", "letras", "bonos", "obligaciones")
+
+# Plazo con el que cotiza la API cuando la consulta o la posición no lo indican
+DEFAULT_PLAZO = "t1"
+
+QUOTE_ENDPOINT_RE = re.compile(
+    r"^/api/v2/[^/]+/titulos/(?P<simbolo>[^/]+)/(cotizacion|cotizaciondetallemobile/(?P<plazo>[^/]+))$",
+    re.IGNORECASE
+)
+
+# Clave de un precio: (simbolo, mercado, plazo)
+PriceKey = Tuple[str, str, str]
+
+def price_key(simbolo: str, mercado: Optional[str], plazo: Optional[str]) -> PriceKey:
+    """Normaliza la clave de un precio: el mismo símbolo cotiza distinto según mercado (y moneda) y plazo"""
+    return simbolo.upper(), (mercado or "").lower(), (plazo or DEFAULT_PLAZO).lower()
+
+def parse_positions(data: Any) -> List[Dict[str, Any]]:
+    """
+    Normaliza la respuesta de obtener_portafolio a una fila por posición
+
+    Args:
+        data: Objeto portafolio ({"activos": [...]}) o lista de activos, decodificado o sin decodificar (RawJSON)
+
+    Returns:
+        List[Dict[str, Any]]: Posiciones con símbolo, mercado, cantidad, PPC y precio del portafolio
+    """
+    if isinstance(data, RawJSON):
+        # Se decodifica directo a los modelos, sin diccionarios intermedios
+        if data.lstrip().startswith(b"["):
+            activos = as_model(data, Posicion, many=True) or []
+        else:
+            activos = (as_model(data, Portafolio) or Portafolio()).activos or []
+    else:
+        if isinstance(data, dict):
+            data = data.get("activos", data.get("result", []))
+        activos = parse(Posicion, data if isinstance(data, list) else [])
+    positions = []
+    for activo in activos:
+        titulo = activo.titulo or Titulo()
+        simbolo = titulo.simbolo or activo.simbolo
+        if not simbolo or not activo.cantidad:
+            continue
+        cantidad = float(activo.cantidad)
+        precio = float(activo.ultimoPrecio or 0)
+        if activo.valorizado and precio:
+            # Bonos y ON cotizan cada 100 nominales: el factor sale del valorizado del portafolio
+            factor = 0.01 if abs(float(activo.valorizado) / (cantidad * precio) - 0.01) < 0.005 else 1.0
+        else:
+            tipo = (titulo.tipo or "").replace(" ", "").lower()
+            factor = 0.01 if tipo.startswith(PER_100_TYPES) else 1.0
+        positions.append({
+            "simbolo": simbolo.upper(),
+            "mercado": titulo.mercado or "bCBA",
+            "plazo": (titulo.plazo or DEFAULT_PLAZO).lower(),
+            "descripcion": titulo.descripcion,
+            "moneda": titulo.moneda or "peso_Argentino",
+            "cantidad": cantidad,
+            "ppc": float(activo.ppc or 0),
+            "precio_portafolio": precio,
+            "factor": factor
+        })
+    return positions
+
+def _price_of(value: Any) -> Optional[float]:
+    """Último precio de una cotización o fila de panel (diccionario o modelo), si es positivo"""
+    price = value.get("ultimoPrecio") if isinstance(value, dict) else getattr(value, "ultimoPrecio", None)
+    if isinstance(price, (int, float)) and price > 0:
+        return float(price)
+    return None
+
+async def cached_prices(account: Optional[str]) -> Dict[PriceKey, Tuple[float, float, str]]:
+    """
+    Reúne los precios vigentes en la caché de lecturas: cotizaciones individuales y paneles,
+    incluidos los que guardaron otros workers
+
+    Returns:
+        Dict[PriceKey, Tuple[float, float, str]]: (simbolo, mercado, plazo) -> (precio, fecha de la respuesta, fuente)
+    """
+    prices: Dict[PriceKey, Tuple[float, float, str]] = {}
+
+    def _offer(key: PriceKey, price: Optional[float], stored_at: float, source: str) -> None:
+        if price is not None and (key not in prices or stored_at > prices[key][1]):
+            prices[key] = (price, stored_at, source)
+
+    for key, entry in await response_cache.fresh_entries(account, ("cotizacion", "panel")):
+        found = response_cache.policy_for(key[1])
+        if found is None:
+            continue
+        groups = found[1].groupdict()
+        if entry.group == "cotizacion":
+            match = QUOTE_ENDPOINT_RE.match(key[1])
+            if match:
+                # El plazo va en la ruta (detalle mobile) o en los parámetros (cotización)
+                plazo = match.group("plazo") or dict(key[2]).get("model.plazo")
+                _offer(price_key(match.group("simbolo"), groups.get("mercado"), plazo),
+                       _price_of(entry.value), entry.stored_at, "cotizacion")
+            continue
+        # Los paneles de Estados Unidos mezclan mercados: sin el campo mercado solo se asume el de Argentina
+        mercado_pais = market_calendar.resolve(None, groups.get("pais"))
+        mercado_pais = mercado_pais if mercado_pais == "bcba" else None
+        # Los paneles se decodifican directo de los bytes cacheados a TituloPanel
+        for item in panel_titles(entry.raw if entry.raw is not None else entry.value):
+            mercado = item.mercado or mercado_pais
+            if item.simbolo and mercado:
+                _offer(price_key(item.simbolo, mercado, item.plazo), _price_of(item), entry.stored_at, "panel")
+    return prices
+
+async def revalue(
+    positions: List[Dict[str, Any]],
+    titulos_client,
+    account: Optional[str],
+    dolar: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Revalúa las posiciones con los precios cacheados y consulta la API solo por los faltantes
+
+    Args:
+        positions: Posiciones normalizadas con parse_positions
+        titulos_client: Cliente de títulos (TitulosClient) para las cotizaciones faltantes
+        account: Cuenta de la caché de lecturas
+        dolar: Pesos por dólar para sumar posiciones en dólares a los totales y pesos (None: se suman por moneda)
+
+    Returns:
+        Dict[str, Any]: Posiciones con valor, resultado y peso, totales y fuentes de los precios
+    """
+    if not positions:
+        return {"posiciones": [], "totales": {}, "fuentes": {}}
+
+    prices = await cached_prices(account)
+    keys = [price_key(p["simbolo"], p["mercado"], p["plazo"]) for p in positions]
+    missing = [(key, p) for key, p in zip(keys, positions) if key not in prices]
+    if missing:
+        outcomes = await run_bounded(
+            missing,
+            lambda item: titulos_client.obtener_cotizacion(
+                simbolo=item[1]["simbolo"], mercado=item[1]["mercado"], plazo=item[1]["plazo"]
+            )
+        )
+        for (key, position), result, error in outcomes:
+            price = _price_of(result) if error is None else None
+            if price is not None:
+                prices[key] = (price, datetime.now().timestamp(), "api")
+            else:
+                logger.warning(f"Sin cotización para {position['simbolo']}, se usa el precio del portafolio: {error}")
+
+    sources = []
+    for key, p in zip(keys, positions):
+        if key in prices:
+            sources.append(prices[key])
+        else:
+            sources.append((p["precio_portafolio"], None, "portafolio"))
+
+    cantidad = np.array([p["cantidad"] for p in positions])
+    factor = np.array([p["factor"] for p in positions])
+    ppc = np.array([p["ppc"] for p in positions])
+    precio = np.array([s[0] for s in sources], dtype=float)
+    dolares = np.array(["dolar" in p["moneda"].lower() for p in positions])
+
+    valor = cantidad * precio * factor
+    costo = cantidad * ppc * factor
+    resultado = valor - costo
+    with np.errstate(divide="ignore", invalid="ignore"):
+        resultado_pct = np.where(costo > 0, resultado / costo * 100.0, np.nan)
+
+    if dolar:
+        valor_base = np.where(dolares, valor * dolar, valor)
+        peso = valor_base / valor_base.sum() * 100.0 if valor_base.sum() else np.zeros_like(valor)
+    else:
+        # Sin tipo de cambio los pesos se calculan dentro de cada moneda
+        peso = np.zeros_like(valor)
+        for mask in (dolares, ~dolares):
+            total = valor[mask].sum()
+            if total:
+                peso[mask] = valor[mask] / total * 100.0
+
+    rows = []
+    for i, p in enumerate(positions):
+        rows.append({
+            "simbolo": p["simbolo"],
+            "descripcion": p["descripcion"],
+            "moneda": p["moneda"],
+            "cantidad": p["cantidad"],
+            "precio": round(float(precio[i]), 4),
+            "fuente_precio": sources[i][2],
+            "fecha_precio": datetime.fromtimestamp(sources[i][1]).isoformat(timespec="seconds") if sources[i][1] else None,
+            "valor": round(float(valor[i]), 2),
+            "resultado": round(float(resultado[i]), 2),
+            "resultado_porcentaje": round(float(resultado_pct[i]), 2) if not np.isnan(resultado_pct[i]) else None,
+            "peso": round(float(peso[i]), 2)
+        })
+    rows.sort(key=lambda row: -row["peso"])
+
+    totales = {}
+    for moneda, mask in (("dolar_Estadounidense", dolares), ("peso_Argentino", ~dolares)):
+        if mask.any():
+            totales[moneda] = {
+                "valor": round(float(valor[mask].sum()), 2),
+                "costo": round(float(costo[mask].sum()), 2),
+                "resultado": round(float(resultado[mask].sum()), 2)
+            }
+    if dolar:
+        totales["total_en_pesos"] = round(float(np.where(dolares, valor * dolar, valor).sum()), 2)
+        totales["dolar_mep"] = dolar
+
+    fuentes: Dict[str, int] = {}
+    for source in sources:
+        fuentes[source[2]] = fuentes.get(source[2], 0) + 1
+    return {"posiciones": rows, "totales": totales, "fuentes": fuentes}
@@ -2,18 +2,24 @@ from typing import Dict, Any, Optional
 from fastmcp import FastMCP
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from ..base_routes import BaseRoutes
+from ..http_client import passthrough
 from .client import PortafolioClient
+from .revaluacion import parse_positions, revalue
+from ..titulos.client import TitulosClient
+from ..titulos.cambio import get_exchange_rate_service
 
 class PortafolioRoutes(BaseRoutes):
     def __init__(self):
         super().__init__()
         self.client = PortafolioClient()
+        self.titulos = TitulosClient()
 
     def register_tools(self, mcp: FastMCP):
         @mcp.tool(
             name="obtener_portafolio",
             description="Obtener portafolio del usuario",
-            tags=["portafolio"]
+            tags=["portafolio"],
+            output_schema=None
         )
         async def obtener_portafolio(
             pais: Optional[str] = Field(default=None, description="País del portafolio (argentina, estados_unidos, etc)")
@@ -25,18 +31,15 @@ class PortafolioRoutes(BaseRoutes):
                 pais: País del portafolio (argentina, estados_unidos, etc)
             """
             try:
-                result = await self.client.obtener_portafolio(pais=pais)
-                return {
-                    "success": True,
-                    "result": result
-                }
+                return await self.passthrough_response(self.client.obtener_portafolio(pais=pais))
             except Exception as e:
                 return {"error": f"Error obteniendo portafolio: {str(e)}"}
 
         @mcp.tool(
             name="obtener_operaciones",
             description="Obtener operaciones del usuario",
-            tags=["portafolio", "operaciones"]
+            tags=["portafolio", "operaciones"],
+            output_schema=None
         )
         async def obtener_operaciones(
             pais: Optional[str] = Field(default=None, description="País de las operaciones (argentina, estados_unidos, etc)"),
@@ -54,23 +57,20 @@ class PortafolioRoutes(BaseRoutes):
                 fecha_hasta: Fecha de fin en formato YYYY-MM-DD
             """
             try:
-                result = await self.client.obtener_operaciones(
+                return await self.passthrough_response(self.client.obtener_operaciones(
                     pais=pais,
                     estado=estado,
                     fecha_desde=fecha_desde,
                     fecha_hasta=fecha_hasta
-                )
-                return {
-                    "success": True,
-                    "result": result
-                }
+                ))
             except Exception as e:
                 return {"error": f"Error obteniendo operaciones: {str(e)}"}
                 
         @mcp.tool(
             name="obtener_portafolio_valorizado",
             description="Obtener portafolio valorizado del usuario",
-            tags=["portafolio", "valorizado"]
+            tags=["portafolio", "valorizado"],
+            output_schema=None
         )
         async def obtener_portafolio_valorizado(
             pais: Optional[str] = Field(default=None, description="País del portafolio (argentina, estados_unidos, etc)")
@@ -82,18 +82,15 @@ class PortafolioRoutes(BaseRoutes):
                 pais: País del portafolio (argentina, estados_unidos, etc)
             """
             try:
-                result = await self.client.obtener_portafolio_valorizado(pais=pais)
-                return {
-                    "success": True,
-                    "result": result
-                }
+                return await self.passthrough_response(self.client.obtener_portafolio_valorizado(pais=pais))
             except Exception as e:
                 return {"error": f"Error obteniendo portafolio valorizado: {str(e)}"}
                 
         @mcp.tool(
             name="obtener_rendimiento_historico",
             description="Obtener rendimiento histórico del portafolio",
-            tags=["portafolio", "rendimiento"]
+            tags=["portafolio", "rendimiento"],
+            output_schema=None
         )
         async def obtener_rendimiento_historico(
             pais: Optional[str] = Field(default=None, description="País del portafolio (argentina, estados_unidos, etc)")
@@ -105,18 +102,15 @@ class PortafolioRoutes(BaseRoutes):
                 pais: País del portafolio (argentina, estados_unidos, etc)
             """
             try:
-                result = await self.client.obtener_rendimiento_historico(pais=pais)
-                return {
-                    "success": True,
-                    "result": result
-                }
+                return await self.passthrough_response(self.client.obtener_rendimiento_historico(pais=pais))
             except Exception as e:
                 return {"error": f"Error obteniendo rendimiento histórico: {str(e)}"}
                 
         @mcp.tool(
             name="obtener_composicion_portafolio",
             description="Obtener composición del portafolio por tipo de instrumento",
-            tags=["portafolio", "composicion"]
+            tags=["portafolio", "composicion"],
+            output_schema=None
         )
         async def obtener_composicion_portafolio(
             pais: Optional[str] = Field(default=None, description="País del portafolio (argentina, estados_unidos, etc)")
@@ -128,10 +122,37 @@ class PortafolioRoutes(BaseRoutes):
                 pais: País del portafolio (argentina, estados_unidos, etc)
             """
             try:
-                result = await self.client.obtener_composicion_portafolio(pais=pais)
-                return {
-                    "success": True,
-                    "result": result
-                }
+                return await self.passthrough_response(self.client.obtener_composicion_portafolio(pais=pais))
             except Exception as e:
-                return {"error": f"Error obteniendo composición del portafolio: {str(e)}"} 
\ No newline at end of file
+                return {"error": f"Error obteniendo composición del portafolio: {str(e)}"}
+
+        @mcp.tool(
+            name="revaluar_portafolio",
+            description="Revalúa el portafolio localmente con las cotizaciones y paneles cacheados, consultando la API solo por los títulos sin precio vigente",
+            tags=["portafolio", "valorizacion"]
+        )
+        async def revaluar_portafolio(
+            pais: str = Field(default="argentina", description="País del portafolio (argentina, estados_unidos)"),
+            convertir_dolares: bool = Field(default=True, description="Sumar las posiciones en dólares a los totales y pesos al dólar MEP")
+        ) -> Dict[str, Any]:
+            """
+            Revalúa el portafolio sin pedir el valorizado a la API: toma las posiciones del
+            portafolio cacheado y los precios más recientes de la caché de cotizaciones y paneles
+            (con varios workers, del almacén compartido)
+            
+            Args:
+                pais: País del portafolio
+                convertir_dolares: Si se convierten las posiciones en dólares con el MEP cacheado
+            """
+            try:
+                # Las posiciones se decodifican directo de la respuesta (cacheada) sin pasar por diccionarios
+                with passthrough():
+                    data = await self.client.obtener_portafolio(pais=pais)
+                positions = parse_positions(data)
+                dolar = None
+                if convertir_dolares and any("dolar" in p["moneda"].lower() for p in positions):
+                    dolar = await get_exchange_rate_service().get_rate("mep")
+                result = await revalue(positions, self.titulos, self.client.username, dolar=dolar)
+                return self.success_response(result)
+            except Exception as e:
+                return {"error": f"Error revaluando portafolio: {str(e)}"}
@@ -0,0 +1,173 @@
+from typing import Dict, Any, Optional, Iterable, List, Tuple, Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
+import json
+import sqlite3
+import asyncio
+import logging
+from .models import RawJSON
+
+logger = logging.getLogger(__name__)
+
+# Archivo SQLite compartido por los workers; el supervisor lo define para sus procesos hijos
+SHARED_STATE_FILE = os.getenv('IOL_SHARED_STATE_FILE')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    account TEXT,
+    grp TEXT NOT NULL,
+    country TEXT,
+    value TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    ttl REAL NOT NULL,
+    swr_window REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    size INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS cache_account_grp ON cache (account, grp);
+CREATE INDEX IF NOT EXISTS cache_stored_at ON cache (stored_at);
+"""
+
+# Columnas agregadas después de la primera versión del esquema, para migrar archivos existentes
+_ADDED_COLUMNS = {
+    "etag": "TEXT",
+    "last_modified": "TEXT",
+    "size": "INTEGER NOT NULL DEFAULT 0"
+}
+
+# Columnas de una entrada, en el orden que espera _entry
+_ENTRY_COLUMNS = "account, grp, country, value, stored_at, ttl, swr_window, etag, last_modified, size"
+
+def _entry(row: Tuple) -> Dict[str, Any]:
+    """Convierte una fila de _ENTRY_COLUMNS en los argumentos de CacheEntry, con el valor sin decodificar (RawJSON)"""
+    account, group, country, value, stored_at, ttl, swr_window, etag, last_modified, size = row
+    return {
+        "value": RawJSON(value.encode()),
+        "group": group,
+        "account": account,
+        "country": country,
+        "stored_at": stored_at,
+        "ttl": ttl,
+        "swr_window": swr_window,
+        "etag": etag,
+        "last_modified": last_modified,
+        "size": size
+    }
+
+def encode_key(key: Tuple) -> str:
+    """Serializa una clave de caché para usarla como clave primaria"""
+    return json.dumps(key, default=str, separators=(",", ":"))
+
+def decode_key(raw: str) -> Tuple:
+    """Reconstruye una clave de caché (cuenta, endpoint, parámetros) serializada con encode_key"""
+    account, endpoint, params = json.loads(raw)
+    return account, endpoint, tuple(tuple(pair) for pair in params)
+
+class SharedCacheBackend:
+    """
+    Respuestas cacheadas en SQLite (WAL), visibles para todos los workers del servidor.
+    La conexión se usa solo desde un hilo propio, para no bloquear el event loop: las
+    lecturas se esperan con run() y las escrituras se encolan con submit(). El hilo
+    procesa las operaciones en orden, por lo que una lectura ve las escrituras encoladas antes.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        """
+        Inicializa el almacén compartido
+
+        Args:
+            path: Archivo SQLite
+            max_entries: Cantidad máxima de entradas antes de descartar las más antiguas
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._writes = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="iol-shared-state")
+        self._db = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(cache)")}
+        for name, definition in _ADDED_COLUMNS.items():
+            if name not in columns:
+                self._db.execute(f"ALTER TABLE cache ADD COLUMN {name} {definition}")
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Ejecuta una operación del almacén en su hilo y espera el resultado sin bloquear el event loop"""
+        return await asyncio.wrap_future(self._executor.submit(func, *args))
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> None:
+        """Encola una escritura en el hilo del almacén sin esperarla; los errores se registran en el log"""
+        self._executor.submit(func, *args).add_done_callback(_log_failure)
+
+    def version(self, key: Tuple) -> Optional[float]:
+        """Devuelve la fecha de la entrada compartida (None si no existe), sin leer el valor"""
+        row = self._db.execute("SELECT stored_at FROM cache WHERE key = ?", (encode_key(key),)).fetchone()
+        return row[0] if row else None
+
+    def load(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Devuelve la entrada compartida, con su valor como JSON sin decodificar (RawJSON)"""
+        row = self._db.execute(
+            f"SELECT {_ENTRY_COLUMNS} FROM cache WHERE key = ?",
+            (encode_key(key),)
+        ).fetchone()
+        return _entry(row) if row is not None else None
+
+    def fresh(self, account: Optional[str], groups: Iterable[str], now: float) -> List[Tuple[Tuple, Dict[str, Any]]]:
+        """Devuelve las entradas vigentes de una cuenta en los grupos indicados, guardadas por cualquier worker"""
+        groups = list(groups)
+        placeholders = ",".join("?" for _ in groups)
+        rows = self._db.execute(
+            f"SELECT key, {_ENTRY_COLUMNS} FROM cache "
+            f"WHERE account IS ? AND grp IN ({placeholders}) AND stored_at + ttl > ?",
+            (account, *groups, now)
+        ).fetchall()
+        return [(decode_key(row[0]), _entry(row[1:])) for row in rows]
+
+    def put(self, key: Tuple, value: Any, group: str, account: Optional[str], country: Optional[str],
+            stored_at: float, ttl: float, swr_window: float, etag: Optional[str] = None,
+            last_modified: Optional[str] = None, size: int = 0) -> None:
+        """Guarda o reemplaza una entrada (value decodificado o RawJSON) y descarta periódicamente las más antiguas"""
+        self._db.execute(
+            "INSERT OR REPLACE INTO cache (key, account, grp, country, value, stored_at, ttl, swr_window, "
+            "etag, last_modified, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (encode_key(key), account, group, country, value.decode() if isinstance(value, RawJSON) else json.dumps(value), stored_at, ttl, swr_window,
+             etag, last_modified, size)
+        )
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self._db.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def delete(self, account: Optional[str], groups: Iterable[str], country: Optional[str] = None) -> int:
+        """Elimina las entradas de una cuenta y grupos (mismo criterio que ResponseCache.invalidate)"""
+        groups = list(groups)
+        placeholders = ",".join("?" for _ in groups)
+        sql = f"DELETE FROM cache WHERE account IS ? AND grp IN ({placeholders})"
+        args = [account, *groups]
+        if country is not None:
+            sql += " AND (country IS NULL OR country = ?)"
+            args.append(country)
+        return self._db.execute(sql, args).rowcount
+
+    def clear(self) -> None:
+        """Vacía el almacén compartido"""
+        self._db.execute("DELETE FROM cache")
+
+def _log_failure(future: Future) -> None:
+    if future.exception() is not None:
+        logger.warning(f"Error escribiendo en el estado compartido: {str(future.exception())}")
+
+def get_shared_backend(max_entries: int) -> Optional[SharedCacheBackend]:
+    """Devuelve el almacén compartido si el proceso corre como worker (IOL_SHARED_STATE_FILE definido)"""
+    if not SHARED_STATE_FILE:
+        return None
+    try:
+        return SharedCacheBackend(SHARED_STATE_FILE, max_entries)
+    except sqlite3.Error as e:
+        logger.warning(f"No se pudo abrir el estado compartido {SHARED_STATE_FILE}: {str(e)}")
+        return None
@@ -0,0 +1,163 @@
+from typing import Dict, Any, Optional, List, Callable
+import re
+import time
+import asyncio
+import logging
+import itertools
+import multiprocessing
+import aiohttp
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# Id de sesión en el evento "endpoint" del transporte SSE (/messages/?session_id=...)
+SSE_SESSION_RE = re.compile(rb"session_id=([0-9a-fA-F-]+)")
+SESSION_HEADER = "mcp-session-id"
+
+# Headers que no se reenvían entre cliente, supervisor y worker
+HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te",
+    "trailers", "transfer-encoding", "upgrade", "host", "content-length"
+}
+
+class Worker:
+    """Proceso worker escuchando en un puerto local"""
+
+    def __init__(self, index: int, port: int):
+        self.index = index
+        self.port = port
+        self.process: Optional[multiprocessing.Process] = None
+        self.restarts = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+class Supervisor:
+    """
+    Lanza varios workers del servidor MCP y reparte las conexiones entre ellos,
+    manteniendo cada sesión (SSE o streamable HTTP) en el worker que la creó
+    """
+
+    def __init__(self, target: Callable, workers: int, base_port: int, check_interval: float = 1.0):
+        """
+        Inicializa el supervisor
+
+        Args:
+            target: Función de nivel de módulo que ejecuta un worker, llamada como target(port)
+            workers: Cantidad de procesos worker
+            base_port: Los workers escuchan en 127.0.0.1 desde base_port + 1
+            check_interval: Segundos entre verificaciones de procesos caídos
+        """
+        self.target = target
+        self.workers = [Worker(i, base_port + 1 + i) for i in range(workers)]
+        self.check_interval = check_interval
+        self.sessions: Dict[str, Worker] = {}
+        self._next = itertools.cycle(self.workers)
+        self._context = multiprocessing.get_context("spawn")
+        self._http: Optional[aiohttp.ClientSession] = None
+
+    def _start(self, worker: Worker) -> None:
+        worker.process = self._context.Process(
+            target=self.target, args=(worker.port,), name=f"iol-worker-{worker.index}", daemon=True
+        )
+        worker.process.start()
+        logger.info(f"Worker {worker.index} iniciado en el puerto {worker.port} (pid {worker.process.pid})")
+
+    async def _monitor(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            for worker in self.workers:
+                if not worker.alive:
+                    worker.restarts += 1
+                    logger.warning(f"Worker {worker.index} terminó (código {worker.process.exitcode}), reiniciando")
+                    self.sessions = {sid: w for sid, w in self.sessions.items() if w is not worker}
+                    self._start(worker)
+
+    def _pick(self, request: web.Request) -> Worker:
+        session_id = request.query.get("session_id") or request.headers.get(SESSION_HEADER)
+        if session_id and session_id in self.sessions:
+            return self.sessions[session_id]
+        for _ in self.workers:
+            worker = next(self._next)
+            if worker.alive:
+                return worker
+        return next(self._next)
+
+    async def proxy(self, request: web.Request) -> web.StreamResponse:
+        """Reenvía la petición al worker de la sesión y transmite la respuesta sin acumularla"""
+        worker = self._pick(request)
+        url = f"http://127.0.0.1:{worker.port}{request.rel_url}"
+        headers = {k: v for k, v in request.headers.items() if k.lower() not in HOP_HEADERS}
+        body = await request.read()
+        try:
+            upstream = await self._http.request(
+                request.method, url, headers=headers, data=body or None, allow_redirects=False
+            )
+        except aiohttp.ClientError as e:
+            logger.warning(f"Worker {worker.index} no disponible: {str(e)}")
+            return web.json_response({"error": "Worker no disponible"}, status=503)
+
+        session_ids: List[str] = []
+        try:
+            response = web.StreamResponse(
+                status=upstream.status,
+                headers={k: v for k, v in upstream.headers.items() if k.lower() not in HOP_HEADERS}
+            )
+            if upstream.headers.get(SESSION_HEADER):
+                session_ids.append(upstream.headers[SESSION_HEADER])
+                self.sessions[session_ids[-1]] = worker
+            await response.prepare(request)
+            sse = upstream.headers.get("Content-Type", "").startswith("text/event-stream")
+            async for chunk in upstream.content.iter_any():
+                if sse and request.method == "GET" and not session_ids:
+                    match = SSE_SESSION_RE.search(chunk)
+                    if match:
+                        session_ids.append(match.group(1).decode())
+                        self.sessions[session_ids[-1]] = worker
+                await response.write(chunk)
+            await response.write_eof()
+            return response
+        finally:
+            upstream.release()
+            # Al cerrarse el stream SSE la sesión termina; las de streamable HTTP terminan con DELETE
+            if request.method == "GET" and session_ids and not upstream.headers.get(SESSION_HEADER):
+                self.sessions.pop(session_ids[0], None)
+            if request.method == "DELETE" and request.headers.get(SESSION_HEADER):
+                self.sessions.pop(request.headers[SESSION_HEADER], None)
+
+    def status(self) -> Dict[str, Any]:
+        """Estado de los workers y de las sesiones asignadas"""
+        return {
+            "workers": [
+                {"indice": w.index, "puerto": w.port, "vivo": w.alive, "reinicios": w.restarts}
+                for w in self.workers
+            ],
+            "sesiones": len(self.sessions)
+        }
+
+    async def run(self, host: str, port: int) -> None:
+        """Inicia los workers y el proxy con afinidad de sesión hasta que se cancele"""
+        for worker in self.workers:
+            self._start(worker)
+        self._http = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=None, sock_connect=5))
+        app = web.Application(client_max_size=16 * 1024 * 1024)
+        app.router.add_route("*", "/{tail:.*}", self.proxy)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        logger.info(f"Supervisor escuchando en {host}:{port} con {len(self.workers)} workers")
+        monitor = asyncio.get_running_loop().create_task(self._monitor())
+        try:
+            await asyncio.Event().wait()
+        finally:
+            monitor.cancel()
+            await runner.cleanup()
+            await self._http.close()
+            for worker in self.workers:
+                if worker.alive:
+                    worker.process.terminate()
+            deadline = time.monotonic() + 10
+            for worker in self.workers:
+                if worker.process is not None:
+                    worker.process.join(max(0.0, deadline - time.monotonic()))
@@ -0,0 +1,295 @@
+from typing import Dict, Any, Optional, List, Tuple, Iterable
+import os
+import re
+import time
+import asyncio
+import difflib
+import logging
+import unicodedata
+from ..http_client import passthrough
+from ..models import panel_titles
+
+logger = logging.getLogger(__name__)
+
+# Mercados tal como los espera la API en las rutas de cotización
+MERCADOS = {m.lower(): m for m in ["bCBA", "nYSE", "nASDAQ", "aMEX", "bCS", "rOFX"]}
+
+# Paneles válidos de cotizaciones-orleans-panel
+PANELES = [
+    "opciones", "cedears", "acciones", "aDRs", "titulosPublicos", "cauciones",
+    "cHPD", "futuros", "obligacionesNegociables", "letras"
+]
+
+DEFAULT_PANELES = "argentina:acciones,argentina:cedears,argentina:titulosPublicos,argentina:obligacionesNegociables,argentina:letras,estados_Unidos:acciones"
+
+def normalize(text: str) -> str:
+    """Normaliza un texto para búsqueda: mayúsculas y sin acentos"""
+    text = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in text if not unicodedata.combining(c)).upper().strip()
+
+def _words(text: str) -> List[str]:
+    """Palabras de un texto normalizado, sin signos de puntuación ("GALICIA (DOLARES)" -> GALICIA, DOLARES)"""
+    return re.findall(r"\w+", text)
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.ids: set = set()
+
+class SymbolIndex:
+    """Índice en memoria de títulos: trie de prefijos sobre símbolo y descripción con búsqueda aproximada"""
+
+    def __init__(self, entries: Iterable[Dict[str, Any]] = ()):
+        self.entries: List[Dict[str, Any]] = []
+        self._by_symbol: Dict[str, List[int]] = {}
+        self._symbol_trie = _TrieNode()
+        self._word_trie = _TrieNode()
+        self._keys = set()
+        for entry in entries:
+            self.add(entry)
+        self._symbols = list(self._by_symbol)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def _insert(root: _TrieNode, token: str, entry_id: int) -> None:
+        node = root
+        for char in token:
+            node = node.children.setdefault(char, _TrieNode())
+            node.ids.add(entry_id)
+
+    @staticmethod
+    def _lookup(root: _TrieNode, prefix: str) -> set:
+        node = root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return set()
+        return node.ids
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        """Agrega un título al índice, ignorando duplicados por símbolo y mercado"""
+        simbolo = normalize(entry.get("simbolo"))
+        if not simbolo:
+            return
+        key = (simbolo, entry.get("mercado"))
+        if key in self._keys:
+            return
+        self._keys.add(key)
+
+        entry_id = len(self.entries)
+        self.entries.append(entry)
+        self._by_symbol.setdefault(simbolo, []).append(entry_id)
+        self._insert(self._symbol_trie, simbolo, entry_id)
+        for word in _words(normalize(entry.get("descripcion"))):
+            self._insert(self._word_trie, word, entry_id)
+
+    def search(self, query: str, mercado: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Busca títulos por símbolo o descripción
+
+        Args:
+            query: Texto a buscar (símbolo, prefijo o parte del nombre)
+            mercado: Restringe los resultados a un mercado (opcional)
+            limit: Cantidad máxima de resultados
+
+        Returns:
+            List[Dict[str, Any]]: Títulos encontrados con su puntaje, de mayor a menor relevancia
+        """
+        q = normalize(query)
+        if not q:
+            return []
+
+        scored: Dict[int, float] = {}
+
+        def _score(ids: Iterable[int], score: float) -> None:
+            for entry_id in ids:
+                if scored.get(entry_id, 0.0) < score:
+                    scored[entry_id] = score
+
+        _score(self._by_symbol.get(q, []), 1.0)
+        _score(self._lookup(self._symbol_trie, q), 0.9)
+
+        words = _words(q)
+        matches = [self._lookup(self._word_trie, word) for word in words]
+        if matches and all(matches):
+            _score(set.intersection(*matches), 0.8)
+
+        # La búsqueda aproximada solo se usa cuando no hay coincidencias por prefijo
+        if not scored:
+            for simbolo in difflib.get_close_matches(q, self._symbols, n=limit, cutoff=0.6):
+                similarity = difflib.SequenceMatcher(None, q, simbolo).ratio()
+                _score(self._by_symbol[simbolo], round(0.7 * similarity, 3))
+
+        if mercado:
+            mercado = mercado.lower()
+            scored = {i: s for i, s in scored.items() if (self.entries[i].get("mercado") or "").lower() == mercado}
+
+        ranked = sorted(scored.items(), key=lambda item: (-item[1], len(self.entries[item[0]]["simbolo"])))
+        return [{**self.entries[i], "puntaje": score} for i, score in ranked[:limit]]
+
+def _extract_titles(data: Any, tipo: Optional[str], pais: Optional[str]) -> List[Dict[str, Any]]:
+    """Extrae los títulos (objetos con 'simbolo') de una respuesta de la API"""
+    if isinstance(data, dict):
+        data = data.get("titulos", data.get("result", []))
+    entries = []
+    for item in data if isinstance(data, list) else []:
+        if not isinstance(item, dict) or not item.get("simbolo"):
+            continue
+        mercado = item.get("mercado")
+        entries.append({
+            "simbolo": item["simbolo"],
+            "mercado": MERCADOS.get(str(mercado).lower(), mercado) if mercado else None,
+            "descripcion": item.get("descripcion"),
+            "tipo": item.get("tipoInstrumento") or item.get("tipo") or tipo,
+            "pais": pais
+        })
+    return entries
+
+def _panel_entries(data: Any, tipo: str, pais: str) -> List[Dict[str, Any]]:
+    """Extrae los títulos de un panel de cotizaciones, decodificándolo a TituloPanel"""
+    return [
+        {
+            "simbolo": item.simbolo,
+            "mercado": MERCADOS.get(item.mercado.lower(), item.mercado) if item.mercado else None,
+            "descripcion": item.descripcion,
+            "tipo": tipo,
+            "pais": pais
+        }
+        for item in panel_titles(data)
+        if item.simbolo
+    ]
+
+def _panel_name(instrumento: str) -> Optional[str]:
+    """Convierte el nombre devuelto por obtener_instrumentos al panel de cotizaciones equivalente"""
+    compact = normalize(instrumento).replace(" ", "").lower()
+    for panel in PANELES:
+        if panel.lower() == compact:
+            return panel
+    return None
+
+class SymbolIndexService:
+    """Construye y refresca en segundo plano el índice de títulos a partir de los catálogos de la API"""
+
+    def __init__(self, client, refresh_interval: Optional[float] = None, retry_interval: Optional[float] = None):
+        """
+        Inicializa el servicio de búsqueda
+
+        Args:
+            client: Cliente de títulos (TitulosClient)
+            refresh_interval: Segundos entre reconstrucciones del índice
+            retry_interval: Segundos de espera tras una construcción sin títulos (se duplica en cada fallo)
+        """
+        self.client = client
+        self.refresh_interval = refresh_interval or float(os.getenv('IOL_SYMBOL_INDEX_REFRESH', '21600'))
+        self.retry_interval = retry_interval or float(os.getenv('IOL_SYMBOL_INDEX_RETRY', '30'))
+        self.index = SymbolIndex()
+        self.built_at: Optional[float] = None
+        self.last_attempt: Optional[float] = None
+        self.failures = 0
+        self._build_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def _configured_panels(self) -> Optional[List[Tuple[str, str]]]:
+        raw = os.getenv('IOL_SYMBOL_INDEX_PANELES')
+        if raw is None:
+            return None
+        return [tuple(pair.split(":", 1)) for pair in raw.split(",") if ":" in pair]
+
+    async def _discover_panels(self) -> List[Tuple[str, str]]:
+        """Obtiene los paneles a indexar a partir de obtener_instrumentos"""
+        panels = []
+        for pais in ("argentina", "estados_Unidos"):
+            try:
+                instrumentos = await self.client.obtener_instrumentos(pais=pais)
+            except Exception as e:
+                logger.warning(f"No se pudieron obtener los instrumentos de {pais}: {str(e)}")
+                continue
+            for item in instrumentos or []:
+                panel = _panel_name(item.get("instrumento", "")) if isinstance(item, dict) else None
+                if panel and panel not in ("opciones", "cauciones", "futuros"):
+                    panels.append((pais, panel))
+        if not panels:
+            panels = [tuple(pair.split(":", 1)) for pair in DEFAULT_PANELES.split(",")]
+        return panels
+
+    def _retry_due(self) -> bool:
+        """Indica si corresponde intentar construir el índice: nunca se construyó y venció la espera tras el último intento"""
+        if self.built_at is not None:
+            return False
+        if self.last_attempt is None:
+            return True
+        delay = min(self.retry_interval * 2 ** max(self.failures - 1, 0), self.refresh_interval)
+        return time.time() - self.last_attempt >= delay
+
+    async def build(self, only_if_due: bool = False) -> SymbolIndex:
+        """
+        Reconstruye el índice consultando paneles y FCI en paralelo
+
+        Args:
+            only_if_due: Si es True, solo se construye si todavía no hay índice y venció la espera entre intentos
+
+        Returns:
+            SymbolIndex: El índice actual (el anterior, posiblemente vacío, si no se obtuvieron títulos)
+        """
+        async with self._build_lock:
+            if only_if_due and not self._retry_due():
+                return self.index
+            self.last_attempt = time.time()
+            started = time.perf_counter()
+            panels = self._configured_panels() or await self._discover_panels()
+
+            async def _panel(pais: str, instrumento: str) -> List[Dict[str, Any]]:
+                with passthrough():
+                    data = await self.client.obtener_cotizaciones_panel_todos(instrumento=instrumento, pais=pais)
+                return _panel_entries(data, instrumento, pais)
+
+            async def _fci() -> List[Dict[str, Any]]:
+                return _extract_titles(await self.client.obtener_fci(), "FCI", "argentina")
+
+            results = await asyncio.gather(
+                *(_panel(pais, instrumento) for pais, instrumento in panels),
+                _fci(),
+                return_exceptions=True
+            )
+            entries = []
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.warning(f"Error cargando catálogo para el índice de títulos: {str(result)}")
+                    continue
+                entries.extend(result)
+
+            if entries:
+                self.index = SymbolIndex(entries)
+                self.built_at = time.time()
+                self.failures = 0
+            else:
+                self.failures += 1
+                logger.warning(f"No se obtuvieron títulos para el índice (intento fallido {self.failures})")
+            logger.info(
+                f"Índice de títulos construido: {len(self.index)} títulos en "
+                f"{time.perf_counter() - started:.2f}s"
+            )
+            return self.index
+
+    async def ensure_ready(self) -> SymbolIndex:
+        """
+        Construye el índice si todavía no existe y programa su refresco periódico. Tras una
+        construcción sin títulos se devuelve el índice anterior hasta que vence la espera entre intentos
+        """
+        if self.built_at is None:
+            await self.build(only_if_due=True)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._refresh_loop())
+        return self.index
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.build()
+            except Exception as e:
+                logger.error(f"Error refrescando el índice de títulos: {str(e)}")
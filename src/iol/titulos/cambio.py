@@ -0,0 +1,161 @@
+from typing import Dict, Any, Optional, List
+from datetime import datetime
+import os
+import time
+import asyncio
+import logging
+import statistics
+from ..market_calendar import market_calendar
+from .client import TitulosClient
+
+logger = logging.getLogger(__name__)
+
+# Bonos usados para calcular el dólar implícito: especie en pesos, "D" (MEP) y "C" (cable)
+DEFAULT_BASKET = "AL30,GD30"
+SUFFIXES = {"mep": "D", "ccl": "C"}
+
+class ExchangeRateService:
+    """Calcula y cachea el dólar MEP y CCL implícito en una canasta de bonos"""
+
+    def __init__(
+        self,
+        client,
+        basket: Optional[List[str]] = None,
+        refresh_interval: Optional[float] = None,
+        max_age: Optional[float] = None
+    ):
+        """
+        Inicializa el servicio de tipo de cambio
+
+        Args:
+            client: Cliente de títulos (TitulosClient)
+            basket: Símbolos en pesos de los bonos de la canasta
+            refresh_interval: Segundos entre recálculos en segundo plano
+            max_age: Antigüedad máxima en segundos para considerar vigente una tasa cacheada
+        """
+        self.client = client
+        self.basket = basket or [s.strip().upper() for s in os.getenv('IOL_FX_BASKET', DEFAULT_BASKET).split(",") if s.strip()]
+        self.refresh_interval = refresh_interval or float(os.getenv('IOL_FX_REFRESH', '60'))
+        self.max_age = max_age or float(os.getenv('IOL_FX_MAX_AGE', '300'))
+        self.plazo = os.getenv('IOL_FX_PLAZO') or None
+        self.rates: Dict[str, Dict[str, Any]] = {}
+        self.updated_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def _price(self, simbolo: str) -> Optional[float]:
+        cotizacion = await self.client.obtener_cotizacion(simbolo=simbolo, mercado="bCBA", plazo=self.plazo)
+        precio = (cotizacion or {}).get("ultimoPrecio")
+        return float(precio) if precio else None
+
+    async def refresh(self) -> Dict[str, Dict[str, Any]]:
+        """Recalcula las tasas consultando en paralelo todas las especies de la canasta"""
+        async with self._lock:
+            symbols = [s for bono in self.basket for s in (bono, *(bono + suffix for suffix in SUFFIXES.values()))]
+            prices = await asyncio.gather(*(self._price(s) for s in symbols), return_exceptions=True)
+            by_symbol = {}
+            for simbolo, precio in zip(symbols, prices):
+                if isinstance(precio, Exception):
+                    logger.warning(f"Error obteniendo cotización de {simbolo} para el tipo de cambio: {str(precio)}")
+                    continue
+                by_symbol[simbolo] = precio
+
+            now = datetime.now().isoformat(timespec="seconds")
+            rates = {}
+            for tipo, suffix in SUFFIXES.items():
+                bonos = {}
+                for bono in self.basket:
+                    pesos = by_symbol.get(bono)
+                    dolares = by_symbol.get(bono + suffix)
+                    if pesos and dolares:
+                        bonos[bono] = {
+                            "tasa": round(pesos / dolares, 4),
+                            "precio_pesos": pesos,
+                            "precio_dolares": dolares
+                        }
+                if bonos:
+                    tasas = [b["tasa"] for b in bonos.values()]
+                    rates[tipo] = {
+                        "compra": min(tasas),
+                        "venta": max(tasas),
+                        "mediana": round(statistics.median(tasas), 4),
+                        "bonos": bonos,
+                        "actualizado": now
+                    }
+
+            if rates:
+                self.rates = rates
+                self.updated_at = time.monotonic()
+            else:
+                logger.warning("No se pudo calcular ningún tipo de cambio implícito")
+            return self.rates
+
+    def is_fresh(self) -> bool:
+        """Indica si las tasas cacheadas siguen vigentes (fuera de la rueda, hasta la próxima apertura)"""
+        max_age = market_calendar.ttl_for("bCBA", self.max_age)
+        return self.updated_at is not None and time.monotonic() - self.updated_at <= max_age
+
+    async def get_rates(self) -> Dict[str, Dict[str, Any]]:
+        """Devuelve las tasas cacheadas, recalculándolas solo si están vencidas"""
+        self._ensure_running()
+        if not self.is_fresh():
+            await self.refresh()
+        return self.rates
+
+    async def get_rate(self, tipo: str = "mep", lado: str = "mediana") -> Optional[float]:
+        """
+        Devuelve una tasa cacheada
+
+        Args:
+            tipo: mep o ccl
+            lado: compra (menor tasa de la canasta), venta (mayor tasa) o mediana
+
+        Returns:
+            Optional[float]: Pesos por dólar, o None si no hay tasa disponible
+        """
+        rate = (await self.get_rates()).get(tipo)
+        return rate[lado] if rate else None
+
+    async def convert(self, monto: float, moneda_origen: str, moneda_destino: str, tipo: str = "mep") -> Optional[float]:
+        """
+        Convierte un monto entre pesos y dólares con la tasa cacheada
+
+        Args:
+            monto: Monto a convertir
+            moneda_origen: peso_Argentino o dolar_Estadounidense
+            moneda_destino: peso_Argentino o dolar_Estadounidense
+            tipo: mep o ccl
+
+        Returns:
+            Optional[float]: Monto convertido, o None si no hay tasa disponible
+        """
+        origen = moneda_origen.lower()
+        destino = moneda_destino.lower()
+        if origen == destino:
+            return monto
+        rate = await self.get_rate(tipo)
+        if not rate:
+            return None
+        return monto / rate if origen.startswith("peso") else monto * rate
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._refresh_loop())
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            # Con el mercado cerrado las tasas no cambian: se espera a la próxima apertura
+            await asyncio.sleep(market_calendar.poll_delay("bCBA", self.refresh_interval))
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Error refrescando tipos de cambio: {str(e)}")
+
+_service: Optional[ExchangeRateService] = None
+
+def get_exchange_rate_service() -> ExchangeRateService:
+    """Devuelve el servicio de tipo de cambio compartido por todas las herramientas"""
+    global _service
+    if _service is None:
+        _service = ExchangeRateService(TitulosClient())
+    return _service
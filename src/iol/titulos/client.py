@@ -1,5 +1,7 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable
+import asyncio
 from ..http_client import IOLAPIClient
+from ..batch import run_bounded, split_date_range, merge_chunks
 
 class TitulosClient(IOLAPIClient):
     async def obtener_cotizacion(
@@ -60,6 +62,27 @@ class TitulosClient(IOLAPIClient):
         """
         return await self.get(f"/api/v2/{mercado}/Titulos/{simbolo}/Opciones")
 
+    async def obtener_cadena_opciones(
+        self,
+        simbolo: str,
+        mercado: str
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Obtiene en paralelo la cadena de opciones y la cotización del subyacente
+        
+        Args:
+            simbolo: Símbolo del subyacente
+            mercado: Mercado del subyacente (bCBA, nYSE, nASDAQ, etc)
+            
+        Returns:
+            Tuple[List[Dict[str, Any]], Dict[str, Any]]: Cadena de opciones y cotización del subyacente
+        """
+        opciones, cotizacion = await asyncio.gather(
+            self.obtener_opciones(simbolo=simbolo, mercado=mercado),
+            self.obtener_cotizacion(simbolo=simbolo, mercado=mercado)
+        )
+        return opciones or [], cotizacion
+
     async def obtener_instrumentos(
         self,
         pais: str
@@ -180,4 +203,43 @@ class TitulosClient(IOLAPIClient):
         Returns:
             List[Dict[str, Any]]: Lista de objetos CotizacionModel con la información histórica
         """
-        return await self.get(f"/api/v2/{mercado}/Titulos/{simbolo}/Cotizacion/seriehistorica/{fecha_desde}/{fecha_hasta}/{ajustada}") 
\ No newline at end of file
+        return await self.get(f"/api/v2/{mercado}/Titulos/{simbolo}/Cotizacion/seriehistorica/{fecha_desde}/{fecha_hasta}/{ajustada}")
+
+    async def obtener_cotizacion_serie_historica_por_tramos(
+        self,
+        mercado: str,
+        simbolo: str,
+        fecha_desde: str,
+        fecha_hasta: str,
+        ajustada: str,
+        dias: int = 365,
+        progress: Optional[Callable[[int, int], Awaitable[None]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Obtiene una serie histórica larga consultando en paralelo tramos de hasta dias días
+        
+        Args:
+            mercado: Mercado del título (bCBA, nYSE, nASDAQ, aMEX, bCS, rOFX)
+            simbolo: Símbolo del título
+            fecha_desde: Fecha desde en formato ISO
+            fecha_hasta: Fecha hasta en formato ISO
+            ajustada: Indica si los datos deben estar ajustados (ajustada, sinAjustar)
+            dias: Días por tramo
+            progress: Corrutina llamada con (tramos completados, total) al terminar cada tramo
+            
+        Returns:
+            List[Dict[str, Any]]: Cotizaciones de todos los tramos, de la más reciente a la más antigua
+        """
+        outcomes = await run_bounded(
+            split_date_range(fecha_desde, fecha_hasta, dias),
+            lambda tramo: self.obtener_cotizacion_serie_historica(
+                mercado=mercado,
+                simbolo=simbolo,
+                fecha_desde=tramo[0],
+                fecha_hasta=tramo[1],
+                ajustada=ajustada
+            ),
+            progress=progress
+        )
+        return merge_chunks(outcomes, key="fechaHora")
+ 
\ No newline at end of file
@@ -0,0 +1,229 @@
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime
+import os
+import time
+import asyncio
+import logging
+import numpy as np
+from ..market_calendar import market_calendar
+from ..batch import run_bounded
+from ..http_client import passthrough
+from ..models import Cotizacion, RawJSON, as_model
+from .client import TitulosClient
+
+logger = logging.getLogger(__name__)
+
+# Clave de un título monitoreado: (simbolo, mercado, plazo)
+DepthKey = Tuple[str, str, str]
+
+def parse_depth(data: Any) -> Dict[str, np.ndarray]:
+    """
+    Normaliza las puntas del detalle mobile a dos arreglos (precio, cantidad) por lado
+
+    Args:
+        data: Respuesta de obtener_cotizacion_detalle_mobile (decodificada o RawJSON)
+
+    Returns:
+        Dict[str, np.ndarray]: "compra" ordenada de mayor a menor precio y "venta" de menor a mayor
+    """
+    cotizacion = as_model(data, Cotizacion) if isinstance(data, (dict, RawJSON)) else None
+    bids, asks = [], []
+    for punta in (cotizacion.puntas if cotizacion else None) or []:
+        if (punta.precioCompra or 0) > 0 and (punta.cantidadCompra or 0) > 0:
+            bids.append((punta.precioCompra, punta.cantidadCompra))
+        if (punta.precioVenta or 0) > 0 and (punta.cantidadVenta or 0) > 0:
+            asks.append((punta.precioVenta, punta.cantidadVenta))
+
+    compra = np.array(bids, dtype=float).reshape(-1, 2)
+    venta = np.array(asks, dtype=float).reshape(-1, 2)
+    return {
+        "compra": compra[np.argsort(-compra[:, 0], kind="stable")],
+        "venta": venta[np.argsort(venta[:, 0], kind="stable")]
+    }
+
+async def fetch_depth(client, key: DepthKey) -> Dict[str, np.ndarray]:
+    """Consulta el detalle mobile de un título y decodifica sus puntas directo de los bytes de la respuesta"""
+    simbolo, mercado, plazo = key
+    with passthrough():
+        data = await client.obtener_cotizacion_detalle_mobile(mercado=mercado, simbolo=simbolo, plazo=plazo)
+    return parse_depth(data)
+
+def _round(value: float, digits: int = 4) -> Optional[float]:
+    return round(float(value), digits) if np.isfinite(value) else None
+
+def depth_metrics(depth: Dict[str, np.ndarray], niveles: int = 5) -> Dict[str, Any]:
+    """
+    Calcula spread, precio medio, desequilibrio y precios ponderados por cantidad
+
+    Args:
+        depth: Puntas normalizadas con parse_depth
+        niveles: Cantidad de niveles por lado considerados
+
+    Returns:
+        Dict[str, Any]: Métricas y puntas en formato compacto [[precio, cantidad], ...]
+    """
+    compra = depth["compra"][:niveles]
+    venta = depth["venta"][:niveles]
+    cantidad_compra = compra[:, 1].sum()
+    cantidad_venta = venta[:, 1].sum()
+
+    metrics: Dict[str, Any] = {
+        "mejor_compra": _round(compra[0, 0]) if len(compra) else None,
+        "mejor_venta": _round(venta[0, 0]) if len(venta) else None,
+        "spread": None,
+        "spread_bps": None,
+        "medio": None,
+        "microprecio": None,
+        "desequilibrio": _round((cantidad_compra - cantidad_venta) / (cantidad_compra + cantidad_venta))
+            if cantidad_compra + cantidad_venta else None,
+        "cantidad_compra": float(cantidad_compra),
+        "cantidad_venta": float(cantidad_venta),
+        "precio_ponderado_compra": _round(compra[:, 0] @ compra[:, 1] / cantidad_compra) if cantidad_compra else None,
+        "precio_ponderado_venta": _round(venta[:, 0] @ venta[:, 1] / cantidad_venta) if cantidad_venta else None
+    }
+    if len(compra) and len(venta):
+        (bid, bid_qty), (ask, ask_qty) = compra[0], venta[0]
+        mid = (bid + ask) / 2
+        metrics["spread"] = _round(ask - bid)
+        metrics["spread_bps"] = _round((ask - bid) / mid * 10000, 2)
+        metrics["medio"] = _round(mid)
+        # El precio se inclina hacia el lado con menos cantidad en la primera punta
+        metrics["microprecio"] = _round((bid * ask_qty + ask * bid_qty) / (bid_qty + ask_qty))
+
+    metrics["puntas"] = {"compra": compra.tolist(), "venta": venta.tolist()}
+    return metrics
+
+class DepthMonitor:
+    """Mantiene en segundo plano las puntas de una watchlist para servirlas sin consultar la API"""
+
+    def __init__(self, client, interval: Optional[float] = None, max_age: Optional[float] = None):
+        """
+        Inicializa el monitor de profundidad
+
+        Args:
+            client: Cliente de títulos (TitulosClient)
+            interval: Segundos entre actualizaciones durante la rueda
+            max_age: Antigüedad máxima en segundos para servir una instantánea sin consultar la API
+        """
+        self.client = client
+        self.interval = interval or float(os.getenv('IOL_DEPTH_INTERVAL', '5'))
+        self.max_age = max_age or float(os.getenv('IOL_DEPTH_MAX_AGE', '15'))
+        self.watchlist: List[DepthKey] = []
+        self.snapshots: Dict[DepthKey, Tuple[float, str, Dict[str, np.ndarray]]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def fetch(self, key: DepthKey) -> Dict[str, np.ndarray]:
+        """Consulta las puntas de un título y guarda la instantánea"""
+        depth = await fetch_depth(self.client, key)
+        self.snapshots[key] = (time.monotonic(), datetime.now().isoformat(timespec="seconds"), depth)
+        return depth
+
+    def get(self, key: DepthKey) -> Optional[Tuple[str, Dict[str, np.ndarray]]]:
+        """
+        Devuelve la instantánea vigente de un título
+
+        Returns:
+            Optional[Tuple[str, Dict[str, np.ndarray]]]: (fecha, puntas), o None si no hay o está vencida
+        """
+        snapshot = self.snapshots.get(key)
+        if snapshot is None:
+            return None
+        # Fuera de la rueda las puntas no cambian hasta la próxima apertura
+        if time.monotonic() - snapshot[0] > market_calendar.ttl_for(key[1], self.max_age):
+            return None
+        return snapshot[1], snapshot[2]
+
+    async def refresh(self) -> None:
+        """Actualiza en paralelo todos los títulos de la watchlist"""
+        outcomes = await run_bounded(self.watchlist, self.fetch)
+        for key, _, error in outcomes:
+            if error is not None:
+                logger.warning(f"Error actualizando puntas de {key[0]}: {error}")
+
+    def watch(self, keys: List[DepthKey]) -> None:
+        """Reemplaza la watchlist y arranca el monitor si no estaba corriendo"""
+        self.watchlist = list(dict.fromkeys(keys))
+        for key in [k for k in self.snapshots if k not in self.watchlist]:
+            del self.snapshots[key]
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(f"Monitoreando puntas de {len(self.watchlist)} títulos")
+
+    def stop(self) -> None:
+        """Detiene el monitor y descarta las instantáneas"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.watchlist = []
+        self.snapshots.clear()
+
+    def _delay(self) -> float:
+        mercados = {key[1] for key in self.watchlist} or {"bCBA"}
+        return min(market_calendar.poll_delay(mercado, self.interval) for mercado in mercados)
+
+    async def _run(self) -> None:
+        while self.watchlist:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Error en el monitor de puntas: {str(e)}")
+            # Con todos los mercados cerrados se espera a la próxima apertura
+            await asyncio.sleep(self._delay())
+
+    def status(self) -> Dict[str, Any]:
+        """Estado del monitor"""
+        return {
+            "activo": self._task is not None and not self._task.done(),
+            "intervalo": self.interval,
+            "titulos": [
+                {
+                    "simbolo": simbolo,
+                    "mercado": mercado,
+                    "plazo": plazo,
+                    "actualizado": self.snapshots[(simbolo, mercado, plazo)][1]
+                        if (simbolo, mercado, plazo) in self.snapshots else None
+                }
+                for simbolo, mercado, plazo in self.watchlist
+            ]
+        }
+
+async def gather_depth(
+    monitor: DepthMonitor,
+    keys: List[DepthKey],
+    niveles: int = 5,
+    max_concurrency: Optional[int] = None
+) -> List[Tuple[DepthKey, Any, Optional[str]]]:
+    """
+    Obtiene las métricas de profundidad de varios títulos: los monitoreados se sirven de la
+    instantánea vigente y el resto se consulta a la API en paralelo
+
+    Args:
+        monitor: Monitor de profundidad
+        keys: Títulos (simbolo, mercado, plazo)
+        niveles: Cantidad de niveles por lado considerados
+        max_concurrency: Cantidad máxima de consultas simultáneas
+
+    Returns:
+        List[Tuple[DepthKey, Any, Optional[str]]]: Tuplas (título, métricas, error) en el orden de entrada
+    """
+
+    async def _one(key: DepthKey) -> Dict[str, Any]:
+        snapshot = monitor.get(key)
+        if snapshot is not None:
+            updated, depth = snapshot
+            source = "monitor"
+        else:
+            depth = await monitor.fetch(key) if key in monitor.watchlist else await fetch_depth(monitor.client, key)
+            updated, source = datetime.now().isoformat(timespec="seconds"), "api"
+        return {"fuente": source, "actualizado": updated, **depth_metrics(depth, niveles)}
+
+    return await run_bounded(keys, _one, max_concurrency)
+
+_monitor: Optional[DepthMonitor] = None
+
+def get_depth_monitor() -> DepthMonitor:
+    """Devuelve el monitor de profundidad compartido por todas las herramientas"""
+    global _monitor
+    if _monitor is None:
+        _monitor = DepthMonitor(TitulosClient())
+    return _monitor
@@ -1,75 +1,31 @@
 from typing import Dict, Any, Optional, List
-from fastmcp import FastMCP
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from fastmcp import FastMCP, Context
+from pydantic import Field
 from ..base_routes import BaseRoutes
+from ..market_calendar import market_calendar
+from ..batch import split_results
+from ..jobs import job_manager, job_started
+from ..columnar import FORMATS, apply_format
 from .client import TitulosClient
-
-class CotizacionModel(BaseModel):
-    """Modelo para representar una cotización según el swagger"""
-    # Aquí se definirían los campos específicos de CotizacionModel
-    # pero no se proporcionan en la especificación del swagger
-    
-    model_config = ConfigDict(extra="ignore", validate_assignment=True)
-    
-    @field_validator('*', mode='before')
-    @classmethod
-    def empty_str_to_none(cls, v):
-        if v == "":
-            return None
-        return v
-
-class TituloFCIModel(BaseModel):
-    """Modelo para representar un título FCI según el swagger"""
-    # Aquí se definirían los campos específicos de TituloFCIModel
-    # pero no se proporcionan en la especificación del swagger
-    
-    model_config = ConfigDict(extra="ignore", validate_assignment=True)
-    
-    @field_validator('*', mode='before')
-    @classmethod
-    def empty_str_to_none(cls, v):
-        if v == "":
-            return None
-        return v
-
-class InstrumentoModel(BaseModel):
-    """Modelo para representar un instrumento según el swagger"""
-    # Aquí se definirían los campos específicos de InstrumentoModel
-    # pero no se proporcionan en la especificación del swagger
-    
-    model_config = ConfigDict(extra="ignore", validate_assignment=True)
-    
-    @field_validator('*', mode='before')
-    @classmethod
-    def empty_str_to_none(cls, v):
-        if v == "":
-            return None
-        return v
-
-class CotizacionDetalleMobileModel(BaseModel):
-    """Modelo para representar una cotización detallada para móvil según el swagger"""
-    # Aquí se definirían los campos específicos de CotizacionDetalleMobileModel
-    # pero no se proporcionan en la especificación del swagger
-    
-    model_config = ConfigDict(extra="ignore", validate_assignment=True)
-    
-    @field_validator('*', mode='before')
-    @classmethod
-    def empty_str_to_none(cls, v):
-        if v == "":
-            return None
-        return v
+from .opciones import analyze_chain
+from .buscador import SymbolIndexService
+from .cambio import get_exchange_rate_service
+from .profundidad import get_depth_monitor, gather_depth
 
 class TitulosRoutes(BaseRoutes):
     def __init__(self):
         super().__init__()
         self.client = TitulosClient()
+        self.buscador = SymbolIndexService(self.client)
+        self.cambio = get_exchange_rate_service()
+        self.profundidad = get_depth_monitor()
 
     def register_tools(self, mcp: FastMCP):
         @mcp.tool(
             name="titulos_obtener_cotizacion",  # Prefijo para evitar duplicados
             description="Obtener cotización de un título",
-            tags=["titulos", "cotizacion"]
+            tags=["titulos", "cotizacion"],
+            output_schema=None
         )
         async def obtener_cotizacion(
             simbolo: str = Field(description="Símbolo del título (Ejemplo: ALUA, APBR)"),
@@ -85,22 +41,126 @@ class TitulosRoutes(BaseRoutes):
                 plazo: Plazo de la cotización (t0, t1, t2, t3)
             """
             try:
-                result = await self.client.obtener_cotizacion(
+                return await self.passthrough_response(self.client.obtener_cotizacion(
                     simbolo=simbolo,
                     mercado=mercado,
                     plazo=plazo
-                )
+                ))
+            except Exception as e:
+                return {"error": f"Error obteniendo cotización: {str(e)}"}
+
+        @mcp.tool(
+            name="buscar_titulo",
+            description="Buscar títulos por símbolo o nombre y resolver su símbolo y mercado sin consultar la API",
+            tags=["titulos", "busqueda"]
+        )
+        async def buscar_titulo(
+            consulta: str = Field(description="Símbolo, prefijo o parte del nombre del título (Ejemplo: galicia, GGAL, YPF)"),
+            mercado: Optional[str] = Field(default=None, description="Mercado para filtrar los resultados", enum=["bCBA", "nYSE", "nASDAQ", "aMEX", "bCS", "rOFX"]),
+            limite: int = Field(default=10, description="Cantidad máxima de resultados")
+        ) -> Dict[str, Any]:
+            """
+            Busca títulos en el índice local construido a partir de instrumentos, paneles y FCI
+            
+            Args:
+                consulta: Símbolo, prefijo o parte del nombre del título
+                mercado: Mercado para filtrar los resultados (opcional)
+                limite: Cantidad máxima de resultados
+            """
+            try:
+                index = await self.buscador.ensure_ready()
                 return {
                     "success": True,
-                    "result": result
+                    "result": index.search(consulta, mercado=mercado, limit=limite)
                 }
             except Exception as e:
-                return {"error": f"Error obteniendo cotización: {str(e)}"}
+                return {"error": f"Error buscando título: {str(e)}"}
+
+        @mcp.tool(
+            name="obtener_mejor_tipo_cambio",
+            description="Obtener el dólar MEP y CCL implícito en la canasta de bonos, con la mejor tasa para comprar y vender",
+            tags=["titulos", "cambio", "mep", "ccl"]
+        )
+        async def obtener_mejor_tipo_cambio(
+            tipo: Optional[str] = Field(default=None, description="Tipo de cambio (por defecto, ambos)", enum=["mep", "ccl"])
+        ) -> Dict[str, Any]:
+            """
+            Obtiene el tipo de cambio implícito cacheado. "compra" es la menor tasa de la
+            canasta (mejor para comprar dólares) y "venta" la mayor (mejor para venderlos).
+            
+            Args:
+                tipo: mep o ccl (opcional)
+            """
+            try:
+                rates = await self.cambio.get_rates()
+                if tipo:
+                    if tipo not in rates:
+                        return {"error": f"No hay tipo de cambio {tipo} disponible"}
+                    rates = {tipo: rates[tipo]}
+                return {
+                    "success": True,
+                    "result": rates
+                }
+            except Exception as e:
+                return {"error": f"Error obteniendo tipo de cambio: {str(e)}"}
+
+        @mcp.tool(
+            name="convertir_moneda",
+            description="Convertir un monto entre pesos y dólares con el tipo de cambio implícito cacheado",
+            tags=["titulos", "cambio"]
+        )
+        async def convertir_moneda(
+            monto: float = Field(description="Monto a convertir"),
+            moneda_origen: str = Field(description="Moneda del monto", enum=["peso_Argentino", "dolar_Estadounidense"]),
+            moneda_destino: str = Field(description="Moneda destino", enum=["peso_Argentino", "dolar_Estadounidense"]),
+            tipo: str = Field(default="mep", description="Tipo de cambio a utilizar", enum=["mep", "ccl"])
+        ) -> Dict[str, Any]:
+            """
+            Convierte un monto entre pesos y dólares
+            
+            Args:
+                monto: Monto a convertir
+                moneda_origen: Moneda del monto
+                moneda_destino: Moneda destino
+                tipo: mep o ccl
+            """
+            try:
+                result = await self.cambio.convert(monto, moneda_origen, moneda_destino, tipo=tipo)
+                if result is None:
+                    return {"error": f"No hay tipo de cambio {tipo} disponible"}
+                return {
+                    "success": True,
+                    "result": {
+                        "monto": round(result, 2),
+                        "moneda": moneda_destino,
+                        "tasa": await self.cambio.get_rate(tipo)
+                    }
+                }
+            except Exception as e:
+                return {"error": f"Error convirtiendo moneda: {str(e)}"}
+
+        @mcp.tool(
+            name="obtener_estado_mercados",
+            description="Obtener qué mercados están en rueda y su próxima apertura, sin consultar la API",
+            tags=["titulos", "mercados", "calendario"]
+        )
+        async def obtener_estado_mercados() -> Dict[str, Any]:
+            """
+            Obtiene el estado de cada mercado según el calendario local de ruedas y feriados
+            """
+            try:
+                return {
+                    "success": True,
+                    "result": market_calendar.status()
+                }
+            except Exception as e:
+                return {"error": f"Error obteniendo estado de mercados: {str(e)}"}
 
         @mcp.tool(
             name="obtener_panel",
             description="Obtener panel de instrumentos",
-            tags=["titulos", "panel"]
+            tags=["titulos", "panel"],
+            output_schema=None
         )
         async def obtener_panel(
             instrumento: str = Field(description="Tipo de instrumento (Acciones, Bonos, Opciones, etc)"),
@@ -114,21 +174,18 @@ class TitulosRoutes(BaseRoutes):
                 pais: País del panel (argentina, estados_unidos, etc)
             """
             try:
-                result = await self.client.obtener_panel(
+                return await self.passthrough_response(self.client.obtener_panel(
                     instrumento=instrumento,
                     pais=pais
-                )
-                return {
-                    "success": True,
-                    "result": result
-                }
+                ))
             except Exception as e:
                 return {"error": f"Error obteniendo panel: {str(e)}"}
 
         @mcp.tool(
             name="obtener_opciones",
             description="Obtener opciones de un título",
-            tags=["titulos", "opciones"]
+            tags=["titulos", "opciones"],
+            output_schema=None
         )
         async def obtener_opciones(
             simbolo: str = Field(description="Símbolo del título"),
@@ -142,21 +199,75 @@ class TitulosRoutes(BaseRoutes):
                 mercado: Mercado del título (bcba, nyse, nasdaq, etc)
             """
             try:
-                result = await self.client.obtener_opciones(
+                return await self.passthrough_response(self.client.obtener_opciones(
+                    simbolo=simbolo,
+                    mercado=mercado
+                ))
+            except Exception as e:
+                return {"error": f"Error obteniendo opciones: {str(e)}"}
+
+        @mcp.tool(
+            name="analizar_opciones",
+            description="Analizar la cadena de opciones de un título: volatilidad implícita, griegas y moneyness",
+            tags=["titulos", "opciones", "analisis"]
+        )
+        async def analizar_opciones(
+            simbolo: str = Field(description="Símbolo del subyacente (Ejemplo: GGAL)"),
+            mercado: str = Field(description="Mercado del subyacente", enum=["bCBA", "nYSE", "nASDAQ", "aMEX", "bCS", "rOFX"]),
+            tasa_libre_riesgo: float = Field(default=0.0, description="Tasa libre de riesgo anual en decimales (Ejemplo: 0.35)"),
+            tipo: Optional[str] = Field(default=None, description="Tipo de opción", enum=["Call", "Put"]),
+            fecha_desde: Optional[str] = Field(default=None, description="Vencimiento desde (YYYY-MM-DD)"),
+            fecha_hasta: Optional[str] = Field(default=None, description="Vencimiento hasta (YYYY-MM-DD)"),
+            strike_min: Optional[float] = Field(default=None, description="Precio de ejercicio mínimo"),
+            strike_max: Optional[float] = Field(default=None, description="Precio de ejercicio máximo")
+        ) -> Dict[str, Any]:
+            """
+            Analiza la cadena de opciones de un título en el servidor
+            
+            Args:
+                simbolo: Símbolo del subyacente
+                mercado: Mercado del subyacente
+                tasa_libre_riesgo: Tasa libre de riesgo anual en decimales
+                tipo: Call o Put (opcional)
+                fecha_desde: Vencimiento desde (opcional)
+                fecha_hasta: Vencimiento hasta (opcional)
+                strike_min: Precio de ejercicio mínimo (opcional)
+                strike_max: Precio de ejercicio máximo (opcional)
+            """
+            try:
+                opciones, cotizacion = await self.client.obtener_cadena_opciones(
                     simbolo=simbolo,
                     mercado=mercado
                 )
+                spot = (cotizacion or {}).get("ultimoPrecio")
+                if not spot:
+                    return {"error": f"No hay precio disponible para el subyacente {simbolo}"}
+                result = analyze_chain(
+                    opciones,
+                    spot=float(spot),
+                    rate=tasa_libre_riesgo,
+                    fecha_desde=fecha_desde,
+                    fecha_hasta=fecha_hasta,
+                    strike_min=strike_min,
+                    strike_max=strike_max,
+                    tipo=tipo
+                )
                 return {
                     "success": True,
-                    "result": result
+                    "result": {
+                        "subyacente": simbolo,
+                        "precio_subyacente": float(spot),
+                        "opciones": result
+                    }
                 }
             except Exception as e:
-                return {"error": f"Error obteniendo opciones: {str(e)}"}
+                return {"error": f"Error analizando opciones: {str(e)}"}
 
         @mcp.tool(
             name="obtener_instrumentos",
             description="Obtener instrumentos disponibles para un país",
-            tags=["titulos", "instrumentos"]
+            tags=["titulos", "instrumentos"],
+            output_schema=None
         )
         async def obtener_instrumentos(
             pais: str = Field(description="País (argentina, estados_unidos, etc)")
@@ -168,20 +279,17 @@ class TitulosRoutes(BaseRoutes):
                 pais: País (argentina, estados_unidos, etc)
             """
             try:
-                result = await self.client.obtener_instrumentos(
+                return await self.passthrough_response(self.client.obtener_instrumentos(
                     pais=pais
-                )
-                return {
-                    "success": True,
-                    "result": result
-                }
+                ))
             except Exception as e:
                 return {"error": f"Error obteniendo instrumentos: {str(e)}"}
 
         @mcp.tool(
             name="obtener_fci",
             description="Obtener información de fondos comunes de inversión",
-            tags=["titulos", "fci"]
+            tags=["titulos", "fci"],
+            output_schema=None
         )
         async def obtener_fci(
             simbolo: Optional[str] = Field(default=None, description="Símbolo del FCI (opcional)")
@@ -193,31 +301,24 @@ class TitulosRoutes(BaseRoutes):
                 simbolo: Símbolo del FCI (opcional)
             """
             try:
-                result = await self.client.obtener_fci(
+                return await self.passthrough_response(self.client.obtener_fci(
                     simbolo=simbolo
-                )
-                return {
-                    "success": True,
-                    "result": result
-                }
+                ))
             except Exception as e:
                 return {"error": f"Error obteniendo FCI: {str(e)}"}
 
         @mcp.tool(
             name="obtener_tipos_fondos",
             description="Obtener tipos de fondos disponibles",
-            tags=["titulos", "fci"]
+            tags=["titulos", "fci"],
+            output_schema=None
         )
         async def obtener_tipos_fondos() -> Dict[str, Any]:
             """
             Obtiene los tipos de fondos disponibles
             """
             try:
-                result = await self.client.obtener_tipos_fondos()
-                return {
-                    "success": True,
-                    "result": result
-                }
+                return await self.passthrough_response(self.client.obtener_tipos_fondos())
             except Exception as e:
                 return {"error": f"Error obteniendo tipos de fondos: {str(e)}"}
 
@@ -230,14 +331,16 @@ class TitulosRoutes(BaseRoutes):
         @mcp.tool(
             name="obtener_cotizaciones_panel_todos",
             description="Obtener todas las cotizaciones de un instrumento en un panel",
-            tags=["titulos", "panel", "cotizaciones"]
+            tags=["titulos", "panel", "cotizaciones"],
+            output_schema=None
         )
         async def obtener_cotizaciones_panel_todos(
             instrumento: str = Field(description="Tipo de instrumento", enum=[
                 "opciones", "cedears", "acciones", "aDRs", "titulosPublicos", "cauciones",
                 "cHPD", "futuros", "obligacionesNegociables", "letras"
             ]),
-            pais: str = Field(description="País", enum=["estados_Unidos", "argentina"])
+            pais: str = Field(description="País", enum=["estados_Unidos", "argentina"]),
+            formato: str = Field(default="filas", description="filas (lista de objetos) o columnar (nombres de campo una sola vez y textos repetidos codificados con diccionario)", enum=FORMATS)
         ) -> Dict[str, Any]:
             """
             Obtiene todas las cotizaciones de un instrumento en un panel
@@ -245,23 +348,24 @@ class TitulosRoutes(BaseRoutes):
             Args:
                 instrumento: Tipo de instrumento (opciones, cedears, acciones, etc.)
                 pais: País (estados_Unidos, argentina)
+                formato: filas o columnar
             """
             try:
-                result = await self.client.obtener_cotizaciones_panel_todos(
+                call = self.client.obtener_cotizaciones_panel_todos(
                     instrumento=instrumento,
                     pais=pais
                 )
-                return {
-                    "success": True,
-                    "result": result
-                }
+                if formato == "columnar":
+                    return self.success_response(apply_format(await call, formato))
+                return await self.passthrough_response(call)
             except Exception as e:
                 return {"error": f"Error obteniendo cotizaciones del panel: {str(e)}"}
                 
         @mcp.tool(
             name="obtener_cotizaciones_panel_operables",
             description="Obtener cotizaciones operables de un instrumento en un panel",
-            tags=["titulos", "panel", "cotizaciones", "operables"]
+            tags=["titulos", "panel", "cotizaciones", "operables"],
+            output_schema=None
         )
         async def obtener_cotizaciones_panel_operables(
             instrumento: str = Field(description="Tipo de instrumento", enum=[
@@ -278,21 +382,18 @@ class TitulosRoutes(BaseRoutes):
                 pais: País (estados_Unidos, argentina)
             """
             try:
-                result = await self.client.obtener_cotizaciones_panel_operables(
+                return await self.passthrough_response(self.client.obtener_cotizaciones_panel_operables(
                     instrumento=instrumento,
                     pais=pais
-                )
-                return {
-                    "success": True,
-                    "result": result
-                }
+                ))
             except Exception as e:
                 return {"error": f"Error obteniendo cotizaciones operables del panel: {str(e)}"}
                 
         @mcp.tool(
             name="obtener_cotizacion_detalle_mobile",
             description="Obtener detalle de cotización para móvil de un título",
-            tags=["titulos", "cotizacion", "mobile"]
+            tags=["titulos", "cotizacion", "mobile"],
+            output_schema=None
         )
         async def obtener_cotizacion_detalle_mobile(
             mercado: str = Field(description="Mercado del título", enum=["bCBA", "nYSE", "nASDAQ", "aMEX", "bCS", "rOFX"]),
@@ -308,29 +409,98 @@ class TitulosRoutes(BaseRoutes):
                 plazo: Plazo de la cotización (t0, t1, t2, t3)
             """
             try:
-                result = await self.client.obtener_cotizacion_detalle_mobile(
+                return await self.passthrough_response(self.client.obtener_cotizacion_detalle_mobile(
                     mercado=mercado,
                     simbolo=simbolo,
                     plazo=plazo
-                )
+                ))
+            except Exception as e:
+                return {"error": f"Error obteniendo detalle de cotización para móvil: {str(e)}"}
+                
+        @mcp.tool(
+            name="obtener_profundidad",
+            description="Obtener las puntas de varios títulos en paralelo con spread, precio medio, desequilibrio y precios ponderados",
+            tags=["titulos", "cotizacion", "puntas", "lote"]
+        )
+        async def obtener_profundidad(
+            simbolos: List[str] = Field(description="Símbolos de los títulos"),
+            mercado: str = Field(default="bCBA", description="Mercado de los títulos", enum=["bCBA", "nYSE", "nASDAQ", "aMEX", "bCS", "rOFX"]),
+            plazo: str = Field(default="t1", description="Plazo de la cotización", enum=["t0", "t1", "t2", "t3"]),
+            niveles: int = Field(default=5, description="Cantidad de puntas por lado consideradas", ge=1),
+            max_concurrencia: Optional[int] = Field(default=None, description="Cantidad máxima de consultas simultáneas")
+        ) -> Dict[str, Any]:
+            """
+            Obtiene las puntas de varios títulos. Los títulos del monitor de profundidad se
+            sirven de su última instantánea sin consultar la API.
+            
+            Args:
+                simbolos: Símbolos de los títulos
+                mercado: Mercado de los títulos
+                plazo: Plazo de la cotización
+                niveles: Cantidad de puntas por lado consideradas
+                max_concurrencia: Cantidad máxima de consultas simultáneas
+                
+            Returns:
+                Dict[str, Any]: Métricas y puntas ([precio, cantidad]) por título y errores por título
+            """
+            try:
+                keys = [(simbolo.upper(), mercado, plazo) for simbolo in simbolos]
+                outcomes = await gather_depth(self.profundidad, keys, niveles, max_concurrencia)
+                results, errors = split_results([(key[0], result, error) for key, result, error in outcomes], "simbolo")
+                return {
+                    "success": not errors,
+                    "result": results,
+                    "errors": errors
+                }
+            except Exception as e:
+                return {"error": f"Error obteniendo profundidad: {str(e)}"}
+
+        @mcp.tool(
+            name="monitorear_profundidad",
+            description="Mantener actualizadas en segundo plano las puntas de una watchlist (lista vacía para detener el monitor)",
+            tags=["titulos", "cotizacion", "puntas", "monitor"]
+        )
+        async def monitorear_profundidad(
+            simbolos: List[str] = Field(description="Símbolos a monitorear; una lista vacía detiene el monitor"),
+            mercado: str = Field(default="bCBA", description="Mercado de los títulos", enum=["bCBA", "nYSE", "nASDAQ", "aMEX", "bCS", "rOFX"]),
+            plazo: str = Field(default="t1", description="Plazo de la cotización", enum=["t0", "t1", "t2", "t3"])
+        ) -> Dict[str, Any]:
+            """
+            Reemplaza la watchlist del monitor de profundidad. Durante la rueda las puntas se
+            actualizan cada IOL_DEPTH_INTERVAL segundos; con el mercado cerrado, en la apertura.
+            
+            Args:
+                simbolos: Símbolos a monitorear
+                mercado: Mercado de los títulos
+                plazo: Plazo de la cotización
+            """
+            try:
+                if simbolos:
+                    self.profundidad.watch([(simbolo.upper(), mercado, plazo) for simbolo in simbolos])
+                else:
+                    self.profundidad.stop()
                 return {
                     "success": True,
-                    "result": result
+                    "result": self.profundidad.status()
                 }
             except Exception as e:
-                return {"error": f"Error obteniendo detalle de cotización para móvil: {str(e)}"}
-                
+                return {"error": f"Error configurando el monitor de profundidad: {str(e)}"}
+
         @mcp.tool(
             name="obtener_cotizacion_serie_historica",
             description="Obtener serie histórica de cotizaciones de un título",
-            tags=["titulos", "cotizacion", "historica"]
+            tags=["titulos", "cotizacion", "historica"],
+            output_schema=None
         )
         async def obtener_cotizacion_serie_historica(
+            ctx: Context,
             mercado: str = Field(description="Mercado del título", enum=["bCBA", "nYSE", "nASDAQ", "aMEX", "bCS", "rOFX"]),
             simbolo: str = Field(description="Símbolo del título"),
             fecha_desde: str = Field(description="Fecha desde en formato ISO (YYYY-MM-DD)"),
             fecha_hasta: str = Field(description="Fecha hasta en formato ISO (YYYY-MM-DD)"),
-            ajustada: str = Field(description="Indica si los datos deben estar ajustados", enum=["ajustada", "sinAjustar"])
+            ajustada: str = Field(description="Indica si los datos deben estar ajustados", enum=["ajustada", "sinAjustar"]),
+            en_segundo_plano: bool = Field(default=False, description="Descargar por tramos anuales en un job y devolver su job_id de inmediato"),
+            formato: str = Field(default="filas", description="filas (lista de objetos) o columnar (nombres de campo una sola vez y textos repetidos codificados con diccionario)", enum=FORMATS)
         ) -> Dict[str, Any]:
             """
             Obtiene la serie histórica de cotizaciones de un título
@@ -341,18 +511,34 @@ class TitulosRoutes(BaseRoutes):
                 fecha_desde: Fecha desde en formato ISO
                 fecha_hasta: Fecha hasta en formato ISO
                 ajustada: Indica si los datos deben estar ajustados (ajustada, sinAjustar)
+                en_segundo_plano: Ejecutar como job (resultado con obtener_resultado_job)
+                formato: filas o columnar
             """
             try:
-                result = await self.client.obtener_cotizacion_serie_historica(
+                if en_segundo_plano:
+                    job = job_manager.submit(
+                        "obtener_cotizacion_serie_historica",
+                        lambda job: self.client.obtener_cotizacion_serie_historica_por_tramos(
+                            mercado=mercado,
+                            simbolo=simbolo,
+                            fecha_desde=fecha_desde,
+                            fecha_hasta=fecha_hasta,
+                            ajustada=ajustada,
+                            progress=lambda done, total: job.report(done, total, f"{done} de {total} tramos anuales")
+                        ),
+                        session=ctx.session,
+                        formato=formato
+                    )
+                    return job_started(job)
+                call = self.client.obtener_cotizacion_serie_historica(
                     mercado=mercado,
                     simbolo=simbolo,
                     fecha_desde=fecha_desde,
                     fecha_hasta=fecha_hasta,
                     ajustada=ajustada
                 )
-                return {
-                    "success": True,
-                    "result": result
-                }
+                if formato == "columnar":
+                    return self.success_response(apply_format(await call, formato))
+                return await self.passthrough_response(call)
             except Exception as e:
                 return {"error": f"Error obteniendo serie histórica de cotizaciones: {str(e)}"} 
\ No newline at end of file
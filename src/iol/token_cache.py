@@ -0,0 +1,121 @@
+from typing import Dict, Any, Optional, AsyncIterator
+from contextlib import asynccontextmanager
+import os
+import json
+import time
+import base64
+import fcntl
+import asyncio
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # pragma: no cover - cryptography se instala con python-jose[cryptography]
+    Fernet = None
+    InvalidToken = Exception
+
+TOKEN_CACHE_ENABLED = os.getenv('IOL_TOKEN_CACHE_ENABLED', 'true').lower() == 'true'
+TOKEN_CACHE_FILE = os.getenv('IOL_TOKEN_CACHE_FILE', '.iol_token_cache')
+
+# Margen antes del vencimiento a partir del cual un token se considera vencido
+EXPIRY_MARGIN = 300
+
+def is_valid(token: Optional[Dict[str, Any]], field: str = "expires_at") -> bool:
+    """Indica si el token (o su refresh token, con field="refresh_expires_at") sigue vigente"""
+    return bool(token) and token.get(field, 0) - EXPIRY_MARGIN > time.time()
+
+class TokenCache:
+    """Tokens de una cuenta compartidos entre clientes, persistidos cifrados y con bloqueo entre procesos"""
+
+    def __init__(self, username: Optional[str], password: Optional[str], path: Optional[str] = None):
+        """
+        Inicializa la caché de tokens
+
+        Args:
+            username: Usuario de la cuenta
+            password: Contraseña de la cuenta (deriva la clave de cifrado si no se define IOL_TOKEN_CACHE_KEY)
+            path: Archivo donde se persisten los tokens
+        """
+        self.path = path or TOKEN_CACHE_FILE
+        self.token: Optional[Dict[str, Any]] = None
+        self._lock = asyncio.Lock()
+        self._fernet = None
+        if TOKEN_CACHE_ENABLED and Fernet is not None and username and password:
+            self._fernet = Fernet(self._derive_key(username, password))
+        elif TOKEN_CACHE_ENABLED and Fernet is None:
+            logger.warning("cryptography no está instalado: los tokens no se persistirán en disco")
+
+    @staticmethod
+    def _derive_key(username: str, password: str) -> bytes:
+        configured = os.getenv('IOL_TOKEN_CACHE_KEY')
+        if configured:
+            return configured.encode()
+        raw = hashlib.pbkdf2_hmac("sha256", password.encode(), f"iol-mcp:{username}".encode(), 100_000)
+        return base64.urlsafe_b64encode(raw)
+
+    @property
+    def persistent(self) -> bool:
+        return self._fernet is not None
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Devuelve el token más reciente, leyendo el archivo si está habilitado"""
+        if not self.persistent or not os.path.exists(self.path):
+            return self.token
+        try:
+            with open(self.path, "rb") as f:
+                fcntl.flock(f, fcntl.LOCK_SH)
+                data = f.read()
+            token = json.loads(self._fernet.decrypt(data))
+        except (OSError, ValueError, InvalidToken) as e:
+            logger.warning(f"No se pudo leer la caché de tokens {self.path}: {str(e)}")
+            return self.token
+        if not self.token or token.get("expires_at", 0) >= self.token.get("expires_at", 0):
+            self.token = token
+        return self.token
+
+    def save(self, token: Dict[str, Any]) -> None:
+        """Guarda el token en memoria y, cifrado, en disco"""
+        self.token = token
+        if not self.persistent:
+            return
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._fernet.encrypt(json.dumps(token).encode()))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar la caché de tokens {self.path}: {str(e)}")
+
+    @asynccontextmanager
+    async def locked(self) -> AsyncIterator[None]:
+        """Serializa las renovaciones dentro del proceso y, si hay archivo, entre procesos"""
+        async with self._lock:
+            if not self.persistent:
+                yield
+                return
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                lock_file = open(f"{self.path}.lock", "a")
+            except OSError as e:
+                logger.warning(f"No se pudo abrir el bloqueo de la caché de tokens: {str(e)}")
+                yield
+                return
+            try:
+                await asyncio.to_thread(fcntl.flock, lock_file, fcntl.LOCK_EX)
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+
+_caches: Dict[Optional[str], TokenCache] = {}
+
+def get_token_cache(username: Optional[str], password: Optional[str]) -> TokenCache:
+    """Devuelve la caché de tokens compartida por todos los clientes de una cuenta"""
+    if username not in _caches:
+        _caches[username] = TokenCache(username, password)
+    return _caches[username]
@@ -2,7 +2,8 @@ import os
 import logging
 import sys
 import asyncio
-from typing import Dict, Any, Tuple
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from fastmcp import FastMCP
 from dotenv import load_dotenv
 
@@ -13,14 +14,25 @@ from iol.mi_cuenta.routes import MiCuentaRoutes
 from iol.notificacion.routes import NotificacionRoutes
 from iol.operar.routes import OperarRoutes
 from iol.perfil.routes import PerfilRoutes
+from iol.asesores.routes import AsesoresRoutes
+from iol.asesores_operar.routes import AsesoresOperarRoutes
+from iol.asesores_test_inversor.routes import AsesoresTestInversorRoutes
+from iol.base_routes import BaseRoutes
+from iol.http_client import close_session
+from iol.supervisor import Supervisor
+from iol.health import register_health_routes, loop_lag
+from iol.jobs import register_job_tools
 
-def setup_logging() -> None:
-    """Configura el sistema de logging"""
+# Transportes MCP soportados
+TRANSPORTS = ('sse', 'streamable-http', 'stdio')
+
+def setup_logging(stdio: bool = False) -> None:
+    """Configura el sistema de logging (a stderr con el transporte stdio, que usa stdout para el protocolo)"""
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.StreamHandler(sys.stdout),
+            logging.StreamHandler(sys.stderr if stdio else sys.stdout),
             logging.FileHandler('iol_mcp.log')
         ]
     )
@@ -40,12 +52,36 @@ def get_server_config() -> Dict[str, Any]:
     """Obtiene la configuración del servidor"""
     host = os.getenv('HOST', '0.0.0.0')
     port = int(os.getenv('PORT', '8001'))  # Puerto por defecto para SSE
+    enable_asesores = os.getenv('IOL_ENABLE_ASESORES', 'false').lower() == 'true'
+    warmup = os.getenv('IOL_WARMUP', 'false').lower() == 'true'
+    warmup_timeout = float(os.getenv('IOL_WARMUP_TIMEOUT', '20'))
+    workers = max(1, int(os.getenv('IOL_WORKERS', '1')))
+    transport = os.getenv('IOL_TRANSPORT', 'sse').lower()
+    stateless_http = os.getenv('IOL_STATELESS_HTTP', 'false').lower() == 'true'
+    
+    if transport not in TRANSPORTS:
+        raise ValueError(f"IOL_TRANSPORT debe ser uno de {', '.join(TRANSPORTS)}")
     
     return {
         'host': host,
-        'port': port
+        'port': port,
+        'enable_asesores': enable_asesores,
+        'warmup': warmup,
+        'warmup_timeout': warmup_timeout,
+        'workers': workers,
+        'transport': transport,
+        'stateless_http': stateless_http
     }
 
+def get_watchlist() -> List[Tuple[str, str]]:
+    """Obtiene los títulos a precargar desde IOL_WARMUP_WATCHLIST (SIMBOLO:mercado, separados por coma)"""
+    watchlist = []
+    for item in os.getenv('IOL_WARMUP_WATCHLIST', '').split(','):
+        simbolo, _, mercado = item.strip().partition(':')
+        if simbolo:
+            watchlist.append((simbolo.upper(), mercado or 'bCBA'))
+    return watchlist
+
 def create_mcp_server() -> FastMCP:
     """Crea y configura el servidor MCP"""
     try:
@@ -55,8 +91,8 @@ def create_mcp_server() -> FastMCP:
         logging.getLogger(__name__).critical(f"Error creando servidor MCP: {str(e)}")
         raise
 
-def register_routers(mcp: FastMCP) -> None:
-    """Registra las rutas en el servidor MCP"""
+def register_routers(mcp: FastMCP, enable_asesores: bool = False) -> List[BaseRoutes]:
+    """Registra las rutas en el servidor MCP y devuelve los routers registrados"""
     logger = logging.getLogger(__name__)
     routers = [
         PortafolioRoutes(),
@@ -67,6 +103,14 @@ def register_routers(mcp: FastMCP) -> None:
         PerfilRoutes()
     ]
     
+    # Las rutas de asesores solo sirven a cuentas de asesor, se habilitan con IOL_ENABLE_ASESORES=true
+    if enable_asesores:
+        routers.extend([
+            AsesoresRoutes(),
+            AsesoresOperarRoutes(),
+            AsesoresTestInversorRoutes()
+        ])
+    
     for router in routers:
         try:
             router.register_tools(mcp)
@@ -74,42 +118,171 @@ def register_routers(mcp: FastMCP) -> None:
         except Exception as e:
             logger.error(f"Error registrando router {router.__class__.__name__}: {str(e)}")
             raise
+    
+    register_job_tools(mcp)
+    register_health_routes(mcp)
+    return routers
 
-async def run_sse_server(mcp: FastMCP, host: str, port: int) -> None:
-    """Ejecuta el servidor SSE"""
+async def warm_up(routers: List[BaseRoutes], timeout: float) -> None:
+    """
+    Autentica y precarga catálogos, FCI y cotizaciones de la watchlist antes de aceptar conexiones,
+    para que la primera herramienta no pague el login ni las conexiones en frío
+    
+    Args:
+        routers: Routers registrados
+        timeout: Segundos máximos de precarga; al vencer, el servidor inicia igual
+    """
     logger = logging.getLogger(__name__)
-    logger.info(f"Iniciando servidor SSE en {host}:{port}")
+    titulos = next((r for r in routers if isinstance(r, TitulosRoutes)), None)
+    if titulos is None:
+        return
     
-    # Agregar un delay para asegurar que el servidor esté completamente inicializado
-    await asyncio.sleep(1)
-    logger.info("Inicialización del servidor completa, listo para aceptar conexiones")
+    async def _quote(simbolo: str, mercado: str) -> None:
+        await titulos.client.obtener_cotizacion(simbolo=simbolo, mercado=mercado)
     
-    await mcp.run_async(transport="sse", host=host, port=port)
+    async def _run() -> None:
+        # El token se comparte entre clientes: autenticar una vez alcanza para todos
+        await titulos.client.ensure_token()
+        results = await asyncio.gather(
+            titulos.buscador.ensure_ready(),
+            *(_quote(simbolo, mercado) for simbolo, mercado in get_watchlist()),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Error en la precarga: {str(result)}")
+    
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(_run(), timeout=timeout)
+        logger.info(f"Precarga completada en {time.perf_counter() - started:.2f}s")
+    except asyncio.TimeoutError:
+        logger.warning(f"Precarga interrumpida tras {timeout:.0f}s, se inicia el servidor igualmente")
+    except Exception as e:
+        logger.warning(f"Error en la precarga tras {time.perf_counter() - started:.2f}s: {str(e)}")
+
+async def run_server(
+    mcp: FastMCP,
+    transport: str,
+    host: str,
+    port: int,
+    routers: Optional[List[BaseRoutes]] = None,
+    warmup: bool = False,
+    warmup_timeout: float = 20,
+    stateless_http: bool = False
+) -> None:
+    """
+    Ejecuta el servidor con el transporte indicado, con precarga opcional antes de aceptar conexiones
+    
+    Args:
+        mcp: Servidor MCP con los routers registrados
+        transport: sse, streamable-http o stdio
+        host: Host de escucha (transportes HTTP)
+        port: Puerto de escucha (transportes HTTP)
+        routers: Routers registrados, usados por la precarga
+        warmup: Si se precargan token y catálogos antes de aceptar conexiones
+        warmup_timeout: Segundos máximos de precarga
+        stateless_http: Streamable HTTP sin estado de sesión, para escalar detrás de un balanceador
+    """
+    logger = logging.getLogger(__name__)
+    loop_lag.ensure_running()
+    
+    if warmup and routers:
+        await warm_up(routers, warmup_timeout)
+    elif transport != 'stdio':
+        # Agregar un delay para asegurar que el servidor esté completamente inicializado
+        await asyncio.sleep(1)
+    
+    try:
+        if transport == 'stdio':
+            logger.info("Servidor listo en stdio")
+            await mcp.run_async(transport="stdio")
+        elif transport == 'streamable-http':
+            logger.info(f"Servidor streamable HTTP listo en {host}:{port}/mcp (sin estado: {stateless_http})")
+            await mcp.run_async(transport="streamable-http", host=host, port=port, stateless_http=stateless_http)
+        else:
+            logger.info(f"Servidor SSE listo en {host}:{port}, aceptando conexiones")
+            await mcp.run_async(transport="sse", host=host, port=port)
+    finally:
+        await close_session()
+
+async def run_sse_server(
+    mcp: FastMCP,
+    host: str,
+    port: int,
+    routers: Optional[List[BaseRoutes]] = None,
+    warmup: bool = False,
+    warmup_timeout: float = 20
+) -> None:
+    """Ejecuta el servidor SSE, con precarga opcional antes de aceptar conexiones"""
+    await run_server(mcp, 'sse', host, port, routers=routers, warmup=warmup, warmup_timeout=warmup_timeout)
+
+def run_worker(port: int) -> None:
+    """Ejecuta un worker del modo multiproceso, escuchando solo en localhost detrás del supervisor"""
+    setup_logging()
+    config = get_server_config()
+    mcp = create_mcp_server()
+    routers = register_routers(mcp, enable_asesores=config['enable_asesores'])
+    asyncio.run(run_server(
+        mcp,
+        config['transport'],
+        '127.0.0.1',
+        port,
+        routers=routers,
+        warmup=config['warmup'],
+        warmup_timeout=config['warmup_timeout'],
+        stateless_http=config['stateless_http']
+    ))
+
+def run_supervisor(host: str, port: int, workers: int) -> None:
+    """
+    Ejecuta el modo multiproceso: los workers comparten token (archivo de caché de tokens)
+    y lecturas cacheadas (SQLite en modo WAL), y el supervisor mantiene la afinidad de sesión
+    """
+    # Se define antes de lanzar los workers, que lo heredan al importar la caché
+    os.environ.setdefault('IOL_SHARED_STATE_FILE', os.path.join('logs', 'iol_shared_state.db'))
+    os.makedirs(os.path.dirname(os.path.abspath(os.environ['IOL_SHARED_STATE_FILE'])), exist_ok=True)
+    asyncio.run(Supervisor(run_worker, workers, port).run(host, port))
 
 def main() -> None:
     """Función principal"""
-    setup_logging()
+    setup_logging(stdio=os.getenv('IOL_TRANSPORT', 'sse').lower() == 'stdio')
     logger = logging.getLogger(__name__)
     
     try:
-        logger.info("Inicializando servidor IOL MCP con SSE...")
+        logger.info("Inicializando servidor IOL MCP...")
         
         # Obtener credenciales y configuración
         username, password = get_credentials()
         config = get_server_config()
         
         logger.info("Credenciales cargadas exitosamente")
-        logger.info(f"Configuración del servidor SSE: {config}")
+        logger.info(f"Configuración del servidor: {config}")
+        
+        # Con stdio el cliente lanza un proceso por sesión: no hay conexiones que repartir
+        if config['workers'] > 1 and config['transport'] != 'stdio':
+            logger.info(f"Iniciando {config['workers']} workers en el puerto {config['port']}...")
+            run_supervisor(config['host'], config['port'], config['workers'])
+            return
         
         mcp = create_mcp_server()
         
         logger.info("Registrando routers...")
-        register_routers(mcp)
+        routers = register_routers(mcp, enable_asesores=config['enable_asesores'])
         logger.info("Todos los routers registrados exitosamente")
         
-        # Ejecutar servidor SSE
-        logger.info(f"Iniciando servidor SSE en el puerto {config['port']}...")
-        asyncio.run(run_sse_server(mcp, config['host'], config['port']))
+        # Ejecutar servidor con el transporte configurado
+        logger.info(f"Iniciando servidor con transporte {config['transport']}...")
+        asyncio.run(run_server(
+            mcp,
+            config['transport'],
+            config['host'],
+            config['port'],
+            routers=routers,
+            warmup=config['warmup'],
+            warmup_timeout=config['warmup_timeout'],
+            stateless_http=config['stateless_http']
+        ))
             
     except Exception as e:
         logger.critical(f"Error fatal: {str(e)}")
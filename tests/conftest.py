@@ -0,0 +1,85 @@
+import os
+import sys
+
+# Configuración mínima para importar el paquete sin credenciales reales, sin estado
+# compartido entre workers ni cassettes, y con las lecturas condicionales y passthrough activas
+os.environ.setdefault("IOL_USERNAME", "usuario")
+os.environ.setdefault("IOL_PASSWORD", "clave")
+os.environ["IOL_TOKEN_CACHE_ENABLED"] = "false"
+os.environ["IOL_CASSETTE_MODE"] = "off"
+os.environ["IOL_HEDGE_ENABLED"] = "false"
+os.environ["IOL_HTTP_CONDITIONAL"] = "true"
+os.environ["IOL_PASSTHROUGH_ENABLED"] = "true"
+os.environ["IOL_CACHE_ENABLED"] = "true"
+os.environ.pop("IOL_SHARED_STATE_FILE", None)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pytest
+
+class FakeResponse:
+    """Respuesta de aiohttp con cuerpo, headers y content type predefinidos"""
+
+    def __init__(self, status, body=b"", headers=None, content_type="application/json", charset="utf-8"):
+        self.status = status
+        self._body = body
+        self.headers = headers or {}
+        self.content_type = content_type
+        self.charset = charset
+        self.content_length = len(body)
+
+    async def read(self):
+        return self._body
+
+    async def text(self):
+        return self._body.decode()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+class FakeSession:
+    """Sesión de aiohttp que devuelve respuestas predefinidas y registra las peticiones"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, url, headers=None, params=None, json=None):
+        self.requests.append({"method": method, "url": url, "headers": headers or {}, "params": params})
+        return self.responses.pop(0)
+
+@pytest.fixture
+def api_cache(monkeypatch):
+    """Caché de lecturas vacía en lugar de la del módulo"""
+    from iol import http_client
+    from iol.cache import ResponseCache
+    cache = ResponseCache(enabled=True)
+    monkeypatch.setattr(http_client, "response_cache", cache)
+    return cache
+
+@pytest.fixture
+def api_client(monkeypatch):
+    """Cliente de la API autenticado que envía las peticiones a la sesión que indique fake_session"""
+    from iol.http_client import IOLAPIClient
+    client = IOLAPIClient()
+
+    async def ensure_token():
+        return None
+
+    monkeypatch.setattr(client, "ensure_token", ensure_token)
+    monkeypatch.setattr(client, "get_auth_headers", lambda: {"Authorization": "Bearer token"})
+    return client
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    """Instala una FakeSession con las respuestas indicadas como sesión HTTP compartida"""
+    from iol import http_client
+
+    def _install(*responses):
+        session = FakeSession(*responses)
+        monkeypatch.setattr(http_client, "get_session", lambda: session)
+        return session
+    return _install
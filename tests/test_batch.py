@@ -0,0 +1,47 @@
+import pytest
+from iol.batch import split_date_range, merge_chunks
+from iol.models import Operacion
+
+def test_split_date_range_covers_range_without_overlap():
+    assert split_date_range("2024-01-01", "2024-01-10", 4) == [
+        ("2024-01-01", "2024-01-04"),
+        ("2024-01-05", "2024-01-08"),
+        ("2024-01-09", "2024-01-10")
+    ]
+
+def test_split_date_range_single_day_and_datetimes():
+    assert split_date_range("2024-03-05T10:00:00", "2024-03-05T18:00:00", 30) == [("2024-03-05", "2024-03-05")]
+
+def test_split_date_range_empty_when_reversed():
+    assert split_date_range("2024-02-01", "2024-01-01", 10) == []
+
+def test_merge_chunks_newest_first_and_dedup():
+    outcomes = [
+        (("2024-01-01", "2024-01-04"), [{"numero": 2}, {"numero": 1}], None),
+        (("2024-01-05", "2024-01-08"), [{"numero": 4}, {"numero": 3}, {"numero": 2}], None),
+        (("2024-01-09", "2024-01-10"), None, None)
+    ]
+    rows = merge_chunks(outcomes, key="numero")
+    assert [row["numero"] for row in rows] == [4, 3, 2, 1]
+
+def test_merge_chunks_dedups_models_by_attribute():
+    outcomes = [
+        (("2024-01-01", "2024-01-04"), [Operacion(numero=2), Operacion(numero=1)], None),
+        (("2024-01-05", "2024-01-08"), [Operacion(numero=3), Operacion(numero=2)], None)
+    ]
+    assert [row.numero for row in merge_chunks(outcomes, key="numero")] == [3, 2, 1]
+
+def test_merge_chunks_without_key_keeps_repeated_rows():
+    outcomes = [
+        (("2024-01-01", "2024-01-01"), [{"fecha": "a"}], None),
+        (("2024-01-02", "2024-01-02"), [{"fecha": "a"}], None)
+    ]
+    assert len(merge_chunks(outcomes)) == 2
+
+def test_merge_chunks_fails_if_any_chunk_failed():
+    outcomes = [
+        (("2024-01-01", "2024-01-04"), [{"numero": 1}], None),
+        (("2024-01-05", "2024-01-08"), None, "timeout")
+    ]
+    with pytest.raises(RuntimeError, match="2024-01-05 a 2024-01-08"):
+        merge_chunks(outcomes, key="numero")
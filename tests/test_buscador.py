@@ -0,0 +1,65 @@
+import asyncio
+import pytest
+from iol.titulos.buscador import SymbolIndex, SymbolIndexService
+
+ENTRIES = [
+    {"simbolo": "GGAL", "mercado": "bCBA", "descripcion": "Grupo Financiero Galicia"},
+    {"simbolo": "GGAL", "mercado": "nASDAQ", "descripcion": "Grupo Financiero Galicia ADR"},
+    {"simbolo": "GGALD", "mercado": "bCBA", "descripcion": "Grupo Financiero Galicia (dólares)"},
+    {"simbolo": "YPFD", "mercado": "bCBA", "descripcion": "YPF S.A."},
+    {"simbolo": "TXAR", "mercado": "bCBA", "descripcion": "Ternium Argentina"},
+    {"simbolo": "ALUA", "mercado": "bCBA", "descripcion": "Aluar Aluminio Argentino"}
+]
+
+@pytest.fixture
+def index():
+    return SymbolIndex(ENTRIES + [dict(ENTRIES[0])])
+
+def test_duplicates_by_symbol_and_market_are_ignored(index):
+    assert len(index) == len(ENTRIES)
+
+def test_exact_symbol_ranks_before_prefix(index):
+    results = index.search("ggal")
+    assert [(r["simbolo"], r["puntaje"]) for r in results] == [("GGAL", 1.0), ("GGAL", 1.0), ("GGALD", 0.9)]
+
+def test_market_filter(index):
+    assert [r["mercado"] for r in index.search("GGAL", mercado="nasdaq")] == ["nASDAQ"]
+
+def test_description_words_match_by_prefix_without_accents(index):
+    assert [r["simbolo"] for r in index.search("alumin argent")] == ["ALUA"]
+    assert [r["simbolo"] for r in index.search("dolares")] == ["GGALD"]
+
+def test_fuzzy_search_only_without_prefix_matches(index):
+    results = index.search("YPDF")
+    assert results[0]["simbolo"] == "YPFD"
+    assert 0 < results[0]["puntaje"] < 0.7
+    assert index.search("ZZZZ") == []
+
+class FakeTitulosClient:
+    def __init__(self, titulos):
+        self.titulos = titulos
+        self.calls = 0
+
+    async def obtener_cotizaciones_panel_todos(self, instrumento, pais):
+        self.calls += 1
+        return {"titulos": self.titulos}
+
+    async def obtener_fci(self):
+        return []
+
+def test_empty_build_backs_off_before_retrying(monkeypatch):
+    monkeypatch.setenv("IOL_SYMBOL_INDEX_PANELES", "argentina:acciones")
+    client = FakeTitulosClient([])
+    service = SymbolIndexService(client, refresh_interval=3600, retry_interval=30)
+
+    async def scenario():
+        await service.build(only_if_due=True)
+        await service.build(only_if_due=True)
+        assert client.calls == 1 and service.failures == 1
+        service.last_attempt -= 31
+        client.titulos = ENTRIES
+        index = await service.build(only_if_due=True)
+        assert client.calls == 2 and len(index) == len(ENTRIES)
+        assert not service._retry_due()
+
+    asyncio.run(scenario())
@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+from conftest import FakeResponse
+from iol.cache import ResponseCache
+
+READS = {
+    "estado": ("/api/v2/estadocuenta", None),
+    "portafolio_ar": ("/api/v2/portafolio/argentina", None),
+    "portafolio_us": ("/api/v2/portafolio/estados_unidos", None),
+    "operaciones": ("/api/v2/operaciones", {"filtro.pais": "argentina"}),
+    "cotizacion": ("/api/v2/bCBA/titulos/GGAL/cotizacion", None)
+}
+
+@pytest.fixture
+def cache():
+    cache = ResponseCache(enabled=True)
+    for endpoint, params in READS.values():
+        for account in ("u", "otro"):
+            cache.store(cache.make_key(account, endpoint, params), endpoint, params, {"ok": True})
+    return cache
+
+def _cached(cache, account="u"):
+    return {name for name, (endpoint, params) in READS.items() if cache.make_key(account, endpoint, params) in cache._entries}
+
+def test_order_invalidates_account_reads_of_its_country(cache):
+    removed = cache.invalidate_for_mutation("u", "POST", "/api/v2/operar/comprar", {"mercado": "bCBA", "simbolo": "GGAL"})
+    assert removed == 3
+    # Las cotizaciones no dependen de las órdenes y el portafolio de otro país no cambia
+    assert _cached(cache) == {"portafolio_us", "cotizacion"}
+    assert _cached(cache, "otro") == set(READS)
+
+def test_order_without_market_invalidates_every_country(cache):
+    cache.invalidate_for_mutation("u", "DELETE", "/api/v2/operaciones/123")
+    assert _cached(cache) == {"cotizacion"}
+
+def test_fci_operations_affect_argentina(cache):
+    cache.invalidate_for_mutation("u", "POST", "/api/v2/operar/suscripcion/fci", {"simbolo": "FCI1"})
+    assert _cached(cache) == {"portafolio_us", "cotizacion"}
+
+def test_validation_only_and_unmapped_writes_keep_the_cache(cache):
+    assert cache.invalidate_for_mutation("u", "POST", "/api/v2/operar/comprar", {"soloValidar": True}) == 0
+    assert cache.invalidate_for_mutation("u", "POST", "/api/v2/Notificacion/1/Leida", {}) == 0
+    assert _cached(cache) == set(READS)
+
+def test_client_write_invalidates_after_success(api_cache, api_client, fake_session):
+    session = fake_session(
+        FakeResponse(200, b'{"activos": []}'),
+        FakeResponse(200, b'{"ok": true}'),
+        FakeResponse(200, b'{"activos": [{"cantidad": 1}]}')
+    )
+
+    async def scenario():
+        await api_client.get("/api/v2/portafolio/argentina")
+        await api_client.get("/api/v2/portafolio/argentina")
+        await api_client.post("/api/v2/operar/vender", json={"mercado": "bCBA", "simbolo": "GGAL"})
+        return await api_client.get("/api/v2/portafolio/argentina")
+
+    assert asyncio.run(scenario()) == {"activos": [{"cantidad": 1}]}
+    assert [r["method"] for r in session.requests] == ["GET", "POST", "GET"]
@@ -0,0 +1,40 @@
+from iol.columnar import to_columnar, from_columnar, apply_format
+
+def test_round_trip_uniform_rows():
+    rows = [
+        {"simbolo": "GGAL", "mercado": "bCBA", "ultimoPrecio": 100.5},
+        {"simbolo": "YPFD", "mercado": "bCBA", "ultimoPrecio": 200.0},
+        {"simbolo": "PAMP", "mercado": "bCBA", "ultimoPrecio": 50.25}
+    ]
+    table = to_columnar(rows)
+    assert table["filas"] == 3
+    assert table["columnas"] == ["simbolo", "mercado", "ultimoPrecio"]
+    # Solo la columna con textos repetidos se codifica con diccionario
+    assert table["diccionarios"] == {"mercado": ["bCBA"]}
+    assert table["valores"][1] == [0, 0, 0]
+    assert from_columnar(table) == rows
+
+def test_round_trip_nested_and_missing_fields():
+    rows = [
+        {"simbolo": "GGAL", "puntas": {"precioCompra": 99.0, "precioVenta": 101.0}},
+        {"simbolo": "GGAL", "moneda": "peso_Argentino"},
+        {"simbolo": "GGAL", "puntas": {"precioCompra": 98.0}}
+    ]
+    table = to_columnar(rows)
+    assert table["columnas"] == ["simbolo", "puntas.precioCompra", "puntas.precioVenta", "moneda"]
+    assert from_columnar(table) == [
+        {"simbolo": "GGAL", "puntas.precioCompra": 99.0, "puntas.precioVenta": 101.0},
+        {"simbolo": "GGAL", "moneda": "peso_Argentino"},
+        {"simbolo": "GGAL", "puntas.precioCompra": 98.0}
+    ]
+
+def test_round_trip_empty():
+    table = to_columnar([])
+    assert table["filas"] == 0
+    assert from_columnar(table) == []
+
+def test_apply_format_encodes_nested_lists():
+    result = apply_format({"titulos": [{"simbolo": "GGAL"}], "pais": "argentina"}, "columnar")
+    assert result["pais"] == "argentina"
+    assert from_columnar(result["titulos"]) == [{"simbolo": "GGAL"}]
+    assert apply_format([{"a": 1}], "filas") == [{"a": 1}]
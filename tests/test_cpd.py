@@ -0,0 +1,79 @@
+import asyncio
+import math
+from datetime import datetime
+import numpy as np
+from iol.operar.cpd import CPDCommissionModel, N_FEATURES, parse_cheques, screen
+
+def commission(importe, plazo, tasa):
+    return 50 + 0.001 * importe + 0.01 * importe * plazo / 365.0 + 0.1 * importe * plazo / 365.0 * tasa / 100.0
+
+class FakeClient:
+    def __init__(self, fail_after=None):
+        self.calls = 0
+        self.fail_after = fail_after
+
+    async def calcular_comisiones_cpd(self, importe, plazo, tasa):
+        self.calls += 1
+        if self.fail_after is not None and self.calls > self.fail_after:
+            raise RuntimeError("Error en la petición: 500")
+        return {"total": commission(importe, plazo, tasa)}
+
+COMBOS = [(100000.0, 30, 40.0), (250000.0, 60, 45.0), (500000.0, 90, 50.0), (1000000.0, 120, 55.0)]
+
+def test_calibrate_fits_the_model():
+    model = CPDCommissionModel(FakeClient(), samples=6, tolerance=0.01)
+    assert asyncio.run(model.calibrate(COMBOS)) is True
+    assert model.ready and model.failure is None
+    predicted = model.predict([300000.0], [45], [48.0])
+    assert math.isclose(predicted[0], commission(300000.0, 45, 48.0), rel_tol=1e-6)
+
+def test_calibrate_rejects_fewer_valid_samples_than_coefficients():
+    client = FakeClient(fail_after=2)
+    model = CPDCommissionModel(client, samples=6)
+    assert asyncio.run(model.calibrate(COMBOS)) is False
+    assert client.calls >= N_FEATURES
+    assert not model.ready and model.coefficients is None
+    assert model.failure == f"2 muestras válidas, se necesitan {N_FEATURES}"
+    assert model.status()["motivo_sin_calibrar"] == model.failure
+
+def test_single_combination_is_diversified():
+    model = CPDCommissionModel(FakeClient(), samples=6, tolerance=0.01)
+    assert asyncio.run(model.calibrate([(100000.0, 30, 40.0)])) is True
+
+def test_estimate_falls_back_to_the_api_when_not_calibrated():
+    client = FakeClient(fail_after=1)
+    model = CPDCommissionModel(client)
+    values = asyncio.run(model.estimate([100000.0, 200000.0], [30, 60], [40.0, 45.0]))
+    assert math.isclose(values[0], commission(100000.0, 30, 40.0))
+    assert np.isnan(values[1])
+    assert client.calls == 2
+
+def test_failed_calibration_waits_before_retrying():
+    client = FakeClient(fail_after=0)
+    model = CPDCommissionModel(client, verify_interval=3600)
+    asyncio.run(model.ensure_calibrated(COMBOS))
+    calls = client.calls
+    asyncio.run(model.ensure_calibrated(COMBOS))
+    assert client.calls == calls and not model.ready
+
+def test_parse_cheques_clamps_plazo_to_one_day():
+    now = datetime(2024, 5, 10, 12, 0)
+    cheques = parse_cheques({"cheques": [
+        {"idSubasta": 1, "importe": 100000, "plazo": 0, "tasa": 40},
+        {"idSubasta": 2, "importe": 100000, "fechaPago": "2024-05-10T00:00:00", "tasa": 40},
+        {"idSubasta": 3, "importe": 100000, "diasAlVencimiento": 30, "tasa": 40}
+    ]}, now)
+    assert [c["plazo"] for c in cheques] == [1.0, 1.0, 30.0]
+
+def test_screen_ranks_only_finite_yields():
+    model = CPDCommissionModel(FakeClient(), samples=6, tolerance=0.01)
+    asyncio.run(model.calibrate(COMBOS))
+    cheques = [
+        {"id_subasta": 1, "importe": 100000.0, "plazo": 30.0, "tasa": 40.0},
+        {"id_subasta": 2, "importe": 100000.0, "plazo": 0.0, "tasa": 40.0},
+        {"id_subasta": 3, "importe": 200000.0, "plazo": 90.0, "tasa": 60.0},
+        {"id_subasta": 4, "importe": 100000.0, "plazo": 30.0, "tasa": None}
+    ]
+    rows = asyncio.run(screen(cheques, model))
+    assert [row["id_subasta"] for row in rows] == [3, 1]
+    assert all(math.isfinite(row["tna_neta"]) for row in rows)
@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+from iol.hedging import Hedger
+
+def _hedger(**kwargs):
+    options = dict(percentile=95, budget=0.5, min_delay=0.01, min_samples=5)
+    options.update(kwargs)
+    hedger = Hedger(**options)
+    hedger._latencies.extend([0.01] * 5)
+    return hedger
+
+class Sender:
+    """Crea peticiones con las demoras indicadas y registra las canceladas"""
+
+    def __init__(self, *delays, fail=()):
+        self.delays = list(delays)
+        self.fail = set(fail)
+        self.started = 0
+        self.cancelled = []
+
+    async def __call__(self):
+        n = self.started
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delays[n])
+        except asyncio.CancelledError:
+            self.cancelled.append(n)
+            raise
+        if n in self.fail:
+            raise RuntimeError(f"falla {n}")
+        return n
+
+def test_no_hedge_without_enough_samples():
+    hedger = Hedger(min_samples=5, min_delay=0.01)
+    send = Sender(0.05)
+    assert asyncio.run(hedger.run(send)) == 0
+    assert send.started == 1 and hedger.stats["hedges"] == 0
+
+def test_slow_request_is_hedged_and_the_loser_cancelled():
+    hedger = _hedger()
+    send = Sender(1.0, 0.01)
+
+    async def scenario():
+        result = await hedger.run(send)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(scenario()) == 1
+    assert hedger.stats == {"requests": 1, "hedges": 1, "hedge_wins": 1}
+    assert send.cancelled == [0]
+
+def test_fast_request_is_not_hedged():
+    hedger = _hedger()
+    send = Sender(0.0)
+    assert asyncio.run(hedger.run(send)) == 0
+    assert send.started == 1
+
+def test_failed_copy_waits_for_the_other():
+    hedger = _hedger()
+    send = Sender(0.05, 0.0, fail={1})
+    assert asyncio.run(hedger.run(send)) == 0
+    assert hedger.stats["hedge_wins"] == 0
+
+def test_both_copies_failing_raises():
+    hedger = _hedger()
+    with pytest.raises(RuntimeError):
+        asyncio.run(hedger.run(Sender(0.05, 0.0, fail={0, 1})))
+
+def test_budget_limits_hedges():
+    hedger = _hedger(budget=0.25)
+
+    async def scenario():
+        for _ in range(4):
+            await hedger.run(Sender(0.03, 0.0))
+
+    asyncio.run(scenario())
+    # Con 4 peticiones y un presupuesto del 25 % solo se duplica una
+    assert hedger.stats["requests"] == 4 and hedger.stats["hedges"] == 1
+
+def test_cancelling_the_call_cancels_both_copies():
+    hedger = _hedger()
+    send = Sender(1.0, 1.0)
+
+    async def scenario():
+        task = asyncio.ensure_future(hedger.run(send))
+        await asyncio.sleep(0.05)
+        assert send.started == 2
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+    assert sorted(send.cancelled) == [0, 1]
@@ -0,0 +1,36 @@
+import json
+import asyncio
+import pytest
+from conftest import FakeResponse
+from iol.http_client import IOLAPIError
+
+ENDPOINT = "/api/v2/estadocuenta"
+
+def test_conditional_304_renews_cached_entry(api_cache, api_client, fake_session):
+    body = b'{"cuentas": [{"numero": "1"}]}'
+    session = fake_session(FakeResponse(200, body, headers={"ETag": '"v1"'}), FakeResponse(304))
+    first = asyncio.run(api_client.get(ENDPOINT))
+    assert first == json.loads(body)
+    key = api_cache.make_key(api_client.username, ENDPOINT, None)
+    entry = api_cache._entries[key]
+    entry.expires_at = 0
+    entry.swr_window = 0
+
+    second = asyncio.run(api_client.get(ENDPOINT))
+    assert second == first
+    assert session.requests[1]["headers"]["If-None-Match"] == '"v1"'
+    assert api_cache.stats["not_modified"] == 1
+    assert api_cache._entries[key].fresh
+    assert api_cache._entries[key].etag == '"v1"'
+
+def test_fresh_entry_is_served_without_request(api_cache, api_client, fake_session):
+    session = fake_session(FakeResponse(200, b'{"cuentas": []}'))
+    asyncio.run(api_client.get(ENDPOINT))
+    assert asyncio.run(api_client.get(ENDPOINT)) == {"cuentas": []}
+    assert len(session.requests) == 1
+
+def test_unconditional_304_is_an_error(api_cache, api_client, fake_session):
+    fake_session(FakeResponse(304))
+    with pytest.raises(IOLAPIError) as error:
+        asyncio.run(api_client.get(ENDPOINT))
+    assert error.value.status == 304
@@ -0,0 +1,82 @@
+import asyncio
+from iol.jobs import JobManager, paginate
+
+class FakeSession:
+    def __init__(self):
+        self.messages = []
+
+    async def send_log_message(self, level, data, logger):
+        self.messages.append((level, data))
+
+def test_job_reports_progress_and_completes():
+    async def scenario():
+        manager = JobManager(max_concurrency=1)
+        step = asyncio.Event()
+        session = FakeSession()
+
+        async def work(job):
+            await job.report(1, 2, "primer tramo")
+            await step.wait()
+            await job.report(2)
+            return list(range(5))
+
+        job = manager.submit("prueba", work, session)
+        assert job.state == "pendiente"
+        seen = []
+
+        async def on_progress(current):
+            seen.append((current.state, current.progress, current.total, current.message))
+
+        waiter = asyncio.ensure_future(job.wait(5, on_progress))
+        await asyncio.sleep(0.01)
+        assert job.state == "en_curso" and job.progress == 1 and job.total == 2
+        step.set()
+        await waiter
+        return job, seen, session
+
+    job, seen, session = asyncio.run(scenario())
+    assert job.state == "completado" and job.result == [0, 1, 2, 3, 4]
+    assert (job.progress, job.total, job.message) == (2, 2, "primer tramo")
+    assert seen[-1][0] == "completado"
+    assert session.messages == [("info", {"evento": "job_finalizado", **job.status()})]
+
+def test_cancel_running_and_queued_jobs():
+    async def scenario():
+        manager = JobManager(max_concurrency=1)
+
+        async def forever(job):
+            await asyncio.sleep(60)
+
+        running = manager.submit("lento", forever)
+        queued = manager.submit("encolado", forever)
+        await asyncio.sleep(0.01)
+        assert running.state == "en_curso" and queued.state == "pendiente"
+        assert manager.cancel(queued.id) and manager.cancel(running.id)
+        await asyncio.gather(running.task, queued.task, return_exceptions=True)
+        return manager, running, queued
+
+    manager, running, queued = asyncio.run(scenario())
+    assert running.state == queued.state == "cancelado"
+    assert not manager.cancel(running.id)
+    assert not manager.cancel("inexistente")
+
+def test_failed_job_keeps_the_error():
+    async def scenario():
+        manager = JobManager()
+
+        async def fail(job):
+            raise ValueError("sin datos")
+
+        job = manager.submit("falla", fail)
+        await job.task
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.state == "error" and job.error == "sin datos"
+
+def test_paginate_lists_and_result_containers():
+    page = paginate(list(range(25)), 3, 10)
+    assert page == {"result": [20, 21, 22, 23, 24], "pagina": 3, "paginas": 3, "total_elementos": 25}
+    page = paginate({"result": [1, 2, 3], "errores": []}, 1, 2)
+    assert page["result"] == [1, 2] and page["errores"] == [] and page["paginas"] == 2
+    assert paginate({"total": 1}, 1, 10)["result"] == {"total": 1}
@@ -0,0 +1,77 @@
+import asyncio
+from iol import limiter
+from iol.limiter import AdaptiveLimiter
+
+def _limiter(**kwargs):
+    options = dict(initial=4, min_limit=2, max_limit=6, window=10, tolerance=2.0, backoff=0.5)
+    options.update(kwargs)
+    return AdaptiveLimiter(**options)
+
+def _window(lim, latency, overloaded=False):
+    for _ in range(lim.window):
+        lim.record(latency, overloaded)
+
+def test_additive_increase_only_when_capacity_is_used():
+    lim = _limiter()
+    _window(lim, 0.1)
+    # Nunca hubo más peticiones en curso que la capacidad: no crece
+    assert lim.capacity == 4
+    lim._peak = lim.capacity
+    _window(lim, 0.1)
+    assert lim.capacity == 5 and lim.stats["increases"] == 1
+    for _ in range(5):
+        lim._peak = lim.capacity
+        _window(lim, 0.1)
+    assert lim.capacity == 6
+
+def test_multiplicative_decrease_on_latency():
+    lim = _limiter()
+    _window(lim, 0.1)
+    assert lim.baseline == 0.1
+    _window(lim, 0.5)
+    assert lim.capacity == 2 and lim.stats["decreases"] == 1
+    # Las latencias anteriores a la reducción se descartan
+    assert len(lim._samples) == 0
+
+def test_overload_decreases_once_per_window_down_to_the_minimum():
+    lim = _limiter(initial=6)
+    _window(lim, 0.1)
+    _window(lim, 0, overloaded=True)
+    assert lim.capacity == 3 and lim.stats["overloads"] == 10
+    _window(lim, 0, overloaded=True)
+    assert lim.capacity == 2
+    _window(lim, 0, overloaded=True)
+    assert lim.capacity == 2
+
+def test_waiters_are_admitted_in_order_as_slots_free_up():
+    lim = _limiter(initial=2)
+    order = []
+
+    async def request(name, hold):
+        async with lim:
+            order.append(name)
+            await hold.wait()
+
+    async def scenario():
+        holds = [asyncio.Event() for _ in range(4)]
+        tasks = [asyncio.ensure_future(request(i, hold)) for i, hold in enumerate(holds)]
+        await asyncio.sleep(0.01)
+        assert order == [0, 1] and lim.in_flight == 2 and len(lim._waiters) == 2
+        tasks[3].cancel()
+        holds[0].set()
+        await asyncio.sleep(0.01)
+        assert order == [0, 1, 2]
+        for hold in holds:
+            hold.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert lim.in_flight == 0 and not lim._waiters
+
+def test_capacity_is_split_across_workers(monkeypatch):
+    monkeypatch.setattr(limiter, "WORKERS", 4)
+    monkeypatch.setenv("IOL_LIMITER_MAX", "20")
+    monkeypatch.setenv("IOL_LIMITER_MIN", "2")
+    monkeypatch.setenv("IOL_LIMITER_INITIAL", "10")
+    lim = AdaptiveLimiter()
+    assert (lim.max_limit, lim.min_limit, lim.capacity) == (5, 2, 3)
@@ -0,0 +1,58 @@
+import json
+import logging
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import pytest
+from iol.market_calendar import MarketCalendar
+
+BA = ZoneInfo("America/Argentina/Buenos_Aires")
+NY = ZoneInfo("America/New_York")
+
+@pytest.fixture
+def calendar(tmp_path):
+    path = tmp_path / "feriados.json"
+    path.write_text(json.dumps({
+        "_fuente": "test",
+        "bcba": ["2024-05-01", "2024-05-02"],
+        "nyse": ["2024-07-04"]
+    }), encoding="utf-8")
+    return MarketCalendar(str(path))
+
+def test_is_open_during_the_session_only(calendar):
+    assert calendar.is_open("bCBA", datetime(2024, 4, 30, 12, 0, tzinfo=BA))
+    assert not calendar.is_open("bCBA", datetime(2024, 4, 30, 17, 0, tzinfo=BA))
+    assert not calendar.is_open("bCBA", datetime(2024, 5, 1, 12, 0, tzinfo=BA))
+    # Mercados sin rueda conocida se consideran abiertos
+    assert calendar.is_open("desconocido")
+
+def test_next_open_skips_weekends_and_holidays(calendar):
+    # Martes después del cierre: miércoles y jueves son feriados
+    assert calendar.next_open("bcba", datetime(2024, 4, 30, 18, 0, tzinfo=BA)) == datetime(2024, 5, 3, 11, 0, tzinfo=BA)
+    # Viernes a la noche -> lunes
+    assert calendar.next_open("bcba", datetime(2024, 5, 3, 20, 0, tzinfo=BA)) == datetime(2024, 5, 6, 11, 0, tzinfo=BA)
+    # Antes de la apertura del mismo día
+    assert calendar.next_open("nasdaq", datetime(2024, 7, 5, 8, 0, tzinfo=NY)) == datetime(2024, 7, 5, 9, 30, tzinfo=NY)
+    # NASDAQ comparte los feriados de NYSE
+    assert calendar.next_open("nasdaq", datetime(2024, 7, 3, 17, 0, tzinfo=NY)) == datetime(2024, 7, 5, 9, 30, tzinfo=NY)
+
+def test_ttl_for_extends_until_the_next_open(calendar):
+    assert calendar.ttl_for("bCBA", 5, datetime(2024, 4, 30, 12, 0, tzinfo=BA)) == 5
+    assert calendar.ttl_for("bCBA", 5, datetime(2024, 5, 3, 16, 59, 59, tzinfo=BA)) == 5
+    assert calendar.ttl_for("bCBA", 5, datetime(2024, 5, 3, 17, 0, tzinfo=BA)) == 3 * 86400 - 6 * 3600
+    assert calendar.ttl_for(None, 5) == 5
+    assert calendar.poll_delay("bCBA", 2, datetime(2024, 5, 6, 10, 59, tzinfo=BA)) == 60
+
+def test_years_without_holidays_use_session_ttls(calendar, caplog):
+    after_close = datetime(2025, 5, 2, 20, 0, tzinfo=BA)
+    with caplog.at_level(logging.WARNING, logger="iol.market_calendar"):
+        assert not calendar.covers("rOFX", after_close)
+        assert calendar.ttl_for("bCBA", 5, after_close) == 5
+        assert calendar.poll_delay("bCBA", 2, after_close) == 2
+    # Se avisa una sola vez por calendario y año
+    assert len([r for r in caplog.records if "2025" in r.getMessage()]) == 1
+    assert calendar.status(after_close)["bcba"]["calendario_conocido"] is False
+    assert calendar.covers("bcba", datetime(2024, 5, 3, 20, 0, tzinfo=BA))
+
+def test_missing_file_leaves_the_calendar_empty(tmp_path):
+    calendar = MarketCalendar(str(tmp_path / "no_existe.json"))
+    assert calendar.holidays == {} and not calendar.covers("bcba")
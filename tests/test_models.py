@@ -0,0 +1,46 @@
+from iol.models import RawJSON, TituloPanel, Operacion, OperacionDetalle, as_model, panel_titles, to_dict
+
+PANEL = (
+    b'{"titulos": [{"simbolo": "GGAL", "puntas": {"precioCompra": 99.5, "precioVenta": 100.5},'
+    b' "ultimoPrecio": 100.0, "mercado": "BCBA", "plazo": "T1", "tipoOpcion": null}]}'
+)
+
+def test_panel_titles_from_raw_and_decoded_panels():
+    for data in (RawJSON(PANEL), {"titulos": [{"simbolo": "GGAL", "puntas": {"precioCompra": 99.5, "precioVenta": 100.5},
+                                               "ultimoPrecio": 100.0, "mercado": "BCBA", "plazo": "T1"}]}):
+        titulos = panel_titles(data)
+        assert len(titulos) == 1 and isinstance(titulos[0], TituloPanel)
+        assert titulos[0].simbolo == "GGAL" and titulos[0].ultimoPrecio == 100.0
+        assert titulos[0].puntas.precioVenta == 100.5
+
+def test_panel_titles_from_lists_and_empty_responses():
+    assert [t.simbolo for t in panel_titles(RawJSON(b'[{"simbolo": "AL30"}, {"simbolo": "GD30"}]'))] == ["AL30", "GD30"]
+    assert [t.simbolo for t in panel_titles([{"simbolo": "AL30"}, "basura"])] == ["AL30"]
+    assert panel_titles(RawJSON(b"{}")) == []
+    assert panel_titles(None) == []
+
+def test_operaciones_decode_from_raw_json():
+    raw = RawJSON(
+        b'[{"numero": 50000001, "tipo": "Compra", "estado": "terminada", "simbolo": "GGAL",'
+        b' "cantidad": 10, "precio": 100.5, "fechaOperada": null, "campoNuevo": 1}]'
+    )
+    operaciones = as_model(raw, Operacion, many=True)
+    assert operaciones == [Operacion(numero=50000001, tipo="Compra", estado="terminada", simbolo="GGAL", cantidad=10, precio=100.5)]
+    assert to_dict(operaciones) == [
+        {"numero": 50000001, "tipo": "Compra", "estado": "terminada", "simbolo": "GGAL", "cantidad": 10, "precio": 100.5}
+    ]
+
+def test_operacion_detalle_with_history_and_lenient_fallback():
+    raw = RawJSON(
+        b'{"numero": 7, "estadoActual": "terminada", "mercado": "bCBA", "precio": "",'
+        b' "estados": [{"detalle": "Iniciada", "fecha": "2024-06-28T11:00:00"}],'
+        b' "aranceles": {"tipo": "Comision", "neto": 1.5, "iva": 0.3, "moneda": "AR$"},'
+        b' "operaciones": [{"fecha": "2024-06-28T11:01:00", "cantidad": 10, "precio": 100}]}'
+    )
+    # Un texto vacío en un campo numérico y un único objeto en lugar de lista salen del esquema:
+    # se decodifica con la conversión tolerante
+    detalle = as_model(raw, OperacionDetalle)
+    assert detalle.estadoActual == "terminada" and detalle.precio is None
+    assert [estado.detalle for estado in detalle.estados] == ["Iniciada"]
+    assert detalle.aranceles[0].neto == 1.5
+    assert detalle.operaciones[0].cantidad == 10
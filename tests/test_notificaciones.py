@@ -0,0 +1,103 @@
+import asyncio
+from iol.notificacion.sync import NotificationSync
+
+class FakeSession:
+    def __init__(self):
+        self.messages = []
+
+    async def send_log_message(self, level, data, logger):
+        self.messages.append(data["notificacion"]["id"])
+
+class FakeNotificacionClient:
+    def __init__(self, notificaciones):
+        self.notificaciones = notificaciones
+        self.calls = []
+        self.marked = []
+
+    async def obtener_notificaciones(self, fecha_desde=None, fecha_hasta=None):
+        self.calls.append(fecha_desde)
+        # La API filtra por día
+        return [n for n in self.notificaciones if fecha_desde is None or n["fecha"][:10] >= fecha_desde]
+
+    async def marcar_notificacion_leida(self, id_notificacion):
+        self.marked.append(id_notificacion)
+        return {"ok": True}
+
+def _n(id_, fecha, leida=False):
+    return {"id": id_, "fecha": fecha, "mensaje": f"notificación {id_}", "leida": leida}
+
+def test_high_water_mark_limits_the_query_and_dedupes():
+    client = FakeNotificacionClient([_n(1, "2024-05-01T10:00:00"), _n(2, "2024-05-03T09:00:00")])
+    sync = NotificationSync(client)
+
+    async def scenario():
+        assert [n["id"] for n in await sync.sync()] == [1, 2]
+        client.notificaciones.append(_n(3, "2024-05-03T15:00:00"))
+        assert [n["id"] for n in await sync.sync()] == [3]
+        assert await sync.sync() == []
+
+    asyncio.run(scenario())
+    assert client.calls == [None, "2024-05-03", "2024-05-03"]
+    assert sync.high_water_mark.isoformat() == "2024-05-03T15:00:00"
+
+def test_first_call_delivers_unread_and_each_session_has_its_cursor():
+    client = FakeNotificacionClient([_n(1, "2024-05-01T10:00:00", leida=True), _n(2, "2024-05-03T09:00:00")])
+    sync = NotificationSync(client)
+    a, b = FakeSession(), FakeSession()
+
+    async def scenario():
+        assert [n["id"] for n in await sync.unseen(a)] == [2]
+        assert await sync.unseen(a) == []
+        client.notificaciones.append(_n(3, "2024-05-03T15:00:00"))
+        assert [n["id"] for n in await sync.unseen(a)] == [3]
+        # Otra sesión recibe todas las no leídas, incluida la que ya se entregó a la primera
+        assert [n["id"] for n in await sync.unseen(b)] == [2, 3]
+
+    asyncio.run(scenario())
+
+def test_subscribe_sends_unread_notifications():
+    client = FakeNotificacionClient([_n(1, "2024-05-01T10:00:00"), _n(2, "2024-05-01T11:00:00", leida=True)])
+    sync = NotificationSync(client, poll_interval=3600)
+    session = FakeSession()
+
+    async def scenario():
+        await sync.subscribe(session)
+        sync._task.cancel()
+        assert await sync.unseen(session) == []
+
+    asyncio.run(scenario())
+    assert session.messages == [1]
+
+def test_store_drops_notifications_delivered_to_every_session():
+    client = FakeNotificacionClient([_n(1, "2024-05-01T10:00:00"), _n(2, "2024-05-01T11:00:00")])
+    sync = NotificationSync(client)
+    a, b = FakeSession(), FakeSession()
+
+    async def scenario():
+        await sync.unseen(a)
+        await sync.unseen(b)
+        # El día siguiente la API ya no devuelve las notificaciones anteriores a la marca
+        client.notificaciones.append(_n(3, "2024-05-02T09:00:00"))
+        await sync.sync()
+        await sync.sync()
+        assert set(sync.store) == {3}
+        c = FakeSession()
+        assert [n["id"] for n in await sync.unseen(c)] == [3]
+
+    asyncio.run(scenario())
+
+def test_undelivered_notifications_are_kept():
+    client = FakeNotificacionClient([_n(1, "2024-05-01T10:00:00"), _n(2, "2024-05-02T11:00:00")])
+    sync = NotificationSync(client)
+
+    async def scenario():
+        await sync.sync()
+        await sync.sync()
+        # Ninguna sesión la recibió: se conserva aunque la API ya no la devuelva
+        assert set(sync.store) == {1, 2}
+        await sync.mark_read([1, 1])
+        await sync.sync()
+        assert set(sync.store) == {2}
+
+    asyncio.run(scenario())
+    assert client.marked == [1]
@@ -0,0 +1,52 @@
+import math
+from datetime import datetime
+import numpy as np
+from iol.titulos.opciones import (
+    _hart_cdf, black_scholes_price, implied_volatility, analyze_chain
+)
+
+def test_normal_cdf_matches_erfc():
+    x = np.linspace(-12, 12, 2401)
+    expected = np.array([0.5 * math.erfc(-v / math.sqrt(2)) for v in x])
+    assert np.max(np.abs(_hart_cdf(x) - expected)) < 1e-15
+
+def test_implied_volatility_round_trip():
+    strike = np.array([80.0, 95.0, 100.0, 105.0, 130.0, 90.0, 110.0])
+    is_call = np.array([True, True, True, True, True, False, False])
+    t = np.full(strike.shape, 0.25)
+    vol = np.array([0.15, 0.3, 0.45, 0.6, 0.9, 0.25, 1.2])
+    price = black_scholes_price(100.0, strike, t, 0.05, vol, is_call)
+    iv = implied_volatility(price, 100.0, strike, t, 0.05, is_call)
+    assert np.allclose(iv, vol, atol=1e-6)
+
+def test_implied_volatility_rejects_prices_outside_bounds():
+    strike = np.array([100.0, 100.0])
+    is_call = np.array([True, True])
+    # Debajo del valor intrínseco y encima del subyacente
+    iv = implied_volatility(np.array([0.0, 150.0]), 100.0, strike, np.full(2, 0.5), 0.0, is_call)
+    assert np.isnan(iv).all()
+
+def _option(simbolo, tipo, strike, vencimiento, precio):
+    return {
+        "simbolo": simbolo,
+        "tipoOpcion": tipo,
+        "descripcion": f"{tipo} GGAL {strike:,.2f} {vencimiento}",
+        "fechaVencimiento": vencimiento,
+        "cotizacion": {"ultimoPrecio": precio}
+    }
+
+def test_analyze_chain_skips_expired_contracts():
+    now = datetime(2024, 6, 21, 12, 0)
+    chain = [
+        _option("GFGC3000JU", "Call", 3000, "2024-06-21T00:00:00", 120.0),
+        _option("GFGC3000MA", "Call", 3000, "2024-05-17T00:00:00", 1.0),
+        _option("GFGV3000AG", "Put", 3000, "2024-08-16T00:00:00", 150.0)
+    ]
+    rows = analyze_chain(chain, 3050.0, now=now)
+    assert [row["simbolo"] for row in rows] == ["GFGC3000JU", "GFGV3000AG"]
+    # Un vencimiento sin hora opera hasta el cierre de la rueda de ese día
+    assert 0 < rows[0]["dias"] < 1
+    assert all(row["iv"] is not None for row in rows)
+
+    after_close = analyze_chain(chain, 3050.0, now=datetime(2024, 6, 21, 18, 0))
+    assert [row["simbolo"] for row in after_close] == ["GFGV3000AG"]
@@ -0,0 +1,40 @@
+import json
+import asyncio
+import pytest
+from conftest import FakeResponse
+from iol.base_routes import BaseRoutes
+from iol.http_client import IOLAPIError, passthrough
+from iol.models import RawJSON
+
+ENDPOINT = "/api/v2/estadocuenta"
+
+def test_passthrough_returns_raw_body(api_cache, api_client, fake_session):
+    body = b'{"cuentas": []}'
+    fake_session(FakeResponse(200, body), FakeResponse(200, body))
+
+    async def fetch():
+        with passthrough():
+            return await api_client.get("/api/v2/titulos/GGAL")
+
+    result = asyncio.run(fetch())
+    assert isinstance(result, RawJSON) and result == body
+    # Fuera del bloque passthrough el mismo endpoint se decodifica
+    assert asyncio.run(api_client.get("/api/v2/titulos/GGAL")) == {"cuentas": []}
+
+def test_passthrough_response_embeds_body(api_cache, api_client, fake_session):
+    body = b'{"cuentas": [{"numero": "1"}]}'
+    fake_session(FakeResponse(200, body))
+    result = asyncio.run(BaseRoutes().passthrough_response(api_client.get(ENDPOINT)))
+    assert json.loads(result.content[0].text) == {"success": True, "result": json.loads(body)}
+    # La respuesta quedó cacheada sin decodificar
+    assert api_cache._entries[api_cache.make_key(api_client.username, ENDPOINT, None)].raw == body
+
+def test_non_utf8_body_is_transcoded(api_cache, api_client, fake_session):
+    fake_session(FakeResponse(200, '{"descripcion": "Año"}'.encode("latin-1"), charset="iso-8859-1"))
+    result = asyncio.run(BaseRoutes().passthrough_response(api_client.get("/api/v2/titulos/GGAL")))
+    assert json.loads(result.content[0].text)["result"] == {"descripcion": "Año"}
+
+def test_non_json_response_is_rejected(api_cache, api_client, fake_session):
+    fake_session(FakeResponse(200, b"<html>proxy</html>", content_type="text/html"))
+    with pytest.raises(IOLAPIError, match="no JSON"):
+        asyncio.run(api_client.get(ENDPOINT))
@@ -0,0 +1,92 @@
+import asyncio
+import pytest
+from iol.cache import ResponseCache
+from iol.shared_state import SharedCacheBackend
+from iol.models import RawJSON
+from iol.portafolio import revaluacion
+from iol.portafolio.revaluacion import cached_prices, price_key, parse_positions
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ResponseCache(enabled=True)
+    monkeypatch.setattr(revaluacion, "response_cache", cache)
+    return cache
+
+def _store(cache, account, endpoint, params, value):
+    key = cache.make_key(account, endpoint, params)
+    assert cache.store(key, endpoint, params, value) is not None
+
+def test_price_key_normalizes_case_and_default_plazo():
+    assert price_key("ggal", "bCBA", None) == ("GGAL", "bcba", "t1")
+    assert price_key("GGAL", None, "T0") == ("GGAL", "", "t0")
+
+def test_cached_prices_keys_by_symbol_market_and_plazo(cache):
+    _store(cache, "u", "/api/v2/bCBA/titulos/GGAL/cotizacion", {"model.plazo": "t0"}, {"ultimoPrecio": 100.0})
+    _store(cache, "u", "/api/v2/bCBA/titulos/GGAL/cotizacion", None, {"ultimoPrecio": 101.0})
+    _store(cache, "u", "/api/v2/nYSE/titulos/GGAL/cotizaciondetallemobile/t1", None, {"ultimoPrecio": 25.0})
+    prices = asyncio.run(cached_prices("u"))
+    assert {key: value[0] for key, value in prices.items()} == {
+        ("GGAL", "bcba", "t0"): 100.0,
+        ("GGAL", "bcba", "t1"): 101.0,
+        ("GGAL", "nyse", "t1"): 25.0
+    }
+    assert all(value[2] == "cotizacion" for value in prices.values())
+
+def test_cached_prices_ignores_other_accounts_and_missing_prices(cache):
+    _store(cache, "otro", "/api/v2/bCBA/titulos/GGAL/cotizacion", None, {"ultimoPrecio": 100.0})
+    _store(cache, "u", "/api/v2/bCBA/titulos/YPFD/cotizacion", None, {"ultimoPrecio": 0})
+    assert asyncio.run(cached_prices("u")) == {}
+
+def test_cached_prices_from_panels(cache):
+    panel = RawJSON(
+        b'{"titulos": [{"simbolo": "GGAL", "ultimoPrecio": 102.0, "plazo": "T0"},'
+        b' {"simbolo": "AAPL", "ultimoPrecio": 180.0}]}'
+    )
+    _store(cache, "u", "/api/v2/argentina/titulos/cotizacion/paneles/acciones", None, panel)
+    # Sin el campo mercado, un panel de Estados Unidos no indica en qué mercado cotiza cada título
+    _store(cache, "u", "/api/v2/estados_unidos/titulos/cotizacion/paneles/acciones", None,
+           {"titulos": [{"simbolo": "MSFT", "ultimoPrecio": 400.0}, {"simbolo": "KO", "mercado": "nYSE", "ultimoPrecio": 60.0}]})
+    prices = asyncio.run(cached_prices("u"))
+    assert {key: value[0] for key, value in prices.items()} == {
+        ("GGAL", "bcba", "t0"): 102.0,
+        ("AAPL", "bcba", "t1"): 180.0,
+        ("KO", "nyse", "t1"): 60.0
+    }
+    assert all(value[2] == "panel" for value in prices.values())
+
+def test_parse_positions_reads_market_and_plazo():
+    positions = parse_positions(RawJSON(
+        b'{"pais": "argentina", "activos": [{"cantidad": 10, "ppc": 90, "ultimoPrecio": 100,'
+        b' "titulo": {"simbolo": "ggal", "mercado": "bCBA", "plazo": "T0"}}]}'
+    ))
+    assert len(positions) == 1
+    assert price_key(positions[0]["simbolo"], positions[0]["mercado"], positions[0]["plazo"]) == ("GGAL", "bcba", "t0")
+
+def test_cached_prices_include_other_workers(tmp_path, monkeypatch):
+    path = str(tmp_path / "estado.sqlite")
+    worker_a = ResponseCache(enabled=True, backend=SharedCacheBackend(path, 100))
+    worker_b = ResponseCache(enabled=True, backend=SharedCacheBackend(path, 100))
+    monkeypatch.setattr(revaluacion, "response_cache", worker_b)
+    _store(worker_b, "u", "/api/v2/bCBA/titulos/YPFD/cotizacion", None, {"ultimoPrecio": 30.0})
+    _store(worker_a, "u", "/api/v2/bCBA/titulos/GGAL/cotizacion", {"model.plazo": "t0"}, {"ultimoPrecio": 100.0})
+
+    async def scenario():
+        # Espera a que se escriban las entradas encoladas de cada worker
+        await worker_a.backend.run(lambda: None)
+        await worker_b.backend.run(lambda: None)
+        return await cached_prices("u")
+
+    prices = asyncio.run(scenario())
+    assert {key: value[0] for key, value in prices.items()} == {
+        ("GGAL", "bcba", "t0"): 100.0,
+        ("YPFD", "bcba", "t1"): 30.0
+    }
+
+    # Una invalidación de otro worker también se refleja
+    worker_a.invalidate("u", ["cotizacion"])
+
+    async def after_invalidation():
+        await worker_a.backend.run(lambda: None)
+        return await cached_prices("u")
+
+    assert asyncio.run(after_invalidation()) == {}
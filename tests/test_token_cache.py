@@ -0,0 +1,72 @@
+import os
+import time
+import fcntl
+import asyncio
+import pytest
+from iol import token_cache
+from iol.token_cache import TokenCache, is_valid, EXPIRY_MARGIN
+
+@pytest.fixture
+def path(tmp_path, monkeypatch):
+    monkeypatch.setattr(token_cache, "TOKEN_CACHE_ENABLED", True)
+    monkeypatch.delenv("IOL_TOKEN_CACHE_KEY", raising=False)
+    return str(tmp_path / "tokens" / "cache")
+
+def _token(expires_in):
+    return {"access_token": f"token-{expires_in}", "expires_at": time.time() + expires_in}
+
+def test_is_valid_applies_the_margin():
+    assert is_valid(_token(EXPIRY_MARGIN + 60))
+    assert not is_valid(_token(EXPIRY_MARGIN - 60))
+    assert not is_valid(None)
+
+def test_token_is_encrypted_and_shared_across_instances(path):
+    token = _token(3600)
+    TokenCache("usuario", "clave", path).save(token)
+    with open(path, "rb") as f:
+        data = f.read()
+    assert b"access_token" not in data
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    assert TokenCache("usuario", "clave", path).load() == token
+
+def test_wrong_password_cannot_read_the_file(path):
+    TokenCache("usuario", "clave", path).save(_token(3600))
+    assert TokenCache("usuario", "otra", path).load() is None
+
+def test_load_keeps_the_newest_token(path):
+    writer = TokenCache("usuario", "clave", path)
+    reader = TokenCache("usuario", "clave", path)
+    reader.token = _token(7200)
+    writer.save(_token(3600))
+    assert reader.load()["access_token"] == "token-7200"
+    writer.save(_token(9000))
+    assert reader.load()["access_token"] == "token-9000"
+
+def test_disabled_cache_stays_in_memory(path, monkeypatch):
+    monkeypatch.setattr(token_cache, "TOKEN_CACHE_ENABLED", False)
+    cache = TokenCache("usuario", "clave", path)
+    cache.save(_token(3600))
+    assert not cache.persistent and not os.path.exists(path)
+
+def test_locked_waits_for_other_processes(path):
+    cache = TokenCache("usuario", "clave", path)
+    os.makedirs(os.path.dirname(path))
+    entered = []
+
+    async def scenario():
+        # Otro descriptor del archivo de bloqueo se comporta como otro proceso
+        with open(f"{path}.lock", "a") as other:
+            fcntl.flock(other, fcntl.LOCK_EX)
+
+            async def renew():
+                async with cache.locked():
+                    entered.append(time.monotonic())
+
+            task = asyncio.ensure_future(renew())
+            await asyncio.sleep(0.1)
+            assert entered == []
+            fcntl.flock(other, fcntl.LOCK_UN)
+            await asyncio.wait_for(task, 5)
+
+    asyncio.run(scenario())
+    assert len(entered) == 1
@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from iol.mi_cuenta import tracker as tracker_module
+from iol.mi_cuenta.tracker import OrderTracker
+from iol.models import OperacionDetalle, RawJSON, parse
+
+class FakeSession:
+    def __init__(self):
+        self.messages = []
+
+    async def send_log_message(self, level, data, logger):
+        self.messages.append(data)
+
+class FakeClient:
+    username = "u"
+
+@pytest.fixture
+def invalidations(monkeypatch):
+    calls = []
+    monkeypatch.setattr(tracker_module.response_cache, "invalidate", lambda *args: calls.append(args) or 0)
+    monkeypatch.setattr(tracker_module.market_calendar, "poll_delay", lambda mercado, interval: interval)
+    return calls
+
+def _tracker(session):
+    tracker = OrderTracker(FakeClient(), min_interval=1, max_interval=8)
+    # Se registra la operación sin lanzar el bucle de consultas: el test llama a _update
+    tracker._ensure_running = lambda: None
+    tracker.track([7], session)
+    return tracker
+
+def test_normalize_state():
+    assert OrderTracker.normalize_state("Terminada") == "terminada"
+    assert OrderTracker.normalize_state(" Parcialmente Terminada ") == "parcialmenteterminada"
+    assert OrderTracker.normalize_state("Anulación") == "anulacion"
+    assert OrderTracker.normalize_state(None) is None
+    assert OrderTracker.is_terminal("CANCELADA")
+    assert not OrderTracker.is_terminal("Iniciada")
+
+def test_state_change_notifies_invalidates_and_finishes(invalidations):
+    session = FakeSession()
+    tracker = _tracker(session)
+
+    asyncio.run(tracker._update(7, parse(OperacionDetalle, {"numero": 7, "estadoActual": "Iniciada", "mercado": "bCBA"}), None))
+    assert tracker._orders[7]["estado"] == "Iniciada"
+    assert tracker._orders[7]["mercado"] == "bcba"
+    assert invalidations == [("u", tracker_module.ACCOUNT_GROUPS, "argentina")]
+    assert session.messages[-1]["estado_anterior"] is None
+
+    # Sin cambios (el estado llega con otra capitalización): solo se espacian las consultas
+    asyncio.run(tracker._update(7, parse(OperacionDetalle, {"numero": 7, "estadoActual": "iniciada"}), None))
+    assert tracker._orders[7]["interval"] == 2
+    assert len(invalidations) == 1 and len(session.messages) == 1
+
+    asyncio.run(tracker._update(7, parse(OperacionDetalle, {"numero": 7, "estadoActual": "Terminada"}), None))
+    assert 7 not in tracker._orders
+    assert len(invalidations) == 2
+    assert session.messages[-1]["estado_anterior"] == "Iniciada"
+    assert session.messages[-1]["estado"] == "Terminada"
+    assert session.messages[-1]["detalle"] == {"numero": 7, "estadoActual": "Terminada"}
+
+def test_legacy_estado_field_and_errors_back_off(invalidations):
+    tracker = _tracker(None)
+    asyncio.run(tracker._update(7, None, "timeout"))
+    assert tracker._orders[7]["interval"] == 2
+    assert invalidations == []
+
+    asyncio.run(tracker._update(7, parse(OperacionDetalle, {"numero": 7, "estado": "Cancelada"}), None))
+    assert 7 not in tracker._orders
+    assert invalidations == [("u", tracker_module.ACCOUNT_GROUPS, None)]
+
+def test_run_decodes_raw_details(invalidations):
+    class RawClient(FakeClient):
+        async def obtener_operaciones_lote(self, numeros):
+            return [(numero, RawJSON(b'{"numero": %d, "estadoActual": "Terminada", "mercado": "bCBA"}' % numero), None)
+                    for numero in numeros]
+
+    session = FakeSession()
+    tracker = OrderTracker(RawClient(), min_interval=1, max_interval=8)
+    tracker._orders[7] = {"estado": None, "detalle": None, "mercado": None, "interval": 1,
+                          "next_poll": 0, "sessions": {session}}
+    asyncio.run(tracker._run())
+    assert tracker._orders == {}
+    assert session.messages[-1]["detalle"] == {"numero": 7, "estadoActual": "Terminada", "mercado": "bCBA"}